@@ -6,11 +6,13 @@ from flask import Flask, redirect, url_for
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager, current_user
-from config import Config
+from config import perfil_ativo
+from app.replica import SessaoComReplica
 
 
 # Inicializa as extensões (sem vincular a uma app específica ainda)
-db = SQLAlchemy()
+# A sessão envia as leituras para a réplica, quando configurada (ver app/replica.py)
+db = SQLAlchemy(session_options={'class_': SessaoComReplica})
 migrate = Migrate()
 login_manager = LoginManager()
 # Define a view de login. Se um usuário não logado tentar acessar uma página protegida,
@@ -19,25 +21,44 @@ login_manager = LoginManager()
 login_manager.login_view = 'auth.login'
 
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
     """
     Fábrica que cria e configura a instância da aplicação Flask.
+    Sem `config_class`, usa o perfil indicado por FLASK_CONFIG (ver config.py).
     """
     app = Flask(__name__)
-    app.config.from_object(config_class)
+    app.config.from_object(config_class or perfil_ativo())
 
     # Inicializa as extensões com a app
     db.init_app(app)
+    from app import banco, replica
+    banco.init_app(app)
+    replica.init_app(app, db)
     migrate.init_app(app, db)
     login_manager.init_app(app)
 
     # Importa os modelos para que o Flask-Migrate os reconheça
     from app.models import Usuario, PapelUsuario
+    from app.cache import usuarios_cache, carregar_usuario
 
-    # Função para carregar o usuário da sessão
+    from app import agregados  # noqa: F401 - registra a atualização do resumo do dashboard
+    from app import notificacoes  # noqa: F401 - registra a tarefa de notificação
+    from app import auditoria  # noqa: F401 - registra a trilha de auditoria
+
+    usuarios_cache.configurar(max_itens=app.config['CACHE_USUARIOS_MAX'], ttl=app.config['CACHE_USUARIOS_TTL'])
+
+    # Limite de tentativas de login
+    from app import limitador
+    limitador.init_app(app)
+
+    # Função para carregar o usuário da sessão (com cache em memória)
     @login_manager.user_loader
     def load_user(user_id):
-        return Usuario.query.get(int(user_id))
+        return carregar_usuario(int(user_id))
+
+    # Instrumentação das consultas SQL (desligada por padrão)
+    from app import instrumentacao
+    instrumentacao.init_app(app)
 
     # --- Registro dos Blueprints (nossas rotas organizadas) ---
     from app.routes.auth_routes import bp as auth_bp
@@ -46,6 +67,15 @@ def create_app(config_class=Config):
     from app.routes.gestor_routes import bp as gestor_bp
     app.register_blueprint(gestor_bp, url_prefix='/gestor')
 
+    from app.routes.militar_routes import bp as militar_bp
+    app.register_blueprint(militar_bp, url_prefix='/militar')
+
+    from app.routes.chefe_routes import bp as chefe_bp
+    app.register_blueprint(chefe_bp, url_prefix='/chefe')
+
+    from app.routes.api_routes import bp as api_bp
+    app.register_blueprint(api_bp, url_prefix='/api/v1')
+
     # Vamos criar um Blueprint principal para a página inicial
     from flask import Blueprint
     from flask_login import login_required
@@ -61,8 +91,7 @@ def create_app(config_class=Config):
         # elif current_user.papel == PapelUsuario.CHEFE_SECAO:
         #     return redirect(url_for('chefe.dashboard'))
         else:
-            # return redirect(url_for('militar.dashboard'))
-            return '<h1>Dashboard do Militar (a ser construído)</h1>'
+            return redirect(url_for('militar.dashboard'))
 
     app.register_blueprint(main_bp)
 
@@ -88,6 +117,10 @@ def create_app(config_class=Config):
         db.session.commit()
         print(f"Usuário Gestor '{nome_guerra}' criado com sucesso!")
 
+    # Demais comandos CLI (importação, rotinas periódicas etc.)
+    from app.commands import register_commands
+    register_commands(app)
+
     # Apenas uma rota de teste para garantir que tudo está funcionando
     @app.route('/teste')
     def test_page():
@@ -0,0 +1,216 @@
+"""
+/Recursos-Humanos-Ferias/app/agregados.py
+
+Resumo do dashboard do gestor (tabela resumo_secao): quantidade de solicitações por
+status e saldo total de férias, por seção.
+
+Os contadores são atualizados de forma incremental, na mesma transação, a partir do
+evento after_flush do SQLAlchemy: cada solicitação criada/alterada/removida e cada
+mudança de saldo gera apenas um delta. Alterações feitas com UPDATE/INSERT em massa
+(fora do ORM) devem chamar somar() explicitamente. `flask rebuild-aggregates`
+recalcula tudo do zero e aponta divergências.
+"""
+from collections import defaultdict
+from datetime import date
+from sqlalchemy import event, select, update, insert, delete, func, inspect
+from app import db
+from app.models import (Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias, ResumoSecao,
+                        SolicitacaoFeriasArquivo)
+
+
+CHAVE_SALDO = 'saldo'
+
+# Status que aguardam avaliação do chefe e do gestor, respectivamente
+STATUS_PENDENTES = (StatusFerias.SOLICITADA, StatusFerias.APROVADA_CHEFE)
+
+# Status de férias confirmadas (contam como "de férias hoje")
+STATUS_APROVADOS = (StatusFerias.APROVADA_GESTOR, StatusFerias.ALTERADA)
+
+
+def chave_status(status):
+    return f'status:{status.name}'
+
+
+def somar(conexao, secao_id, chave, delta):
+    """Soma `delta` ao contador (secao_id, chave), criando-o se necessário."""
+    if not delta:
+        return
+    secao_id = secao_id or 0
+    resultado = conexao.execute(
+        update(ResumoSecao.__table__)
+        .where(ResumoSecao.secao_id == secao_id, ResumoSecao.chave == chave)
+        .values(valor=ResumoSecao.valor + delta)
+    )
+    if resultado.rowcount == 0:
+        conexao.execute(insert(ResumoSecao.__table__).values(secao_id=secao_id, chave=chave, valor=delta))
+
+
+def somar_saldo_periodo(conexao, periodo_id, delta):
+    """Ajusta o saldo da seção dona do período (para débitos/créditos feitos com UPDATE direto)."""
+    secao_id = conexao.execute(
+        select(Usuario.secao_id).join(PeriodoAquisitivo, PeriodoAquisitivo.usuario_id == Usuario.id)
+        .where(PeriodoAquisitivo.id == periodo_id)
+    ).scalar()
+    somar(conexao, secao_id, CHAVE_SALDO, delta)
+
+
+def _valor_anterior(obj, atributo):
+    historico = inspect(obj).attrs[atributo].history
+    if historico.deleted:
+        return historico.deleted[0]
+    return getattr(obj, atributo)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _atualizar_resumo(session, flush_context):
+    # 1. Deltas por militar: {usuario_id: {chave: delta}}
+    deltas = defaultdict(lambda: defaultdict(int))
+    mudaram_de_secao = {}
+
+    for obj in session.new:
+        if isinstance(obj, SolicitacaoFerias):
+            deltas[obj.solicitante_id][chave_status(obj.status)] += 1
+        elif isinstance(obj, PeriodoAquisitivo):
+            deltas[obj.usuario_id][CHAVE_SALDO] += obj.dias_saldo
+
+    for obj in session.dirty:
+        if isinstance(obj, SolicitacaoFerias):
+            anterior = _valor_anterior(obj, 'status')
+            if anterior != obj.status:
+                deltas[obj.solicitante_id][chave_status(anterior)] -= 1
+                deltas[obj.solicitante_id][chave_status(obj.status)] += 1
+        elif isinstance(obj, PeriodoAquisitivo):
+            deltas[obj.usuario_id][CHAVE_SALDO] += obj.dias_saldo - _valor_anterior(obj, 'dias_saldo')
+        elif isinstance(obj, Usuario):
+            anterior = _valor_anterior(obj, 'secao_id')
+            if anterior != obj.secao_id:
+                mudaram_de_secao[obj.id] = (anterior, obj.secao_id)
+
+    for obj in session.deleted:
+        if isinstance(obj, SolicitacaoFerias):
+            deltas[_valor_anterior(obj, 'solicitante_id')][chave_status(_valor_anterior(obj, 'status'))] -= 1
+        elif isinstance(obj, PeriodoAquisitivo):
+            deltas[_valor_anterior(obj, 'usuario_id')][CHAVE_SALDO] -= _valor_anterior(obj, 'dias_saldo')
+
+    if not deltas and not mudaram_de_secao:
+        return
+
+    conexao = session.connection()
+
+    # 2. Militar que mudou de seção: toda a sua contribuição passa da seção antiga para a nova.
+    #    A contribuição atual (já com este flush) vem do banco; a antiga é ela menos os deltas.
+    for usuario_id, (secao_antiga, secao_nova) in mudaram_de_secao.items():
+        atual = _contribuicao_do_usuario(conexao, usuario_id)
+        delta_usuario = deltas.pop(usuario_id, {})
+        for chave in set(atual) | set(delta_usuario):
+            somar(conexao, secao_antiga, chave, -(atual.get(chave, 0) - delta_usuario.get(chave, 0)))
+            somar(conexao, secao_nova, chave, atual.get(chave, 0))
+
+    # 3. Demais militares: os deltas vão para a seção atual de cada um
+    if deltas:
+        secoes = dict(conexao.execute(select(Usuario.id, Usuario.secao_id).where(Usuario.id.in_(list(deltas)))).all())
+        por_secao = defaultdict(int)
+        for usuario_id, delta_usuario in deltas.items():
+            for chave, delta in delta_usuario.items():
+                por_secao[(secoes.get(usuario_id) or 0, chave)] += delta
+        for (secao_id, chave), delta in por_secao.items():
+            somar(conexao, secao_id, chave, delta)
+
+
+def _contribuicao_do_usuario(conexao, usuario_id):
+    contribuicao = defaultdict(int)
+    # As solicitações arquivadas continuam nos contadores (ver app/arquivo.py)
+    for modelo in (SolicitacaoFerias, SolicitacaoFeriasArquivo):
+        for status, quantidade in conexao.execute(
+            select(modelo.status, func.count()).where(modelo.solicitante_id == usuario_id).group_by(modelo.status)
+        ):
+            contribuicao[chave_status(status)] += quantidade
+    saldo = conexao.execute(
+        select(func.sum(PeriodoAquisitivo.dias_saldo)).where(PeriodoAquisitivo.usuario_id == usuario_id)
+    ).scalar()
+    if saldo:
+        contribuicao[CHAVE_SALDO] = saldo
+    return contribuicao
+
+
+# --- Recálculo completo ---
+
+def calcular_do_zero(conexao):
+    """Calcula todos os contadores com GROUP BY sobre as tabelas de origem."""
+    secao = func.coalesce(Usuario.secao_id, 0)
+    valores = defaultdict(int)
+    # As solicitações arquivadas continuam nos contadores; os períodos arquivados não têm saldo
+    for modelo in (SolicitacaoFerias, SolicitacaoFeriasArquivo):
+        for secao_id, status, quantidade in conexao.execute(
+            select(secao, modelo.status, func.count())
+            .join(Usuario, Usuario.id == modelo.solicitante_id)
+            .group_by(secao, modelo.status)
+        ):
+            valores[(secao_id, chave_status(status))] += quantidade
+    for secao_id, saldo in conexao.execute(
+        select(secao, func.sum(PeriodoAquisitivo.dias_saldo))
+        .join(Usuario, Usuario.id == PeriodoAquisitivo.usuario_id)
+        .group_by(secao)
+    ):
+        valores[(secao_id, CHAVE_SALDO)] = saldo or 0
+    return valores
+
+
+def recalcular():
+    """
+    Recalcula o resumo do zero, grava-o e retorna as divergências encontradas em relação
+    ao que estava gravado: lista de (secao_id, chave, gravado, correto).
+    """
+    conexao = db.session.connection()
+    corretos = calcular_do_zero(conexao)
+    gravados = {(r.secao_id, r.chave): r.valor for r in conexao.execute(select(ResumoSecao.__table__))}
+
+    divergencias = [
+        (secao_id, chave, gravados.get((secao_id, chave), 0), corretos.get((secao_id, chave), 0))
+        for secao_id, chave in sorted(set(corretos) | set(gravados))
+        if gravados.get((secao_id, chave), 0) != corretos.get((secao_id, chave), 0)
+    ]
+
+    conexao.execute(delete(ResumoSecao.__table__))
+    if corretos:
+        conexao.execute(insert(ResumoSecao.__table__), [
+            {'secao_id': secao_id, 'chave': chave, 'valor': valor} for (secao_id, chave), valor in corretos.items()
+        ])
+    db.session.commit()
+    return divergencias
+
+
+# --- Leitura para o dashboard ---
+
+def resumo_dashboard(hoje=None):
+    """Linhas por seção (nome, contagem por status, saldo) e totais para o dashboard do gestor."""
+    hoje = hoje or date.today()
+    nomes = dict(db.session.execute(select(Secao.id, Secao.nome)).all())
+
+    linhas = defaultdict(lambda: {'status': defaultdict(int), 'saldo': 0})
+    for secao_id, chave, valor in db.session.execute(select(ResumoSecao.secao_id, ResumoSecao.chave, ResumoSecao.valor)):
+        if chave == CHAVE_SALDO:
+            linhas[secao_id]['saldo'] = valor
+        else:
+            linhas[secao_id]['status'][chave.split(':', 1)[1]] = valor
+
+    secoes = [
+        {'secao_id': secao_id, 'nome': nomes.get(secao_id, 'Sem seção'), **dados}
+        for secao_id, dados in linhas.items()
+    ]
+    secoes.sort(key=lambda l: (l['secao_id'] == 0, l['nome']))
+
+    de_ferias_hoje = db.session.scalar(
+        select(func.count()).select_from(SolicitacaoFerias).where(
+            SolicitacaoFerias.data_fim >= hoje,
+            SolicitacaoFerias.data_inicio <= hoje,
+            SolicitacaoFerias.status.in_(STATUS_APROVADOS),
+        )
+    )
+
+    return {
+        'secoes': secoes,
+        'pendentes_chefe': sum(l['status'][StatusFerias.SOLICITADA.name] for l in secoes),
+        'pendentes_gestor': sum(l['status'][StatusFerias.APROVADA_CHEFE.name] for l in secoes),
+        'de_ferias_hoje': de_ferias_hoje,
+    }
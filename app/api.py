@@ -0,0 +1,176 @@
+"""
+/Recursos-Humanos-Ferias/app/api.py
+
+Consultas da API JSON /api/v1 (rotas em app/routes/api_routes.py), usada por outros
+sistemas (folha de pagamento, controle de acesso) para ler militares, seções, períodos
+aquisitivos e solicitações de férias.
+
+- Listagens paginadas por cursor (ordem de id) e busca em lote por ?ids=1,2,3;
+- ?campos=id,nome escolhe as colunas retornadas;
+- sincronia: com o cabeçalho If-Modified-Since, retorna só os registros alterados desde
+  essa data (coluna atualizado_em), em ordem de alteração.
+
+As linhas são lidas como tuplas do Core (sem criar objetos do ORM) e convertidas
+diretamente em JSON. Registros arquivados (flask arquivar) não aparecem na API.
+
+Sincronia: o Last-Modified da resposta é uma marca d'água (agora - API_MARGEM_S), a mesma
+em todas as páginas de uma sincronia; o cliente a envia como If-Modified-Since na próxima.
+A margem cobre transações que gravaram atualizado_em mas confirmaram depois; registros
+dentro da margem podem ser enviados de novo, por isso o cliente deve gravá-los por id.
+"""
+import hashlib
+import json
+import secrets
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, tuple_, literal
+from app import db
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, TokenApi, agora_utc
+from app.paginacao import codificar_cursor, decodificar_cursor
+
+
+# Recurso da URL -> (modelo, campos expostos). O id é sempre retornado.
+RECURSOS = {
+    'usuarios': (Usuario, ('id', 'identidade', 'posto_grad', 'nome_guerra', 'nome_completo', 'papel', 'secao_id',
+                           'atualizado_em')),
+    'secoes': (Secao, ('id', 'nome', 'chefe_id', 'atualizado_em')),
+    'periodos': (PeriodoAquisitivo, ('id', 'usuario_id', 'ano_referencia', 'data_inicio_periodo', 'data_fim_periodo',
+                                     'dias_saldo', 'atualizado_em')),
+    'solicitacoes': (SolicitacaoFerias, ('id', 'solicitante_id', 'periodo_aquisitivo_id', 'data_inicio', 'data_fim',
+                                         'dias_solicitados', 'tipo_solicitacao', 'status', 'data_solicitacao',
+                                         'justificativa_reprovacao', 'atualizado_em')),
+}
+
+
+class ParametroInvalido(Exception):
+    """Parâmetro da requisição inválido (resposta 400)."""
+
+
+# --- Tokens ---
+
+def hash_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def criar_token(nome):
+    """Cria o token do sistema `nome` e retorna o token (não é possível recuperá-lo depois)."""
+    token = secrets.token_urlsafe(32)
+    db.session.add(TokenApi(nome=nome, token_hash=hash_token(token)))
+    db.session.commit()
+    return token
+
+
+def token_valido(token):
+    """Nome do sistema dono do token, ou None."""
+    if not token:
+        return None
+    return db.session.execute(
+        select(TokenApi.nome).where(TokenApi.token_hash == hash_token(token))
+    ).scalar()
+
+
+# --- Parâmetros ---
+
+def _lista(texto):
+    return [parte.strip() for parte in texto.split(',') if parte.strip()]
+
+
+def campos_pedidos(recurso, texto):
+    """Campos de ?campos=a,b (na ordem do recurso, sempre com o id); None = todos."""
+    _, campos = RECURSOS[recurso]
+    if not texto:
+        return campos
+    pedidos = set(_lista(texto))
+    desconhecidos = pedidos - set(campos)
+    if desconhecidos:
+        raise ParametroInvalido(f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+    return tuple(campo for campo in campos if campo == 'id' or campo in pedidos)
+
+
+def ids_pedidos(texto, maximo):
+    try:
+        ids = sorted({int(parte) for parte in _lista(texto)})
+    except ValueError:
+        raise ParametroInvalido('ids deve ser uma lista de números separados por vírgula')
+    if len(ids) > maximo:
+        raise ParametroInvalido(f'No máximo {maximo} ids por requisição')
+    return ids
+
+
+def marca_dagua(margem_s):
+    """Last-Modified de uma nova sincronia: agora menos a margem, em segundos inteiros (data HTTP)."""
+    return (agora_utc() - timedelta(seconds=margem_s)).replace(microsecond=0)
+
+
+# --- Consulta ---
+
+def consultar(recurso, campos, ids=None, desde=None, cursor=None, limite=500, marca=None):
+    """
+    Uma página de `recurso`. Retorna (linhas, proxima, marca): linhas são tuplas na ordem
+    de `campos`, proxima é o cursor da página seguinte (ou None) e marca é o Last-Modified
+    da sincronia (só com `desde`; vem do cursor nas páginas seguintes).
+
+    - ids: busca em lote, sem paginação;
+    - desde: só registros com atualizado_em >= desde, em ordem (atualizado_em, id);
+    - sem os dois: todos os registros em ordem de id.
+    """
+    modelo, _ = RECURSOS[recurso]
+    tabela = modelo.__table__
+    consulta = select(*(tabela.c[campo] for campo in campos))
+
+    if ids is not None:
+        linhas = db.session.execute(consulta.where(tabela.c.id.in_(ids)).order_by(tabela.c.id)).all()
+        return linhas, None, None
+
+    if desde is not None:
+        chave = (tabela.c.atualizado_em, tabela.c.id)
+        consulta = consulta.where(tabela.c.atualizado_em >= desde)
+    else:
+        chave = (tabela.c.id,)
+
+    if cursor:
+        valores = decodificar_cursor(cursor)
+        tamanho = 3 if desde is not None else 1
+        if valores is None or len(valores) != tamanho:
+            raise ParametroInvalido('Cursor inválido')
+        try:
+            if desde is not None:
+                valores = [datetime.fromisoformat(valores[0]), int(valores[1]), datetime.fromisoformat(valores[2])]
+            else:
+                valores = [int(valores[0])]
+        except (TypeError, ValueError):
+            raise ParametroInvalido('Cursor inválido')
+        if desde is not None:
+            marca = valores.pop()
+        # Parâmetros tipados pela coluna (no SQLite, datas são comparadas como texto)
+        consulta = consulta.where(tuple_(*chave) > tuple_(*(literal(v, c.type) for v, c in zip(valores, chave))))
+
+    # Colunas da chave fora de `campos` (ex.: atualizado_em) também vão na consulta, para o cursor
+    extras = [c for c in chave if c.key not in campos]
+    linhas = db.session.execute(consulta.add_columns(*extras).order_by(*chave).limit(limite + 1)).all()
+    proxima = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        ultima = linhas[-1]._mapping
+        valores = [ultima[c] for c in chave]
+        if desde is not None:
+            valores = [valores[0].isoformat(), valores[1], marca.isoformat()]
+        proxima = codificar_cursor(valores)
+    if extras:
+        linhas = [linha[:len(campos)] for linha in linhas]
+    return linhas, proxima, marca
+
+
+# --- Serialização ---
+
+def _valor_json(valor):
+    if hasattr(valor, 'name'):  # Enums (StatusFerias, PapelUsuario)
+        return valor.name
+    if isinstance(valor, date):  # date e datetime
+        return valor.isoformat()
+    raise TypeError(f'Tipo não serializável: {type(valor).__name__}')
+
+
+def para_json(campos, linhas, proxima):
+    """Corpo da resposta: {"dados": [{campo: valor}], "proxima": cursor}."""
+    return json.dumps({'dados': [dict(zip(campos, linha)) for linha in linhas], 'proxima': proxima},
+                      separators=(',', ':'), ensure_ascii=False, default=_valor_json)
@@ -0,0 +1,180 @@
+"""
+/Recursos-Humanos-Ferias/app/arquivo.py
+
+Arquivamento do histórico: move para tabelas de arquivo (mesmas colunas) as solicitações
+encerradas e os períodos aquisitivos antigos já consumidos, para que solicitacao_ferias
+e periodo_aquisitivo contenham só o que ainda está em uso.
+
+A movimentação é feita em lotes (INSERT ... SELECT seguido de DELETE, um commit por
+lote), de modo que nenhuma transação segura as tabelas por muito tempo. As telas de
+histórico leem as duas tabelas (solicitacoes_do_militar, periodos_do_militar, com_arquivo).
+
+Os contadores do resumo do gestor (app/agregados.py) continuam contando as linhas
+arquivadas, e os saldos arquivados são zero: arquivar não altera nenhum total.
+"""
+import time
+from datetime import date
+from sqlalchemy import select, insert, delete, exists, or_, func, union_all
+from app import db
+from app.models import (PeriodoAquisitivo, SolicitacaoFerias, StatusFerias,
+                        PeriodoAquisitivoArquivo, SolicitacaoFeriasArquivo)
+
+
+# Solicitações arquivadas mesmo que o período continue na tabela principal
+STATUS_ENCERRADOS = (StatusFerias.CANCELADA, StatusFerias.REPROVADA)
+
+# Solicitações que ainda podem mudar: impedem o arquivamento do período
+STATUS_EM_ABERTO = (StatusFerias.SOLICITADA, StatusFerias.APROVADA_CHEFE, StatusFerias.RASCUNHO)
+
+ARQUIVOS = {
+    SolicitacaoFerias: SolicitacaoFeriasArquivo,
+    PeriodoAquisitivo: PeriodoAquisitivoArquivo,
+}
+
+
+def _periodos_arquivaveis(antes_de):
+    """Períodos anteriores a `antes_de`, sem saldo e sem solicitações em aberto ou que terminem depois."""
+    em_uso = exists().where(
+        SolicitacaoFerias.periodo_aquisitivo_id == PeriodoAquisitivo.id,
+        or_(SolicitacaoFerias.status.in_(STATUS_EM_ABERTO), SolicitacaoFerias.data_fim >= date(antes_de, 1, 1)),
+    )
+    return select(PeriodoAquisitivo.id).where(
+        PeriodoAquisitivo.ano_referencia < antes_de, PeriodoAquisitivo.dias_saldo == 0, ~em_uso
+    )
+
+
+def _solicitacoes_arquivaveis(antes_de):
+    """Solicitações canceladas ou reprovadas que terminam antes de `antes_de`."""
+    return select(SolicitacaoFerias.id).where(
+        SolicitacaoFerias.status.in_(STATUS_ENCERRADOS), SolicitacaoFerias.data_fim < date(antes_de, 1, 1)
+    )
+
+
+def _mover(conexao, modelo, condicao):
+    """Copia para o arquivo as linhas de `modelo` que atendem `condicao` e as remove da tabela principal."""
+    origem = modelo.__table__
+    destino = ARQUIVOS[modelo].__table__
+    colunas = [coluna.name for coluna in destino.columns]
+    conexao.execute(insert(destino).from_select(colunas, select(*(origem.c[nome] for nome in colunas)).where(condicao)))
+    return conexao.execute(delete(origem).where(condicao)).rowcount
+
+
+def _ja_arquivados(conexao, modelo, ids):
+    """Ids de `ids` que já existem na tabela de arquivo de `modelo`."""
+    arquivo = ARQUIVOS[modelo]
+    return set(conexao.execute(select(arquivo.id).where(arquivo.id.in_(ids))).scalars())
+
+
+def _arquivar_em_lotes(consulta, coluna_id, mover, lote, pausa):
+    """Percorre os ids de `consulta` em ordem (paginação por chave), movendo `lote` por transação."""
+    total = 0
+    ultimo = 0
+    while True:
+        ids = db.session.scalars(consulta.where(coluna_id > ultimo).order_by(coluna_id).limit(lote)).all()
+        if not ids:
+            return total
+        total += mover(db.session.connection(), ids)
+        db.session.commit()
+        ultimo = ids[-1]
+        if pausa:
+            time.sleep(pausa)
+
+
+def contar_arquivaveis(antes_de):
+    """(períodos, solicitações) que seriam arquivados, sem contar as solicitações dos próprios períodos."""
+    contar = lambda consulta: db.session.scalar(select(func.count()).select_from(consulta.subquery()))
+    return contar(_periodos_arquivaveis(antes_de)), contar(_solicitacoes_arquivaveis(antes_de))
+
+
+def arquivar(antes_de, lote=1000, pausa=0.0):
+    """
+    Arquiva os períodos aquisitivos de anos anteriores a `antes_de` sem saldo (com todas as
+    suas solicitações) e as solicitações canceladas/reprovadas encerradas antes de
+    01/01/`antes_de`. Cada lote é uma transação; `pausa` (s) entre lotes alivia o banco.
+
+    Linhas cujo id já está no arquivo (ids reutilizados antes de as tabelas usarem
+    AUTOINCREMENT no SQLite) ficam na tabela principal e são informadas em 'ja_arquivados'.
+    Retorna {'periodos': n, 'solicitacoes': n, 'ja_arquivados': {'periodos': [ids], 'solicitacoes': [ids]}}.
+    """
+    movidas = {'periodos': 0, 'solicitacoes': 0}
+    ja_arquivados = {'periodos': set(), 'solicitacoes': set()}
+
+    def mover_periodos(conexao, ids):
+        # Um período fica se ele ou alguma das suas solicitações já estiver no arquivo
+        conflitos = _ja_arquivados(conexao, PeriodoAquisitivo, ids)
+        solicitacoes = conexao.execute(
+            select(SolicitacaoFerias.id, SolicitacaoFerias.periodo_aquisitivo_id)
+            .where(SolicitacaoFerias.periodo_aquisitivo_id.in_(ids))
+        ).all()
+        solicitacoes_em_conflito = _ja_arquivados(conexao, SolicitacaoFerias, [s.id for s in solicitacoes])
+        conflitos |= {s.periodo_aquisitivo_id for s in solicitacoes if s.id in solicitacoes_em_conflito}
+        ja_arquivados['periodos'] |= conflitos
+        ja_arquivados['solicitacoes'] |= solicitacoes_em_conflito
+        ids = [periodo_id for periodo_id in ids if periodo_id not in conflitos]
+        if not ids:
+            return 0
+        movidas['solicitacoes'] += _mover(conexao, SolicitacaoFerias, SolicitacaoFerias.periodo_aquisitivo_id.in_(ids))
+        return _mover(conexao, PeriodoAquisitivo, PeriodoAquisitivo.id.in_(ids))
+
+    def mover_solicitacoes(conexao, ids):
+        conflitos = _ja_arquivados(conexao, SolicitacaoFerias, ids)
+        ja_arquivados['solicitacoes'] |= conflitos
+        ids = [solicitacao_id for solicitacao_id in ids if solicitacao_id not in conflitos]
+        if not ids:
+            return 0
+        return _mover(conexao, SolicitacaoFerias, SolicitacaoFerias.id.in_(ids))
+
+    movidas['periodos'] = _arquivar_em_lotes(_periodos_arquivaveis(antes_de), PeriodoAquisitivo.id,
+                                             mover_periodos, lote, pausa)
+    movidas['solicitacoes'] += _arquivar_em_lotes(_solicitacoes_arquivaveis(antes_de), SolicitacaoFerias.id,
+                                                  mover_solicitacoes, lote, pausa)
+    movidas['ja_arquivados'] = {tipo: sorted(ids) for tipo, ids in ja_arquivados.items()}
+    return movidas
+
+
+# --- Leitura do histórico (tabela principal + arquivo) ---
+
+def com_arquivo(modelo):
+    """Subconsulta (UNION ALL) com as linhas de `modelo` e da sua tabela de arquivo."""
+    tabela = modelo.__table__
+    arquivo = ARQUIVOS[modelo].__table__
+    colunas = [coluna.name for coluna in arquivo.columns]
+    return union_all(
+        select(*(tabela.c[nome] for nome in colunas)),
+        select(*(arquivo.c[nome] for nome in colunas)),
+    ).subquery(tabela.name)
+
+
+def periodos_do_militar(usuario_id):
+    """Períodos aquisitivos do militar, inclusive os arquivados, em ordem de ano."""
+    colunas = ('id', 'ano_referencia', 'data_inicio_periodo', 'data_fim_periodo', 'dias_saldo')
+    consultas = [
+        select(*(modelo.__table__.c[nome] for nome in colunas)).where(modelo.usuario_id == usuario_id)
+        for modelo in (PeriodoAquisitivo, PeriodoAquisitivoArquivo)
+    ]
+    uniao = union_all(*consultas)
+    return db.session.execute(uniao.order_by(uniao.selected_columns.ano_referencia)).all()
+
+
+def solicitacoes_do_militar(usuario_id):
+    """
+    Solicitações do militar, inclusive as arquivadas, das mais recentes para as mais antigas,
+    com o ano de referência do período (que pode estar arquivado).
+    """
+    colunas = ('id', 'data_inicio', 'data_fim', 'dias_solicitados', 'tipo_solicitacao', 'status', 'data_solicitacao')
+    # Rótulos explícitos: o ORDER BY da união se refere às colunas pelo nome
+    # As solicitações da tabela principal sempre têm o período na tabela principal
+    principais = select(
+        *(SolicitacaoFerias.__table__.c[nome].label(nome) for nome in colunas), PeriodoAquisitivo.ano_referencia
+    ).join(PeriodoAquisitivo, PeriodoAquisitivo.id == SolicitacaoFerias.periodo_aquisitivo_id) \
+        .where(SolicitacaoFerias.solicitante_id == usuario_id)
+    arquivadas = select(
+        *(SolicitacaoFeriasArquivo.__table__.c[nome].label(nome) for nome in colunas),
+        func.coalesce(PeriodoAquisitivo.ano_referencia, PeriodoAquisitivoArquivo.ano_referencia).label('ano_referencia'),
+    ).outerjoin(PeriodoAquisitivo, PeriodoAquisitivo.id == SolicitacaoFeriasArquivo.periodo_aquisitivo_id) \
+        .outerjoin(PeriodoAquisitivoArquivo, PeriodoAquisitivoArquivo.id == SolicitacaoFeriasArquivo.periodo_aquisitivo_id) \
+        .where(SolicitacaoFeriasArquivo.solicitante_id == usuario_id)
+    uniao = union_all(principais, arquivadas)
+    return db.session.execute(
+        uniao.order_by(uniao.selected_columns.data_solicitacao.desc(), uniao.selected_columns.id.desc())
+    ).all()
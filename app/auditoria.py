@@ -0,0 +1,175 @@
+"""
+/Recursos-Humanos-Ferias/app/auditoria.py
+
+Trilha de auditoria das solicitações de férias e dos períodos aquisitivos (tabela
+evento_auditoria, somente inclusão): cada criação, alteração ou remoção gera um evento
+com os campos alterados e o usuário que a fez.
+
+Os eventos do ORM são coletados no after_flush e gravados com um único INSERT
+(executemany) por flush. Alterações feitas com UPDATE/INSERT em massa (fora do ORM)
+devem chamar registrar(). O saldo (dias_saldo) é gravado como variação, de modo que
+`flask verificar-saldos` pode reconstruir os saldos atuais somando os eventos.
+"""
+import enum
+import json
+from datetime import date
+from flask import has_request_context
+from flask_login import current_user
+from sqlalchemy import event, select, insert, inspect
+from app import db
+from app.models import PeriodoAquisitivo, SolicitacaoFerias, EventoAuditoria
+
+
+SOLICITACAO = 'S'
+PERIODO = 'P'
+
+INCLUSAO = 'I'
+ALTERACAO = 'A'
+EXCLUSAO = 'E'
+
+# Modelo -> (código da entidade, campos auditados)
+AUDITADOS = {
+    SolicitacaoFerias: (SOLICITACAO, ('solicitante_id', 'periodo_aquisitivo_id', 'data_inicio', 'data_fim',
+                                      'dias_solicitados', 'tipo_solicitacao', 'status', 'justificativa_reprovacao')),
+    PeriodoAquisitivo: (PERIODO, ('usuario_id', 'ano_referencia', 'data_inicio_periodo', 'data_fim_periodo',
+                                  'dias_saldo')),
+}
+
+# Campo gravado como variação (depois - antes) nas alterações
+CAMPO_SALDO = 'dias_saldo'
+
+
+def _valor_json(valor):
+    if isinstance(valor, enum.Enum):
+        return valor.name
+    if isinstance(valor, date):
+        return valor.isoformat()
+    raise TypeError(f'Tipo não serializável: {type(valor).__name__}')
+
+
+def _codificar(dados):
+    return json.dumps(dados, separators=(',', ':'), ensure_ascii=False, default=_valor_json)
+
+
+def _autor():
+    """Id do usuário logado na requisição atual, ou None (comandos CLI, worker)."""
+    if has_request_context() and current_user.is_authenticated:
+        return int(current_user.get_id())
+    return None
+
+
+def evento(entidade, entidade_id, acao, dados):
+    return {'entidade': entidade, 'entidade_id': entidade_id, 'acao': acao, 'dados': dados}
+
+
+def registrar(conexao, eventos):
+    """Grava `eventos` (ver evento()) com um único INSERT."""
+    if not eventos:
+        return
+    autor = _autor()
+    conexao.execute(insert(EventoAuditoria.__table__), [
+        {**e, 'dados': _codificar(e['dados']), 'usuario_id': autor} for e in eventos
+    ])
+
+
+def registrar_saldo(conexao, variacoes):
+    """Eventos de alteração de saldo feitas com UPDATE direto: `variacoes` = {periodo_id: dias}."""
+    registrar(conexao, [evento(PERIODO, periodo_id, ALTERACAO, {CAMPO_SALDO: dias})
+                        for periodo_id, dias in variacoes.items() if dias])
+
+
+def _alteracoes(obj, campos):
+    estado = inspect(obj)
+    dados = {}
+    for campo in campos:
+        historico = estado.attrs[campo].history
+        if not historico.deleted:
+            continue
+        antes, depois = historico.deleted[0], getattr(obj, campo)
+        if antes == depois:
+            continue
+        dados[campo] = depois - antes if campo == CAMPO_SALDO else [antes, depois]
+    return dados
+
+
+@event.listens_for(db.session, 'after_flush')
+def _auditar(session, flush_context):
+    eventos = []
+    for obj in session.new:
+        if type(obj) in AUDITADOS:
+            entidade, campos = AUDITADOS[type(obj)]
+            eventos.append(evento(entidade, obj.id, INCLUSAO, {c: getattr(obj, c) for c in campos}))
+    for obj in session.dirty:
+        if type(obj) in AUDITADOS:
+            entidade, campos = AUDITADOS[type(obj)]
+            dados = _alteracoes(obj, campos)
+            if dados:
+                eventos.append(evento(entidade, obj.id, ALTERACAO, dados))
+    for obj in session.deleted:
+        if type(obj) in AUDITADOS:
+            entidade, campos = AUDITADOS[type(obj)]
+            eventos.append(evento(entidade, obj.id, EXCLUSAO, {c: getattr(obj, c) for c in campos}))
+    if eventos:
+        with session.no_autoflush:
+            registrar(session.connection(), eventos)
+
+
+# --- Consultas ---
+
+def historico(entidade, entidade_id):
+    """Eventos de uma solicitação ou período, em ordem: [(EventoAuditoria, dados)]."""
+    eventos = db.session.scalars(
+        select(EventoAuditoria)
+        .where(EventoAuditoria.entidade == entidade, EventoAuditoria.entidade_id == entidade_id)
+        .order_by(EventoAuditoria.id)
+    ).all()
+    return [(e, json.loads(e.dados)) for e in eventos]
+
+
+def alteracoes_do_usuario(usuario_id, limite=100):
+    """Últimos eventos gerados pelo usuário, dos mais recentes para os mais antigos."""
+    eventos = db.session.scalars(
+        select(EventoAuditoria).where(EventoAuditoria.usuario_id == usuario_id)
+        .order_by(EventoAuditoria.id.desc()).limit(limite)
+    ).all()
+    return [(e, json.loads(e.dados)) for e in eventos]
+
+
+# --- Reconstrução dos saldos ---
+
+def reconstruir_saldos(lote=5000):
+    """
+    Soma os eventos de saldo de cada período aquisitivo, em ordem, e compara com o saldo
+    atual (inclusive dos períodos arquivados). Retorna (divergencias, sem_historico,
+    conferidos): divergencias = [(periodo_id, reconstruido, atual)]; sem_historico =
+    períodos sem evento de inclusão (criados antes da auditoria ou por dados sintéticos).
+    """
+    from app.arquivo import com_arquivo
+
+    saldos = {}
+    removidos = set()
+    resultado = db.session.execute(
+        select(EventoAuditoria.entidade_id, EventoAuditoria.acao, EventoAuditoria.dados)
+        .where(EventoAuditoria.entidade == PERIODO)
+        .order_by(EventoAuditoria.entidade_id, EventoAuditoria.id)  # Ordem do índice: sem ordenação extra
+        .execution_options(yield_per=lote)
+    )
+    for periodo_id, acao, dados in resultado:
+        dados = json.loads(dados)
+        if acao == INCLUSAO:
+            saldos[periodo_id] = dados[CAMPO_SALDO]
+            removidos.discard(periodo_id)
+        elif acao == EXCLUSAO:
+            saldos.pop(periodo_id, None)
+            removidos.add(periodo_id)
+        elif CAMPO_SALDO in dados and periodo_id in saldos:
+            saldos[periodo_id] += dados[CAMPO_SALDO]
+
+    periodos = com_arquivo(PeriodoAquisitivo)
+    atuais = dict(db.session.execute(select(periodos.c.id, periodos.c.dias_saldo)).all())
+
+    divergencias = [(periodo_id, saldo, atuais.get(periodo_id)) for periodo_id, saldo in sorted(saldos.items())
+                    if atuais.get(periodo_id) != saldo]
+    divergencias += [(periodo_id, None, atuais[periodo_id]) for periodo_id in sorted(removidos & set(atuais))]
+    sem_historico = len(set(atuais) - set(saldos) - removidos)
+    return divergencias, sem_historico, len(saldos)
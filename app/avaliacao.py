@@ -0,0 +1,111 @@
+"""
+/Recursos-Humanos-Ferias/app/avaliacao.py
+
+Avaliação em lote de solicitações de férias (aprovação/reprovação) pelo chefe da seção
+ou pelo gestor, com UPDATEs em conjunto numa única transação.
+"""
+from collections import defaultdict
+from sqlalchemy import select, update, case
+from app import db
+from app.agregados import somar, chave_status, CHAVE_SALDO
+from app.eventos import marcar_alterados
+from app.versoes import incrementar, chave_militar
+from app.notificacoes import notificar_solicitacoes
+from app.auditoria import registrar, registrar_saldo, evento, SOLICITACAO, ALTERACAO
+from app.models import Usuario, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias
+
+
+# Status de destino -> status de origem permitidos
+TRANSICOES = {
+    StatusFerias.APROVADA_CHEFE: (StatusFerias.SOLICITADA,),
+    StatusFerias.APROVADA_GESTOR: (StatusFerias.APROVADA_CHEFE,),
+    StatusFerias.REPROVADA: (StatusFerias.SOLICITADA, StatusFerias.APROVADA_CHEFE),
+}
+
+# Status que cada avaliador pode aplicar
+STATUS_DO_CHEFE = (StatusFerias.APROVADA_CHEFE, StatusFerias.REPROVADA)
+STATUS_DO_GESTOR = (StatusFerias.APROVADA_GESTOR, StatusFerias.REPROVADA)
+
+
+class AvaliacaoInvalida(Exception):
+    """A avaliação pedida não pode ser aplicada."""
+
+
+def avaliar_em_lote(ids, novo_status, justificativa=None, secao_id=None):
+    """
+    Muda para `novo_status` as solicitações de `ids` cujo status atual permita a transição
+    (e, se `secao_id` for informado, que sejam de integrantes da seção). Nas reprovações,
+    os dias voltam ao saldo dos períodos aquisitivos.
+
+    Retorna (avaliadas, ignoradas): listas de ids. Não faz commit.
+    """
+    if novo_status not in TRANSICOES:
+        raise AvaliacaoInvalida(f'Não é possível avaliar uma solicitação como "{novo_status.value}".')
+    if novo_status == StatusFerias.REPROVADA and not (justificativa or '').strip():
+        raise AvaliacaoInvalida('Informe a justificativa da reprovação.')
+
+    ids = sorted(set(ids))
+    origens = TRANSICOES[novo_status]
+    filtros = [SolicitacaoFerias.id.in_(ids), SolicitacaoFerias.status.in_(origens)]
+    if secao_id is not None:
+        filtros.append(SolicitacaoFerias.solicitante_id.in_(select(Usuario.id).where(Usuario.secao_id == secao_id)))
+
+    elegiveis = db.session.execute(
+        select(SolicitacaoFerias.id, SolicitacaoFerias.solicitante_id, SolicitacaoFerias.status,
+               SolicitacaoFerias.periodo_aquisitivo_id, SolicitacaoFerias.dias_solicitados, Usuario.secao_id)
+        .join(Usuario, Usuario.id == SolicitacaoFerias.solicitante_id)
+        .where(*filtros)
+    ).all()
+    avaliadas = [linha.id for linha in elegiveis]
+    conjunto_avaliadas = set(avaliadas)
+    ignoradas = [i for i in ids if i not in conjunto_avaliadas]
+    if not avaliadas:
+        return avaliadas, ignoradas
+
+    # 1. Um único UPDATE de status; o filtro de origem protege contra avaliações simultâneas
+    valores = {'status': novo_status}
+    if novo_status == StatusFerias.REPROVADA:
+        valores['justificativa_reprovacao'] = justificativa.strip()
+    resultado = db.session.execute(
+        update(SolicitacaoFerias)
+        .where(SolicitacaoFerias.id.in_(avaliadas), SolicitacaoFerias.status.in_(origens))
+        .values(**valores)
+        .execution_options(synchronize_session='fetch')
+    )
+    if resultado.rowcount != len(avaliadas):
+        raise AvaliacaoInvalida('Algumas solicitações foram alteradas por outro usuário. Tente novamente.')
+
+    conexao = db.session.connection()
+    for linha in elegiveis:
+        somar(conexao, linha.secao_id, chave_status(linha.status), -1)
+        somar(conexao, linha.secao_id, chave_status(novo_status), 1)
+    incrementar(conexao, [chave_militar(linha.solicitante_id) for linha in elegiveis])
+    alteracoes = {'justificativa_reprovacao': [None, valores['justificativa_reprovacao']]} \
+        if 'justificativa_reprovacao' in valores else {}
+    registrar(conexao, [
+        evento(SOLICITACAO, linha.id, ALTERACAO, {'status': [linha.status, novo_status], **alteracoes})
+        for linha in elegiveis
+    ])
+
+    # 2. Reprovação: devolve os dias a cada período com um único UPDATE ... CASE
+    if novo_status == StatusFerias.REPROVADA:
+        devolucao = defaultdict(int)
+        devolucao_secao = defaultdict(int)
+        for linha in elegiveis:
+            devolucao[linha.periodo_aquisitivo_id] += linha.dias_solicitados
+            devolucao_secao[linha.secao_id] += linha.dias_solicitados
+
+        db.session.execute(
+            update(PeriodoAquisitivo)
+            .where(PeriodoAquisitivo.id.in_(list(devolucao)))
+            .values(dias_saldo=PeriodoAquisitivo.dias_saldo + case(devolucao, value=PeriodoAquisitivo.id, else_=0))
+            .execution_options(synchronize_session='fetch')
+        )
+        for secao, dias in devolucao_secao.items():
+            somar(conexao, secao, CHAVE_SALDO, dias)
+        registrar_saldo(conexao, devolucao)
+        marcar_alterados(db.session, PeriodoAquisitivo, devolucao)
+
+    marcar_alterados(db.session, SolicitacaoFerias, avaliadas)
+    notificar_solicitacoes(avaliadas)
+    return avaliadas, ignoradas
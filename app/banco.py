@@ -0,0 +1,28 @@
+"""
+/Recursos-Humanos-Ferias/app/banco.py
+
+Ajustes das conexões com o banco. No SQLite, os PRAGMAs de SQLITE_PRAGMAS (modo WAL,
+synchronous, busy_timeout, mmap, chaves estrangeiras) valem por conexão e por isso são
+aplicados no evento 'connect' de cada nova conexão do pool.
+"""
+from sqlalchemy import event
+from app import db
+
+
+def aplicar_pragmas(engine, pragmas):
+    """Registra a execução de `pragmas` ({nome: valor}) em cada nova conexão SQLite de `engine`."""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _executar_pragmas(conexao_dbapi, registro):
+        cursor = conexao_dbapi.cursor()
+        for nome, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {nome}={valor}')
+        cursor.close()
+
+
+def init_app(app):
+    with app.app_context():
+        for engine in db.engines.values():
+            aplicar_pragmas(engine, app.config['SQLITE_PRAGMAS'])
@@ -0,0 +1,336 @@
+"""
+/Recursos-Humanos-Ferias/app/benchmark.py
+
+Benchmark das rotas principais com o cliente de testes do Flask, sobre bancos SQLite
+temporários populados pelo gerador de dados sintéticos (app/sintetico.py), e benchmark
+de escrita concorrente no SQLite com e sem os PRAGMAs do perfil de produção.
+"""
+import json
+import os
+import platform
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func, create_engine, insert, update
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from app.banco import aplicar_pragmas
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, PapelUsuario, StatusFerias
+from app.sintetico import gerar_dados, IDENTIDADE_GESTOR
+from app.api import criar_token
+
+
+SENHA = 'benchmark'
+
+
+def _estatisticas(tempos, status):
+    tempos_ms = sorted(t * 1000 for t in tempos)
+    return {
+        'repeticoes': len(tempos_ms),
+        'min_ms': round(tempos_ms[0], 3),
+        'mediana_ms': round(statistics.median(tempos_ms), 3),
+        'media_ms': round(statistics.fmean(tempos_ms), 3),
+        'p95_ms': round(tempos_ms[min(len(tempos_ms) - 1, int(len(tempos_ms) * 0.95))], 3),
+        'max_ms': round(tempos_ms[-1], 3),
+        'status': sorted(set(status)),
+    }
+
+
+def _medir(requisicao, repeticoes):
+    """Executa `requisicao(i)` `repeticoes` vezes (após um aquecimento) e mede cada uma."""
+    requisicao(-1)
+    tempos, status = [], []
+    for i in range(repeticoes):
+        inicio = time.perf_counter()
+        resposta = requisicao(i)
+        tempos.append(time.perf_counter() - inicio)
+        status.append(resposta.status_code)
+    return _estatisticas(tempos, status)
+
+
+def _login(cliente, identidade):
+    return cliente.post('/login', data={'identidade': identidade, 'password': SENHA})
+
+
+def _medir_escala(config_base, usuarios, secoes, repeticoes, semente):
+    with tempfile.TemporaryDirectory() as diretorio:
+        class ConfigBenchmark(config_base):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(diretorio, 'benchmark.db')}"
+            WTF_CSRF_ENABLED = False
+            TESTING = True
+            CARREGAMENTO_ESTRITO = True
+
+        app = create_app(ConfigBenchmark)
+        with app.app_context():
+            db.create_all()
+            inicio = time.perf_counter()
+            totais = gerar_dados(secoes=secoes, usuarios=usuarios, semente=semente, senha=SENHA)
+            tempo_geracao = time.perf_counter() - inicio
+
+            # Primeira seção e o militar com mais saldo já adquirido
+            secao_id = db.session.scalar(select(Secao.id).order_by(Secao.id))
+            militar_id, _ = db.session.execute(
+                select(PeriodoAquisitivo.usuario_id, func.sum(PeriodoAquisitivo.dias_saldo).label('saldo'))
+                .where(PeriodoAquisitivo.data_fim_periodo <= date.today(), PeriodoAquisitivo.usuario_id != 1)
+                .group_by(PeriodoAquisitivo.usuario_id).order_by(func.sum(PeriodoAquisitivo.dias_saldo).desc()).limit(1)
+            ).one()
+            identidade_militar = db.session.get(Usuario, militar_id).identidade
+            token_api = criar_token('benchmark')
+
+        gestor = app.test_client()
+        militar = app.test_client()
+        anonimo = app.test_client()
+        _login(gestor, IDENTIDADE_GESTOR)
+        _login(militar, identidade_militar)
+
+        inicio_ferias = date.today() + timedelta(days=60)
+
+        def solicitar(i):
+            return militar.post('/militar/solicitar', data={
+                'tipo_solicitacao': 'DESCONTO',
+                'dias_solicitados': 1,
+                'data_inicio': (inicio_ferias + timedelta(days=2 * (i + 1))).isoformat(),
+            })
+
+        def login(i):
+            resposta = _login(anonimo, IDENTIDADE_GESTOR)
+            anonimo.get('/logout')
+            return resposta
+
+        cabecalho_api = {'Authorization': f'Bearer {token_api}'}
+
+        def sincronizar(i):
+            """Sincronia completa dos militares pela API, página a página."""
+            resposta = anonimo.get('/api/v1/usuarios?limite=1000', headers=cabecalho_api)
+            while resposta.status_code == 200 and resposta.json['proxima']:
+                resposta = anonimo.get(f"/api/v1/usuarios?limite=1000&depois={resposta.json['proxima']}",
+                                       headers=cabecalho_api)
+            return resposta
+
+        rotas = {
+            'auth.login': _medir(login, repeticoes),
+            'gestor.gerenciar_usuarios': _medir(lambda i: gestor.get('/gestor/usuarios'), repeticoes),
+            'gestor.editar_secao': _medir(lambda i: gestor.get(f'/gestor/secao/{secao_id}/editar'), repeticoes),
+            'militar.dashboard': _medir(lambda i: militar.get('/militar/dashboard'), repeticoes),
+            'militar.solicitar_ferias': _medir(solicitar, repeticoes),
+            'api.listar (sincronia)': _medir(sincronizar, max(1, repeticoes // 4)),
+        }
+
+        with app.app_context():
+            db.engine.dispose()
+
+    return {'usuarios': usuarios, 'geracao_dados_s': round(tempo_geracao, 3), 'registros': totais, 'rotas': rotas}
+
+
+def executar_benchmark(config_base, escalas, repeticoes=20, semente=42):
+    """Mede as rotas em cada escala (quantidade de militares) e retorna o relatório."""
+    from app.cache import usuarios_cache
+    from app.opcoes import invalidar_opcoes
+    from app.busca import indice_usuarios, indice_secoes
+
+    resultados = []
+    for usuarios in escalas:
+        # Os caches são por processo: cada escala usa um banco novo
+        usuarios_cache.invalidar()
+        invalidar_opcoes()
+        indice_usuarios.invalidar()
+        indice_secoes.invalidar()
+        secoes = max(1, usuarios // 50)
+        resultados.append(_medir_escala(config_base, usuarios, secoes, repeticoes, semente))
+
+    return {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'semente': semente,
+        'escalas': resultados,
+    }
+
+
+def salvar_relatorio(relatorio, caminho):
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+
+# --- Escrita concorrente ---
+
+def _medir_escrita(pragmas, threads, transacoes, leitores):
+    """
+    `threads` escritores fazem, cada um, `transacoes` transações no formato de
+    solicitar_ferias (débito do saldo + INSERT da solicitação), enquanto `leitores`
+    threads consultam a tabela sem parar.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'escrita.db')}",
+                               pool_size=threads + leitores, max_overflow=0)
+        aplicar_pragmas(engine, pragmas)
+        db.metadata.create_all(engine)
+        with engine.begin() as conexao:
+            conexao.execute(insert(Usuario.__table__), [{
+                'id': i + 1, 'nome_completo': f'Militar {i + 1}', 'nome_guerra': f'M{i + 1}', 'identidade': f'ESC{i + 1}',
+                'posto_grad': 'Sd', 'password_hash': '-', 'papel': PapelUsuario.MILITAR.name,
+            } for i in range(threads)])
+            conexao.execute(insert(PeriodoAquisitivo.__table__), [{
+                'id': i + 1, 'usuario_id': i + 1, 'ano_referencia': 2000, 'data_inicio_periodo': date(2000, 1, 1),
+                'data_fim_periodo': date(2000, 12, 31), 'dias_saldo': transacoes,
+            } for i in range(threads)])
+
+        erros = [0]
+        leituras = [0]
+        parar = threading.Event()
+        lock = threading.Lock()
+
+        def escritor(n):
+            for i in range(transacoes):
+                try:
+                    with engine.begin() as conexao:
+                        conexao.execute(
+                            update(PeriodoAquisitivo.__table__)
+                            .where(PeriodoAquisitivo.id == n + 1, PeriodoAquisitivo.dias_saldo >= 1)
+                            .values(dias_saldo=PeriodoAquisitivo.dias_saldo - 1)
+                        )
+                        conexao.execute(insert(SolicitacaoFerias.__table__).values(
+                            solicitante_id=n + 1, periodo_aquisitivo_id=n + 1, data_inicio=date(2001, 1, 1),
+                            data_fim=date(2001, 1, 1), dias_solicitados=1, tipo_solicitacao='DESCONTO',
+                            status=StatusFerias.SOLICITADA.name, data_solicitacao=datetime(2000, 12, 1),
+                        ))
+                except OperationalError:
+                    with lock:
+                        erros[0] += 1
+
+        def leitor():
+            while not parar.is_set():
+                try:
+                    with engine.connect() as conexao:
+                        conexao.execute(select(func.count()).select_from(SolicitacaoFerias.__table__)).scalar()
+                except OperationalError:
+                    continue
+                with lock:
+                    leituras[0] += 1
+
+        threads_leitoras = [threading.Thread(target=leitor) for _ in range(leitores)]
+        threads_escritoras = [threading.Thread(target=escritor, args=(n,)) for n in range(threads)]
+        for t in threads_leitoras:
+            t.start()
+        inicio = time.perf_counter()
+        for t in threads_escritoras:
+            t.start()
+        for t in threads_escritoras:
+            t.join()
+        duracao = time.perf_counter() - inicio
+        parar.set()
+        for t in threads_leitoras:
+            t.join()
+
+        with engine.connect() as conexao:
+            gravadas = conexao.execute(select(func.count()).select_from(SolicitacaoFerias.__table__)).scalar()
+            modo = conexao.exec_driver_sql('PRAGMA journal_mode').scalar()
+        engine.dispose()
+
+    return {
+        'journal_mode': modo,
+        'pragmas': pragmas,
+        'transacoes': gravadas,
+        'erros': erros[0],
+        'duracao_s': round(duracao, 3),
+        'transacoes_por_s': round(gravadas / duracao, 1),
+        'leituras_por_s': round(leituras[0] / duracao, 1),
+    }
+
+
+def benchmark_escrita(pragmas, threads=8, transacoes=200, leitores=2):
+    """Compara a vazão de escrita concorrente sem PRAGMAs e com `pragmas`."""
+    return {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'threads': threads,
+        'leitores': leitores,
+        'cenarios': {
+            'sem_perfil': _medir_escrita({}, threads, transacoes, leitores),
+            'com_perfil': _medir_escrita(pragmas, threads, transacoes, leitores),
+        },
+    }
+
+
+# --- Ataque ao login ---
+
+IP_ATACANTE = '203.0.113.7'
+IP_LEGITIMO = '198.51.100.20'
+
+
+def _medir_ataque(config_base, ativo, tentativas):
+    """
+    Simula um script enviando `tentativas` senhas erradas de um mesmo IP, contra uma
+    identidade (força bruta) e contra várias (pulverização), e mede a CPU gasta pelo
+    processo. Depois, um militar não atacado entra a partir de outro IP.
+    """
+    from app.limitador import limitador_login
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        class ConfigAtaque(config_base):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(diretorio, 'login.db')}"
+            WTF_CSRF_ENABLED = False
+            TESTING = True
+            LOGIN_LIMITE_ATIVO = ativo
+            LOGIN_LIMITE_REDIS_URL = None
+
+        app = create_app(ConfigAtaque)
+        with app.app_context():
+            db.create_all()
+            gerar_dados(secoes=1, usuarios=20, semente=1, senha=SENHA)
+            identidades = db.session.scalars(select(Usuario.identidade).order_by(Usuario.id)).all()
+        atacadas, identidade_legitima = identidades[:-1], identidades[-1]
+
+        cenarios = {}
+        for nome, alvo in (('forca_bruta', lambda i: IDENTIDADE_GESTOR),
+                           ('pulverizacao', lambda i: atacadas[i % len(atacadas)])):
+            limitador_login.limpar()
+            # Sem cookies, como um script: as mensagens flash não se acumulam na sessão
+            atacante = app.test_client(use_cookies=False)
+            atacante.environ_base['REMOTE_ADDR'] = IP_ATACANTE
+            status = {}
+            inicio_cpu, inicio = time.process_time(), time.perf_counter()
+            for i in range(tentativas):
+                codigo = atacante.post('/login', data={'identidade': alvo(i), 'password': 'errada'}).status_code
+                status[codigo] = status.get(codigo, 0) + 1
+            cpu, duracao = time.process_time() - inicio_cpu, time.perf_counter() - inicio
+
+            legitimo = app.test_client()
+            legitimo.environ_base['REMOTE_ADDR'] = IP_LEGITIMO
+            resposta = _login(legitimo, identidade_legitima)
+            cenarios[nome] = {
+                'tentativas': tentativas,
+                'cpu_s': round(cpu, 3),
+                'cpu_por_tentativa_ms': round(cpu / tentativas * 1000, 3),
+                'duracao_s': round(duracao, 3),
+                'status': {str(codigo): quantidade for codigo, quantidade in sorted(status.items())},
+                'limitador': limitador_login.estatisticas(),
+                # Login errado também redireciona (para /login)
+                'login_legitimo': resposta.status_code == 302 and not resposta.location.endswith('/login'),
+            }
+
+        with app.app_context():
+            db.engine.dispose()
+    return cenarios
+
+
+def benchmark_login(config_base, tentativas=100):
+    """Compara a CPU gasta por um ataque ao login sem e com o limite de tentativas."""
+    sem_limite = _medir_ataque(config_base, False, tentativas)
+    com_limite = _medir_ataque(config_base, True, tentativas)
+    return {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cenarios': {
+            nome: {
+                'sem_limite': sem_limite[nome],
+                'com_limite': com_limite[nome],
+                'cpu_economizada_s': round(sem_limite[nome]['cpu_s'] - com_limite[nome]['cpu_s'], 3),
+            }
+            for nome in sem_limite
+        },
+    }
@@ -0,0 +1,141 @@
+"""
+/Recursos-Humanos-Ferias/app/busca.py
+
+Busca por prefixo, sem diferenciar acentos e maiúsculas, para os campos de seleção com
+carregamento sob demanda (Chefe da Seção, Seção do militar).
+
+Cada índice fica em memória, por processo: uma lista ordenada de (palavra normalizada, id)
+em que a busca de um prefixo é uma bissecção. O índice é reconstruído quando o contador
+de versão correspondente (app/versoes.py) muda, o que também cobre alterações feitas por
+outros processos; conferir a versão custa uma consulta por chave primária.
+"""
+import bisect
+import heapq
+import threading
+import unicodedata
+from sqlalchemy import select
+from app import db
+from app.models import Usuario, Secao, Versao
+from app.versoes import CHAVE_USUARIOS, CHAVE_SECOES
+
+
+def normalizar(texto):
+    """Minúsculas e sem acentos: 'Conceição' -> 'conceicao'."""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+class _Snapshot:
+    """Conteúdo imutável de um índice; substituído por inteiro a cada reconstrução."""
+
+    def __init__(self, versao, registros):
+        self.versao = versao
+        self.rotulos = {}
+        self.ordem = {}
+        self.palavras = {}
+        entradas = []
+        for id_registro, rotulo, ordem, textos in registros:
+            palavras = {p for texto in textos for p in normalizar(texto).split()}
+            self.rotulos[id_registro] = rotulo
+            self.ordem[id_registro] = normalizar(ordem)
+            self.palavras[id_registro] = palavras
+            entradas.extend((palavra, id_registro) for palavra in palavras)
+        entradas.sort()
+        self.chaves = [palavra for palavra, _ in entradas]
+        self.ids = [id_registro for _, id_registro in entradas]
+
+    def _com_prefixo(self, prefixo):
+        inicio = bisect.bisect_left(self.chaves, prefixo)
+        fim = bisect.bisect_left(self.chaves, prefixo + '\uffff', inicio)
+        return set(self.ids[inicio:fim])
+
+    def buscar(self, consulta, limite):
+        termos = normalizar(consulta).split()
+        if not termos:
+            return []
+        # Candidatos pelo termo mais longo (o mais seletivo); os demais termos filtram
+        termos.sort(key=len, reverse=True)
+        candidatos = self._com_prefixo(termos[0])
+        for termo in termos[1:]:
+            candidatos = {i for i in candidatos if any(p.startswith(termo) for p in self.palavras[i])}
+
+        inicio_consulta = normalizar(consulta).strip()
+        melhores = heapq.nsmallest(
+            limite, candidatos,
+            key=lambda i: (not self.ordem[i].startswith(inicio_consulta), self.ordem[i], i)
+        )
+        return [(i, self.rotulos[i]) for i in melhores]
+
+
+class IndicePrefixo:
+    def __init__(self, chave_versao, carregar):
+        self.chave_versao = chave_versao
+        # carregar(ids=None) retorna [(id, rotulo, texto_de_ordenacao, [textos pesquisáveis])],
+        # de todos os registros ou só dos `ids`
+        self._carregar = carregar
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _versao_atual(self):
+        return db.session.connection().execute(
+            select(Versao.valor).where(Versao.chave == self.chave_versao)
+        ).scalar() or 0
+
+    def atual(self):
+        """Snapshot em dia com o banco, reconstruído se a versão mudou."""
+        versao = self._versao_atual()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.versao != versao:
+            with self._lock:
+                if self._snapshot is None or self._snapshot.versao != versao:
+                    self._snapshot = _Snapshot(versao, self._carregar())
+                snapshot = self._snapshot
+        return snapshot
+
+    def invalidar(self):
+        """Descarta o índice (ex.: ao trocar de banco, cujos contadores recomeçam)."""
+        self._snapshot = None
+
+    def buscar(self, consulta, limite=10):
+        """Lista [(id, rótulo)] dos melhores resultados para `consulta`."""
+        return self.atual().buscar(consulta, limite)
+
+    def rotulo(self, id_registro):
+        """
+        Rótulo do registro (ou None se não existir), para exibir a opção já selecionada.
+        Consulta só o registro, pela chave primária, sem reconstruir o índice.
+        """
+        registros = self._carregar([id_registro])
+        return registros[0][1] if registros else None
+
+
+def _carregar_usuarios(ids=None):
+    consulta = select(Usuario.id, Usuario.posto_grad, Usuario.nome_guerra, Usuario.nome_completo, Usuario.identidade)
+    if ids is not None:
+        consulta = consulta.where(Usuario.id.in_(ids))
+    linhas = db.session.execute(consulta)
+    return [
+        (id_usuario, f'{posto_grad} {nome_guerra} - {nome_completo} ({identidade})', nome_guerra,
+         [nome_guerra, nome_completo, identidade])
+        for id_usuario, posto_grad, nome_guerra, nome_completo, identidade in linhas
+    ]
+
+
+def _carregar_secoes(ids=None):
+    consulta = select(Secao.id, Secao.nome)
+    if ids is not None:
+        consulta = consulta.where(Secao.id.in_(ids))
+    return [(id_secao, nome, nome, [nome]) for id_secao, nome in db.session.execute(consulta)]
+
+
+indice_usuarios = IndicePrefixo(CHAVE_USUARIOS, _carregar_usuarios)
+indice_secoes = IndicePrefixo(CHAVE_SECOES, _carregar_secoes)
+
+
+def opcao_selecionada(indice, id_registro, vazia):
+    """Choices de um campo com carregamento sob demanda: a opção vazia e a selecionada, se houver."""
+    opcoes = [vazia]
+    rotulo = indice.rotulo(id_registro) if id_registro else None
+    if rotulo:
+        opcoes.append((id_registro, rotulo))
+    return opcoes
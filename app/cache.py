@@ -0,0 +1,131 @@
+"""
+/Recursos-Humanos-Ferias/app/cache.py
+
+Cache em memória (por processo) com expiração (TTL) e descarte LRU,
+usado para evitar consultas repetidas ao banco.
+"""
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.eventos import ao_confirmar
+from app.models import Usuario
+
+
+class CacheLRU:
+    """Dicionário limitado a `max_itens` entradas, cada uma válida por `ttl` segundos."""
+
+    def __init__(self, max_itens=1024, ttl=300):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configurar(self, max_itens, ttl):
+        with self._lock:
+            self.max_itens = max_itens
+            self.ttl = ttl
+            self._itens.clear()
+
+    def get(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._itens[chave]
+                self.misses += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return item[1]
+
+    def set(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def invalidar(self, chave=None):
+        """Remove uma entrada, ou todas se nenhuma chave for informada."""
+        with self._lock:
+            if chave is None:
+                self._itens.clear()
+            else:
+                self._itens.pop(chave, None)
+
+    def estatisticas(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'itens': len(self._itens),
+                'max_itens': self.max_itens,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'taxa_acerto': self.hits / total if total else 0.0,
+            }
+
+
+# --- Cache do usuário da sessão (usado pelo user_loader do Flask-Login) ---
+
+usuarios_cache = CacheLRU()
+
+_COLUNAS_USUARIO = [c.key for c in Usuario.__mapper__.column_attrs]
+
+
+def _guardar(usuario):
+    usuarios_cache.set(usuario.id, {c: getattr(usuario, c) for c in _COLUNAS_USUARIO})
+
+
+def carregar_usuario(user_id):
+    """
+    Retorna o Usuario de `user_id`, consultando o banco apenas quando ele não está no cache.
+
+    O cache guarda só os valores das colunas; a cada requisição o objeto é recriado e
+    anexado à sessão atual sem nova consulta, de modo que os relacionamentos
+    (ex.: user.secao) continuam funcionando normalmente.
+
+    Alterações confirmadas neste processo descartam a entrada na hora; as feitas por outros
+    processos (workers do `flask serve`) só são vistas quando a entrada expira (TTL), exceto
+    nas páginas que dependem do papel, que chamam revalidar_usuario().
+    """
+    dados = usuarios_cache.get(user_id)
+    if dados is None:
+        usuario = db.session.get(Usuario, user_id)
+        if usuario is not None:
+            _guardar(usuario)
+        return usuario
+
+    usuario = Usuario(**dados)
+    make_transient_to_detached(usuario)
+    return db.session.merge(usuario, load=False)
+
+
+def revalidar_usuario(usuario):
+    """
+    Relê do banco as colunas do usuário da sessão e atualiza o objeto e o cache. Usado antes
+    de checar permissões: um papel alterado em outro processo vale na hora. Consulta de
+    chave primária na conexão (Core), sem passar pelo ORM. Retorna False se ele não existir mais.
+    """
+    linha = db.session.connection().execute(
+        select(Usuario.__table__).where(Usuario.id == usuario.id)
+    ).first()
+    if linha is None:
+        return False
+    for coluna in _COLUNAS_USUARIO:
+        set_committed_value(usuario, coluna, linha._mapping[Usuario.__table__.c[coluna]])
+    _guardar(usuario)
+    return True
+
+
+@ao_confirmar(Usuario)
+def _invalidar_usuarios(ids):
+    # Qualquer alteração confirmada (papel, seção, senha...) descarta a cópia em cache
+    for user_id in ids:
+        usuarios_cache.invalidar(user_id)
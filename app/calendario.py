@@ -0,0 +1,119 @@
+"""
+/Recursos-Humanos-Ferias/app/calendario.py
+
+Calendário de férias de uma seção: quantos militares estão ausentes em cada dia,
+os dias de maior ausência e os pares de solicitações de militares diferentes que se
+sobrepõem. Um militar com duas solicitações no mesmo dia conta como um ausente.
+
+O cálculo é uma varredura (sweep line) sobre os intervalos ordenados pela data de
+início, em O(n log n + k) para n solicitações e k sobreposições, em vez de comparar
+todos os pares entre si.
+"""
+import heapq
+from datetime import timedelta
+from sqlalchemy import select
+from app import db
+from app.models import Usuario, SolicitacaoFerias, StatusFerias
+
+
+# Solicitações que ocupam o calendário (as reprovadas e canceladas não contam)
+STATUS_OCUPAM_CALENDARIO = (
+    StatusFerias.SOLICITADA,
+    StatusFerias.APROVADA_CHEFE,
+    StatusFerias.APROVADA_GESTOR,
+    StatusFerias.ALTERADA,
+)
+
+
+class Intervalo:
+    """Um período de ausência (uma solicitação de férias)."""
+    __slots__ = ('id', 'usuario_id', 'inicio', 'fim')
+
+    def __init__(self, id_solicitacao, usuario_id, inicio, fim):
+        self.id = id_solicitacao
+        self.usuario_id = usuario_id
+        self.inicio = inicio
+        self.fim = fim
+
+
+class Calendario:
+    """Resultado do cálculo para o intervalo de datas [inicio, fim]."""
+
+    def __init__(self, inicio, fim, ausentes_por_dia, sobreposicoes):
+        self.inicio = inicio
+        self.fim = fim
+        self.ausentes_por_dia = ausentes_por_dia  # lista: índice 0 = `inicio`
+        self.sobreposicoes = sobreposicoes        # lista de pares (Intervalo, Intervalo)
+        self.pico = max(ausentes_por_dia, default=0)
+
+    @property
+    def dias_pico(self):
+        if self.pico == 0:
+            return []
+        return [self.inicio + timedelta(days=i) for i, n in enumerate(self.ausentes_por_dia) if n == self.pico]
+
+
+def calcular_calendario(intervalos, inicio, fim):
+    """
+    Calcula o calendário dos `intervalos` (objetos Intervalo) dentro de [inicio, fim].
+
+    Em uma única passada pelos intervalos ordenados por início: acumula um vetor de
+    diferenças (+1 no início, -1 após o fim) para a contagem diária e mantém um heap dos
+    intervalos ainda ativos para listar as sobreposições.
+
+    Na contagem diária, cada intervalo soma só os dias ainda não cobertos por outro do
+    mesmo militar: como os anteriores começam antes, basta guardar o último dia coberto.
+    """
+    total_dias = (fim - inicio).days + 1
+    diferencas = [0] * (total_dias + 1)
+    coberto_ate = {}  # usuario_id -> último dia (índice) já contado
+    sobreposicoes = []
+    ativos = []  # heap de (fim, ordem, intervalo)
+
+    for ordem, intervalo in enumerate(sorted(intervalos, key=lambda i: (i.inicio, i.fim))):
+        if intervalo.fim < inicio or intervalo.inicio > fim:
+            continue
+
+        a = max((intervalo.inicio - inicio).days, 0)
+        b = min((intervalo.fim - inicio).days, total_dias - 1)
+        a = max(a, coberto_ate.get(intervalo.usuario_id, -1) + 1)
+        if a <= b:
+            diferencas[a] += 1
+            diferencas[b + 1] -= 1
+            coberto_ate[intervalo.usuario_id] = b
+
+        # Descarta os que terminaram antes do início deste; os demais (de outros militares) se sobrepõem a ele
+        while ativos and ativos[0][0] < intervalo.inicio:
+            heapq.heappop(ativos)
+        sobreposicoes.extend((outro, intervalo) for _, _, outro in ativos if outro.usuario_id != intervalo.usuario_id)
+        heapq.heappush(ativos, (intervalo.fim, ordem, intervalo))
+
+    ausentes_por_dia = []
+    acumulado = 0
+    for delta in diferencas[:total_dias]:
+        acumulado += delta
+        ausentes_por_dia.append(acumulado)
+
+    return Calendario(inicio, fim, ausentes_por_dia, sobreposicoes)
+
+
+def calendario_secao(secao_id, inicio, fim, ignorar_solicitacao=None, incluir=()):
+    """
+    Calendário das solicitações dos integrantes da seção que tocam [inicio, fim], mais os
+    intervalos de `incluir` (ex.: a solicitação ainda não gravada, para prever a ausência).
+    """
+    consulta = select(
+        SolicitacaoFerias.id, SolicitacaoFerias.solicitante_id,
+        SolicitacaoFerias.data_inicio, SolicitacaoFerias.data_fim
+    ).join(Usuario, Usuario.id == SolicitacaoFerias.solicitante_id).where(
+        Usuario.secao_id == secao_id,
+        SolicitacaoFerias.status.in_(STATUS_OCUPAM_CALENDARIO),
+        SolicitacaoFerias.data_inicio <= fim,
+        SolicitacaoFerias.data_fim >= inicio,
+    )
+    if ignorar_solicitacao is not None:
+        consulta = consulta.where(SolicitacaoFerias.id != ignorar_solicitacao)
+
+    intervalos = [Intervalo(*linha) for linha in db.session.execute(consulta)]
+    intervalos.extend(incluir)
+    return calcular_calendario(intervalos, inicio, fim)
@@ -0,0 +1,18 @@
+"""
+/Recursos-Humanos-Ferias/app/carregamento.py
+
+Estratégias de carregamento (eager loading) das listagens.
+
+Cada listagem declara explicitamente os relacionamentos que o template usa. Com
+CARREGAMENTO_ESTRITO ligado (testes e benchmarks), qualquer outro relacionamento acessado
+gera erro imediato (raiseload), em vez de disparar uma consulta por linha (N+1).
+"""
+from flask import current_app
+from sqlalchemy.orm import raiseload
+
+
+def carregar(*opcoes):
+    """Opções para Query.options(): as informadas e, no modo estrito, raiseload('*')."""
+    if current_app.config['CARREGAMENTO_ESTRITO']:
+        return (*opcoes, raiseload('*'))
+    return opcoes
@@ -0,0 +1,324 @@
+"""
+/Recursos-Humanos-Ferias/app/commands.py
+
+Comandos de linha de comando (flask <comando>) da aplicação.
+"""
+import os
+import time
+import click
+
+
+def register_commands(app):
+    """Registra os comandos CLI na instância da aplicação."""
+
+    @app.cli.command("import-usuarios")
+    @click.argument("arquivo", type=click.File('r', encoding='utf-8-sig'))
+    @click.option("--lote", default=1000, show_default=True, help="Quantidade de linhas gravadas por INSERT.")
+    @click.option("--processos", default=None, type=int, help="Processos para o cálculo das senhas (padrão: nº de CPUs).")
+    @click.option("--delimitador", default=',', show_default=True, help="Separador de colunas do CSV.")
+    def import_usuarios(arquivo, lote, processos, delimitador):
+        """Importa militares de um arquivo CSV em lotes."""
+        from app.importacao import importar_usuarios
+
+        inicio = time.perf_counter()
+        try:
+            relatorio = importar_usuarios(arquivo, tamanho_lote=lote, processos=processos, delimitador=delimitador)
+        except ValueError as e:
+            print(f"Erro: {e}")
+            return
+
+        total_inseridos = 0
+        total_erros = 0
+        for item in relatorio:
+            total_inseridos += item['inseridos']
+            total_erros += len(item['erros'])
+            print(f"Lote {item['lote']}: {item['inseridos']}/{item['linhas']} inseridos, {len(item['erros'])} erro(s)")
+            for num_linha, motivo in item['erros']:
+                print(f"  linha {num_linha}: {motivo}")
+
+        print(f"Importação concluída em {time.perf_counter() - inicio:.1f}s: "
+              f"{total_inseridos} militares inseridos, {total_erros} erro(s).")
+
+    @app.cli.command("gerar-periodos")
+    @click.option("--ano", required=True, type=int, help="Ano de referência do período aquisitivo.")
+    @click.option("--dry-run", "simular", is_flag=True, help="Apenas conta os períodos que seriam criados.")
+    def gerar_periodos_cmd(ano, simular):
+        """Abre o período aquisitivo do ano para todos os militares."""
+        from app.periodos import gerar_periodos
+
+        inicio = time.perf_counter()
+        criados, existentes = gerar_periodos(ano, simular=simular)
+        duracao = time.perf_counter() - inicio
+
+        acao = "seriam criados" if simular else "criados"
+        print(f"Períodos de {ano}: {criados} {acao}, {existentes} já existentes ({duracao:.2f}s).")
+
+    @app.cli.command("exportar")
+    @click.argument("tipo", type=click.Choice(['solicitacoes', 'periodos']))
+    @click.option("--saida", type=click.File('w', encoding='utf-8', lazy=True), default='-', help="Arquivo de saída (padrão: saída padrão).")
+    def exportar_cmd(tipo, saida):
+        """Exporta solicitações de férias ou períodos aquisitivos em CSV."""
+        from app import db
+        from app.exportacao import gerar_csv
+        from app.replica import usar_replica
+
+        usar_replica(db.session)
+
+        for bloco in gerar_csv(tipo):
+            saida.write(bloco)
+
+    @app.cli.command("seed")
+    @click.option("--secoes", default=20, show_default=True)
+    @click.option("--usuarios", default=1000, show_default=True)
+    @click.option("--anos", default=3, show_default=True, help="Anos de períodos aquisitivos anteriores ao atual.")
+    @click.option("--semente", default=42, show_default=True, help="Semente do gerador (mesma semente, mesmos dados).")
+    @click.option("--senha", default='senha123', show_default=True, help="Senha de todos os usuários gerados.")
+    def seed(secoes, usuarios, anos, semente, senha):
+        """Popula um banco vazio com dados sintéticos."""
+        from app.sintetico import gerar_dados, IDENTIDADE_GESTOR
+
+        inicio = time.perf_counter()
+        try:
+            totais = gerar_dados(secoes=secoes, usuarios=usuarios, anos=anos, semente=semente, senha=senha)
+        except ValueError as e:
+            print(f"Erro: {e}")
+            return
+        print(f"Dados gerados em {time.perf_counter() - inicio:.1f}s: "
+              + ", ".join(f"{quantidade} {tabela}" for tabela, quantidade in totais.items()))
+        print(f"Gestor: identidade {IDENTIDADE_GESTOR}, senha '{senha}'.")
+
+    @app.cli.command("benchmark")
+    @click.option("--escalas", default='100,10000,100000', show_default=True, help="Quantidades de militares, separadas por vírgula.")
+    @click.option("--repeticoes", default=20, show_default=True, help="Requisições medidas por rota.")
+    @click.option("--semente", default=42, show_default=True)
+    @click.option("--saida", default='benchmark.json', show_default=True, help="Arquivo JSON com os resultados.")
+    def benchmark(escalas, repeticoes, semente, saida):
+        """Mede as rotas principais em bancos sintéticos de vários tamanhos."""
+        from app.benchmark import executar_benchmark, salvar_relatorio
+        from config import perfil_ativo
+
+        lista_escalas = [int(e) for e in escalas.split(',') if e.strip()]
+        relatorio = executar_benchmark(perfil_ativo(), lista_escalas, repeticoes=repeticoes, semente=semente)
+        salvar_relatorio(relatorio, saida)
+
+        for escala in relatorio['escalas']:
+            print(f"{escala['usuarios']} militares (dados gerados em {escala['geracao_dados_s']}s):")
+            for rota, medidas in escala['rotas'].items():
+                print(f"  {rota:<28} mediana {medidas['mediana_ms']:>9.2f} ms   p95 {medidas['p95_ms']:>9.2f} ms   status {medidas['status']}")
+        print(f"Resultados gravados em {saida}.")
+
+    @app.cli.command("benchmark-escrita")
+    @click.option("--threads", default=8, show_default=True, help="Threads escrevendo ao mesmo tempo.")
+    @click.option("--transacoes", default=200, show_default=True, help="Transações por thread.")
+    @click.option("--leitores", default=2, show_default=True, help="Threads lendo durante as escritas.")
+    @click.option("--saida", default=None, help="Arquivo JSON para gravar os resultados.")
+    def benchmark_escrita_cmd(threads, transacoes, leitores, saida):
+        """Compara a escrita concorrente no SQLite sem e com os PRAGMAs do perfil de produção."""
+        from app.benchmark import benchmark_escrita, salvar_relatorio
+        from config import PRAGMAS_SQLITE
+
+        relatorio = benchmark_escrita(PRAGMAS_SQLITE, threads=threads, transacoes=transacoes, leitores=leitores)
+        for nome, cenario in relatorio['cenarios'].items():
+            print(f"{nome:<11} ({cenario['journal_mode']}): {cenario['transacoes_por_s']:>8.1f} transações/s, "
+                  f"{cenario['leituras_por_s']:>8.1f} leituras/s, {cenario['erros']} erro(s), {cenario['duracao_s']}s")
+        if saida:
+            salvar_relatorio(relatorio, saida)
+            print(f"Resultados gravados em {saida}.")
+
+    @app.cli.command("benchmark-login")
+    @click.option("--tentativas", default=100, show_default=True, help="Senhas erradas enviadas por cenário.")
+    @click.option("--saida", default=None, help="Arquivo JSON para gravar os resultados.")
+    def benchmark_login_cmd(tentativas, saida):
+        """Mede a CPU gasta por um ataque ao /login sem e com o limite de tentativas."""
+        from app.benchmark import benchmark_login, salvar_relatorio
+        from config import perfil_ativo
+
+        relatorio = benchmark_login(perfil_ativo(), tentativas=tentativas)
+        for nome, cenario in relatorio['cenarios'].items():
+            for modo in ('sem_limite', 'com_limite'):
+                medidas = cenario[modo]
+                print(f"{nome:<12} {modo:<10}: CPU {medidas['cpu_s']:>7.3f}s ({medidas['cpu_por_tentativa_ms']:>7.2f} ms/tentativa), "
+                      f"status {medidas['status']}, login legítimo {'ok' if medidas['login_legitimo'] else 'falhou'}")
+            print(f"{'':<12} CPU economizada: {cenario['cpu_economizada_s']}s")
+        if saida:
+            salvar_relatorio(relatorio, saida)
+            print(f"Resultados gravados em {saida}.")
+
+    @app.cli.command("rebuild-aggregates")
+    def rebuild_aggregates():
+        """Recalcula do zero o resumo do dashboard do gestor e aponta divergências."""
+        from app.agregados import recalcular
+
+        inicio = time.perf_counter()
+        divergencias = recalcular()
+        for secao_id, chave, gravado, correto in divergencias:
+            print(f"  seção {secao_id}, {chave}: gravado {gravado}, correto {correto}")
+        situacao = f"{len(divergencias)} divergência(s) corrigida(s)" if divergencias else "resumo consistente"
+        print(f"Resumo recalculado em {time.perf_counter() - inicio:.2f}s: {situacao}.")
+
+    @app.cli.command("worker")
+    @click.option("--threads", default=4, show_default=True, help="Tarefas executadas em paralelo.")
+    @click.option("--lote", default=20, show_default=True, help="Tarefas reservadas por vez.")
+    @click.option("--intervalo", default=2.0, show_default=True, help="Espera (s) quando a fila está vazia.")
+    @click.option("--uma-vez", is_flag=True, help="Sai quando não houver mais tarefas prontas.")
+    def worker(threads, lote, intervalo, uma_vez):
+        """Executa as tarefas da fila (notificações etc.) até ser interrompido."""
+        from flask import current_app
+        from app.tarefas import executar_worker
+
+        inicio = time.perf_counter()
+        print(f"Worker iniciado: {threads} thread(s), lotes de {lote}. Ctrl+C para encerrar.")
+        concluidas, com_erro = executar_worker(current_app._get_current_object(), threads=threads, lote=lote,
+                                               intervalo=intervalo, uma_vez=uma_vez)
+        print(f"Worker encerrado após {time.perf_counter() - inicio:.1f}s: "
+              f"{concluidas} tarefa(s) concluída(s), {com_erro} falha(s).")
+
+    @app.cli.command("serve")
+    @click.option("--host", default='127.0.0.1', show_default=True)
+    @click.option("--port", default=8000, show_default=True)
+    @click.option("--workers", default=os.cpu_count() or 1, show_default="nº de CPUs", help="Processos de trabalho.")
+    @click.option("--threads", default=4, show_default=True, help="Threads por processo.")
+    def serve(host, port, workers, threads):
+        """Servidor de produção com vários processos e threads (Linux). SIGHUP recarrega."""
+        from flask import current_app
+        from app.servidor import servir
+
+        servir(current_app._get_current_object(), host=host, port=port, workers=workers, threads=threads)
+
+    @app.cli.command("planejar-ferias")
+    @click.argument("secao_id", type=int)
+    @click.option("--ano", required=True, type=int, help="Ano a planejar.")
+    @click.option("--minimo", type=int, default=None, help="Efetivo mínimo presente por dia (padrão: LIMITE_AUSENCIA_SECAO).")
+    @click.option("--tempo", default=2.0, show_default=True, help="Tempo limite (s) da busca.")
+    @click.option("--dry-run", "simular", is_flag=True, help="Apenas mostra as propostas, sem gravar os rascunhos.")
+    def planejar_ferias(secao_id, ano, minimo, tempo, simular):
+        """Propõe as férias da seção no ano e grava as propostas como solicitações em rascunho."""
+        from flask import current_app
+        from app import db
+        from app.planejamento import planejar_secao, gravar_rascunhos
+
+        try:
+            planejamento = planejar_secao(secao_id, ano, minimo_presentes=minimo, tempo_limite=tempo,
+                                          maximo_ausentes=current_app.config['LIMITE_AUSENCIA_SECAO'] or None)
+        except ValueError as e:
+            print(f"Erro: {e}")
+            return
+
+        for usuario_id, _, data_inicio, data_fim, dias, _ in planejamento.propostas():
+            print(f"  militar {usuario_id}: {data_inicio:%d/%m/%Y} a {data_fim:%d/%m/%Y} ({dias} dias)")
+        for bloco in planejamento.nao_alocados:
+            print(f"  militar {bloco.usuario_id}: {bloco.dias} dias sem data possível")
+        print(f"{len(planejamento.alocados)} proposta(s), {len(planejamento.nao_alocados)} não alocada(s); "
+              f"pico de {planejamento.pico}/{planejamento.maximo_ausentes} ausentes; "
+              f"{planejamento.tentativas} tentativa(s) em {planejamento.duracao:.2f}s.")
+
+        if simular:
+            return
+        removidos, criados = gravar_rascunhos(secao_id, planejamento)
+        db.session.commit()
+        print(f"Rascunhos gravados: {criados} criado(s), {removidos} anterior(es) substituído(s).")
+
+    @app.cli.command("arquivar")
+    @click.option("--antes-de", "antes_de", required=True, type=int, help="Arquiva o histórico de anos anteriores a este.")
+    @click.option("--lote", default=1000, show_default=True, help="Linhas movidas por transação.")
+    @click.option("--pausa", default=0.0, show_default=True, help="Espera (s) entre os lotes.")
+    @click.option("--dry-run", "simular", is_flag=True, help="Apenas conta o que seria arquivado.")
+    def arquivar_cmd(antes_de, lote, pausa, simular):
+        """Move solicitações encerradas e períodos consumidos antigos para as tabelas de arquivo."""
+        from app.arquivo import arquivar, contar_arquivaveis
+
+        inicio = time.perf_counter()
+        if simular:
+            periodos, solicitacoes = contar_arquivaveis(antes_de)
+            print(f"Seriam arquivados {periodos} período(s) (com suas solicitações) e "
+                  f"{solicitacoes} solicitação(ões) cancelada(s)/reprovada(s).")
+            return
+        movidas = arquivar(antes_de, lote=lote, pausa=pausa)
+        print(f"Arquivados em {time.perf_counter() - inicio:.1f}s: {movidas['periodos']} período(s) e "
+              f"{movidas['solicitacoes']} solicitação(ões).")
+        for tipo, ids in movidas['ja_arquivados'].items():
+            if ids:
+                print(f"Atenção: {len(ids)} {tipo} não arquivado(s): o id já existe no arquivo ({', '.join(map(str, ids[:20]))}).")
+
+    @app.cli.command("auditoria")
+    @click.option("--solicitacao", type=int, default=None, help="Histórico de uma solicitação.")
+    @click.option("--periodo", type=int, default=None, help="Histórico de um período aquisitivo.")
+    @click.option("--usuario", type=int, default=None, help="Últimas alterações feitas por um usuário.")
+    @click.option("--limite", default=100, show_default=True, help="Eventos listados com --usuario.")
+    def auditoria_cmd(solicitacao, periodo, usuario, limite):
+        """Lista os eventos da trilha de auditoria."""
+        from app import db
+        from app.auditoria import historico, alteracoes_do_usuario, SOLICITACAO, PERIODO
+        from app.replica import usar_replica
+
+        usar_replica(db.session)
+
+        if solicitacao is not None:
+            eventos = historico(SOLICITACAO, solicitacao)
+        elif periodo is not None:
+            eventos = historico(PERIODO, periodo)
+        elif usuario is not None:
+            eventos = alteracoes_do_usuario(usuario, limite)
+        else:
+            raise click.UsageError("Informe --solicitacao, --periodo ou --usuario.")
+
+        for e, dados in eventos:
+            autor = e.usuario_id if e.usuario_id is not None else 'sistema'
+            print(f"{e.criado_em:%d/%m/%Y %H:%M:%S} {e.entidade}{e.entidade_id} {e.acao} por {autor}: {dados}")
+        print(f"{len(eventos)} evento(s).")
+
+    @app.cli.command("verificar-saldos")
+    def verificar_saldos_cmd():
+        """Reconstrói os saldos dos períodos a partir da auditoria e compara com os atuais."""
+        from app import db
+        from app.auditoria import reconstruir_saldos
+        from app.replica import usar_replica
+
+        usar_replica(db.session)
+        inicio = time.perf_counter()
+        divergencias, sem_historico, conferidos = reconstruir_saldos()
+        for periodo_id, reconstruido, atual in divergencias:
+            print(f"  período {periodo_id}: auditoria {reconstruido}, atual {atual}")
+        print(f"{conferidos} período(s) conferido(s) em {time.perf_counter() - inicio:.2f}s, "
+              f"{sem_historico} sem histórico completo: {len(divergencias)} divergência(s).")
+        if divergencias:
+            raise SystemExit(1)
+
+    @app.cli.command("copiar-replica")
+    def copiar_replica():
+        """Copia o banco principal (SQLite) para a réplica de DATABASE_REPLICA_URL, para testes locais."""
+        from app import db
+        from app.replica import copiar_sqlite, BIND_REPLICA
+
+        replica = db.engines.get(BIND_REPLICA)
+        if replica is None:
+            raise click.UsageError("Configure DATABASE_REPLICA_URL.")
+        if db.engine.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+            raise click.UsageError("copiar-replica só copia bancos SQLite; use a replicação do servidor.")
+        inicio = time.perf_counter()
+        copiar_sqlite(db.engine, replica)
+        print(f"Réplica atualizada a partir do banco principal em {time.perf_counter() - inicio:.2f}s.")
+
+    @app.cli.command("criar-token-api")
+    @click.argument("nome")
+    def criar_token_api(nome):
+        """Cria o token de acesso à API /api/v1 do sistema NOME (exibido só uma vez)."""
+        from app import db
+        from app.api import criar_token
+        from app.models import TokenApi
+
+        if db.session.scalar(db.select(TokenApi.id).where(TokenApi.nome == nome)) is not None:
+            raise click.UsageError(f"Já existe um token para '{nome}'; revogue-o antes (flask revogar-token-api).")
+        token = criar_token(nome)
+        print(f"Token de '{nome}' (guarde-o agora, ele não será exibido de novo):\n{token}")
+
+    @app.cli.command("revogar-token-api")
+    @click.argument("nome")
+    def revogar_token_api(nome):
+        """Revoga o token de acesso à API do sistema NOME."""
+        from app import db
+        from app.models import TokenApi
+
+        removidos = db.session.execute(db.delete(TokenApi).where(TokenApi.nome == nome)).rowcount
+        db.session.commit()
+        print(f"Token de '{nome}' revogado." if removidos else f"Nenhum token para '{nome}'.")
@@ -1,15 +1,52 @@
 # ./Recursos-Humanos-Ferias/app/decorators.py
 
 from functools import wraps
-from flask import abort
+from flask import abort, g, request, jsonify
 from flask_login import current_user
-from .models import PapelUsuario
+from .models import PapelUsuario, Secao
 
 
 def gestor_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated or current_user.papel != PapelUsuario.GESTOR:
+        from .cache import revalidar_usuario
+
+        if not current_user.is_authenticated:
+            abort(403)
+        # O usuário vem do cache do processo: o papel pode ter sido alterado em outro worker
+        if not revalidar_usuario(current_user._get_current_object()) or current_user.papel != PapelUsuario.GESTOR:
             abort(403) # Proibido acesso
         return f(*args, **kwargs)
     return decorated_function
+
+
+def chefe_required(f):
+    """Exige que o usuário seja chefe de uma seção; a seção fica disponível em g.secao_chefiada."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            abort(403)
+        secao = Secao.query.filter_by(chefe_id=current_user.id).first()
+        if secao is None:
+            abort(403)
+        g.secao_chefiada = secao
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def token_api_required(f):
+    """Exige o cabeçalho `Authorization: Bearer <token>` da API; o sistema fica em g.sistema_api."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        from .api import token_valido
+
+        esquema, _, token = request.headers.get('Authorization', '').partition(' ')
+        sistema = token_valido(token.strip()) if esquema.lower() == 'bearer' else None
+        if sistema is None:
+            resposta = jsonify(erro='Token de acesso ausente ou inválido')
+            resposta.status_code = 401
+            resposta.headers['WWW-Authenticate'] = 'Bearer'
+            return resposta
+        g.sistema_api = sistema
+        return f(*args, **kwargs)
+    return decorated_function
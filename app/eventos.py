@@ -0,0 +1,60 @@
+"""
+/Recursos-Humanos-Ferias/app/eventos.py
+
+Rastreia, por sessão do SQLAlchemy, quais registros foram alterados e avisa os
+interessados somente depois que a transação é confirmada (commit). Um rollback
+descarta as alterações anotadas.
+"""
+from collections import defaultdict
+from sqlalchemy import event
+from app import db
+
+
+# Modelo -> lista de funções chamadas com o conjunto de ids alterados após o commit
+_callbacks = defaultdict(list)
+
+
+def ao_confirmar(modelo):
+    """
+    Decorador: registra uma função a ser chamada após o commit de uma transação
+    que criou, alterou ou removeu registros de `modelo`. A função recebe o conjunto
+    de ids (chaves primárias) afetados.
+    """
+    def decorator(f):
+        _callbacks[modelo].append(f)
+        return f
+    return decorator
+
+
+def marcar_alterados(session, modelo, ids):
+    """
+    Anota manualmente registros alterados fora do flush do ORM
+    (ex.: UPDATE em massa), para que os interessados sejam avisados no commit.
+    """
+    session.info.setdefault('alterados', defaultdict(set))[modelo].update(ids)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _anotar_alterados(session, flush_context):
+    for obj in session.new | session.dirty | session.deleted:
+        modelo = type(obj)
+        if modelo not in _callbacks:
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        marcar_alterados(session, modelo, [obj.id])
+
+
+@event.listens_for(db.session, 'after_commit')
+def _avisar_interessados(session):
+    alterados = session.info.pop('alterados', None)
+    if not alterados:
+        return
+    for modelo, ids in alterados.items():
+        for callback in _callbacks.get(modelo, []):
+            callback(ids)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _descartar_alterados(session):
+    session.info.pop('alterados', None)
@@ -0,0 +1,104 @@
+"""
+/Recursos-Humanos-Ferias/app/exportacao.py
+
+Exportação em CSV das solicitações de férias e dos períodos aquisitivos.
+
+As linhas são lidas do banco em blocos (yield_per) e convertidas em texto à medida que
+chegam, de modo que a memória usada não depende do tamanho da exportação. O histórico
+arquivado (flask arquivar) é incluído.
+"""
+import csv
+import io
+from sqlalchemy import select
+from app import db
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias
+from app.arquivo import com_arquivo
+
+
+TAMANHO_BLOCO = 1000
+
+_COLUNAS_MILITAR = [
+    ('identidade', Usuario.identidade),
+    ('posto_grad', Usuario.posto_grad),
+    ('nome_guerra', Usuario.nome_guerra),
+    ('nome_completo', Usuario.nome_completo),
+    ('secao', Secao.nome),
+]
+
+
+def _colunas(tipo, solicitacao, periodo):
+    """Colunas do CSV; `solicitacao` e `periodo` incluem as linhas arquivadas (app/arquivo.py)."""
+    if tipo == 'solicitacoes':
+        return _COLUNAS_MILITAR + [
+            ('solicitacao_id', solicitacao.c.id),
+            ('ano_referencia', periodo.c.ano_referencia),
+            ('tipo_solicitacao', solicitacao.c.tipo_solicitacao),
+            ('data_inicio', solicitacao.c.data_inicio),
+            ('data_fim', solicitacao.c.data_fim),
+            ('dias_solicitados', solicitacao.c.dias_solicitados),
+            ('status', solicitacao.c.status),
+            ('data_solicitacao', solicitacao.c.data_solicitacao),
+            ('justificativa_reprovacao', solicitacao.c.justificativa_reprovacao),
+        ]
+    return _COLUNAS_MILITAR + [
+        ('periodo_id', periodo.c.id),
+        ('ano_referencia', periodo.c.ano_referencia),
+        ('data_inicio_periodo', periodo.c.data_inicio_periodo),
+        ('data_fim_periodo', periodo.c.data_fim_periodo),
+        ('dias_saldo', periodo.c.dias_saldo),
+    ]
+
+
+TIPOS = ('solicitacoes', 'periodos')
+
+
+def _consulta(tipo):
+    solicitacao = com_arquivo(SolicitacaoFerias)
+    periodo = com_arquivo(PeriodoAquisitivo)
+    nomes, colunas = zip(*_colunas(tipo, solicitacao, periodo))
+    if tipo == 'solicitacoes':
+        consulta = select(*colunas) \
+            .join(Usuario, Usuario.id == solicitacao.c.solicitante_id) \
+            .join(periodo, periodo.c.id == solicitacao.c.periodo_aquisitivo_id) \
+            .outerjoin(Secao, Secao.id == Usuario.secao_id) \
+            .order_by(solicitacao.c.id)
+    else:
+        consulta = select(*colunas) \
+            .join(Usuario, Usuario.id == periodo.c.usuario_id) \
+            .outerjoin(Secao, Secao.id == Usuario.secao_id) \
+            .order_by(periodo.c.id)
+    return nomes, consulta
+
+
+def _formatar(valor):
+    if valor is None:
+        return ''
+    if hasattr(valor, 'name'):  # Enums (StatusFerias)
+        return valor.name
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return valor
+
+
+def gerar_csv(tipo, delimitador=';'):
+    """
+    Gerador de blocos de texto CSV (cabeçalho incluído) para `tipo`
+    ('solicitacoes' ou 'periodos'). Cada bloco tem até TAMANHO_BLOCO linhas.
+    O BOM inicial faz o Excel reconhecer o arquivo como UTF-8.
+    """
+    buffer = io.StringIO()
+    buffer.write('\ufeff')
+    escritor = csv.writer(buffer, delimiter=delimitador)
+
+    nomes, consulta = _consulta(tipo)
+    escritor.writerow(nomes)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    resultado = db.session.execute(consulta.execution_options(yield_per=TAMANHO_BLOCO))
+    for bloco in resultado.partitions():
+        escritor.writerows([_formatar(v) for v in linha] for linha in bloco)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -3,9 +3,11 @@
 """
 from flask import flash
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, BooleanField, SubmitField, SelectField, DateField
+from wtforms import StringField, PasswordField, BooleanField, SubmitField, SelectField, DateField, \
+    SelectMultipleField, TextAreaField
 from wtforms.validators import DataRequired, Length, EqualTo, ValidationError, Optional
-from .models import Usuario, PapelUsuario
+from . import db
+from .models import Usuario, Secao, PapelUsuario
 from datetime import date
 
 # ---Formulários de Acesso---
@@ -26,9 +28,18 @@ class SecaoForm(FlaskForm):
 
 class SecaoEditForm(FlaskForm):
     nome = StringField('Nome da Seção', validators=[DataRequired(), Length(min=3, max=100)])
-    chefe_id = SelectField('Chefe da Seção', coerce=int, validators=[Optional()])
+    # Opções carregadas sob demanda (busca); o id escolhido é validado no servidor
+    chefe_id = SelectField('Chefe da Seção', coerce=int, validate_choice=False, validators=[Optional()])
     submit = SubmitField('Salvar Alterações')
 
+    def validate_chefe_id(self, chefe_id):
+        if chefe_id.data and db.session.get(Usuario, chefe_id.data) is None:
+            raise ValidationError('Militar não encontrado.')
+
+def _validar_secao(form, secao_id):
+    if secao_id.data and db.session.get(Secao, secao_id.data) is None:
+        raise ValidationError('Seção não encontrada.')
+
 # ---Formulários para Usuários---
 
 class UsuarioCreateForm(FlaskForm):
@@ -37,7 +48,7 @@ class UsuarioCreateForm(FlaskForm):
     nome_guerra = StringField('Nome de Guerra', validators=[DataRequired()])
     identidade = StringField('Identidade', validators=[DataRequired()])
     posto_grad = StringField('Posto/Graduação', validators=[DataRequired()])
-    secao_id = SelectField('Seção', coerce=int, validators=[Optional()])
+    secao_id = SelectField('Seção', coerce=int, validate_choice=False, validators=[Optional(), _validar_secao])
     papel = SelectField('Papel', choices=[(papel.name, papel.value) for papel in PapelUsuario], validators=[DataRequired()])
     password = PasswordField('Senha', validators=[DataRequired(), Length(min=6)])
     password2 = PasswordField('Confirmar Senha', validators=[DataRequired(), EqualTo('password', message='As senhas devem ser iguais.')])
@@ -54,7 +65,7 @@ class UsuarioEditForm(FlaskForm):
     nome_guerra = StringField('Nome de Guerra', validators=[DataRequired()])
     identidade = StringField('Identidade', validators=[DataRequired()])
     posto_grad = StringField('Posto/Graduação', validators=[DataRequired()])
-    secao_id = SelectField('Seção', coerce=int, validators=[Optional()])
+    secao_id = SelectField('Seção', coerce=int, validate_choice=False, validators=[Optional(), _validar_secao])
     papel = SelectField('Papel', choices=[(papel.name, papel.value) for papel in PapelUsuario], validators=[DataRequired()])
     submit = SubmitField('Salvar Alterações')
 
@@ -69,6 +80,15 @@ class UsuarioEditForm(FlaskForm):
                 flash('A identidade que está tentando atualizar já existe na base de dados.', 'danger')
                 raise ValidationError('Esta identidade já está em uso.')
 
+class UsuarioFiltroForm(FlaskForm):
+    """Filtros (via GET) da listagem de militares."""
+    class Meta:
+        csrf = False
+
+    secao_id = SelectField('Seção', coerce=int, validators=[Optional()])
+    papel = SelectField('Papel', choices=[('', 'Todos')] + [(papel.name, papel.value) for papel in PapelUsuario], validators=[Optional()])
+    posto_grad = StringField('Posto/Graduação', validators=[Optional()])
+
 # ---Formulários para Solicitação de Férias---
 
 class SolicitacaoFeriasForm(FlaskForm):
@@ -100,3 +120,12 @@ class SolicitacaoFeriasForm(FlaskForm):
     def validate_data_inicio(self, data_inicio):
         if data_inicio.data < date.today():
             raise ValidationError("A data de início não pode ser no passado.")
+
+class AvaliacaoLoteForm(FlaskForm):
+    """Avaliação de várias solicitações de uma vez (chefe ou gestor)."""
+    # Os ids vêm das caixas de seleção da listagem; a validação das transições é feita em app.avaliacao
+    ids = SelectMultipleField('Solicitações', coerce=int, validate_choice=False,
+                              validators=[DataRequired(message="Selecione ao menos uma solicitação.")])
+    status = SelectField('Decisão', validators=[DataRequired()])
+    justificativa_reprovacao = TextAreaField('Justificativa (obrigatória para reprovar)', validators=[Optional(), Length(max=500)])
+    submit = SubmitField('Aplicar às Selecionadas')
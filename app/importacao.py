@@ -0,0 +1,113 @@
+"""
+/Recursos-Humanos-Ferias/app/importacao.py
+
+Importação em massa de militares a partir de um arquivo CSV.
+"""
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import Usuario, Secao, PapelUsuario
+from app.versoes import incrementar, CHAVE_USUARIOS
+
+
+# Colunas obrigatórias do arquivo. 'secao' (nome da seção) e 'papel' são opcionais.
+COLUNAS_OBRIGATORIAS = ('nome_completo', 'nome_guerra', 'identidade', 'posto_grad', 'senha')
+
+
+def _ler_lotes(arquivo, tamanho_lote, delimitador):
+    """Lê o CSV em lotes, sem carregar o arquivo inteiro na memória."""
+    leitor = csv.DictReader(arquivo, delimiter=delimitador)
+    faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in (leitor.fieldnames or [])]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes no CSV: {', '.join(faltando)}")
+
+    # A linha 1 é o cabeçalho, então os dados começam na linha 2
+    linhas = enumerate(leitor, start=2)
+    while True:
+        lote = list(islice(linhas, tamanho_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def _validar_linha(linha, identidades, secoes):
+    """Converte uma linha do CSV nos valores da tabela usuario, ou levanta ValueError."""
+    valores = {c: (linha.get(c) or '').strip() for c in COLUNAS_OBRIGATORIAS}
+    vazios = [c for c, v in valores.items() if not v]
+    if vazios:
+        raise ValueError(f"campos vazios: {', '.join(vazios)}")
+
+    if valores['identidade'] in identidades:
+        raise ValueError(f"identidade {valores['identidade']} já cadastrada")
+
+    nome_secao = (linha.get('secao') or '').strip()
+    if nome_secao and nome_secao not in secoes:
+        raise ValueError(f"seção '{nome_secao}' não encontrada")
+
+    nome_papel = (linha.get('papel') or PapelUsuario.MILITAR.name).strip().upper()
+    if nome_papel not in PapelUsuario.__members__:
+        raise ValueError(f"papel '{nome_papel}' inválido")
+
+    return {
+        'nome_completo': valores['nome_completo'],
+        'nome_guerra': valores['nome_guerra'],
+        'identidade': valores['identidade'],
+        'posto_grad': valores['posto_grad'],
+        'secao_id': secoes.get(nome_secao),
+        'papel': PapelUsuario[nome_papel],
+        'senha': valores['senha'],
+    }
+
+
+def importar_usuarios(arquivo, tamanho_lote=1000, processos=None, delimitador=','):
+    """
+    Importa os militares de um arquivo CSV já aberto.
+
+    As identidades existentes e as seções são carregadas uma única vez. As senhas são
+    processadas em paralelo num pool de processos e cada lote é gravado com um único
+    INSERT em massa e um commit. Retorna um relatório por lote com o total inserido e
+    os erros encontrados (número da linha e motivo).
+    """
+    identidades = set(db.session.scalars(select(Usuario.identidade)))
+    secoes = {nome: id_secao for id_secao, nome in db.session.execute(select(Secao.id, Secao.nome))}
+
+    relatorio = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        for numero, lote in enumerate(_ler_lotes(arquivo, tamanho_lote, delimitador), start=1):
+            erros = []
+            registros = []
+            for num_linha, linha in lote:
+                try:
+                    registro = _validar_linha(linha, identidades, secoes)
+                except ValueError as e:
+                    erros.append((num_linha, str(e)))
+                    continue
+                # Evita duplicidade também dentro do próprio arquivo
+                identidades.add(registro['identidade'])
+                registros.append(registro)
+
+            senhas = [r.pop('senha') for r in registros]
+            chunksize = max(1, len(senhas) // ((processos or 4) * 4))
+            for registro, password_hash in zip(registros, executor.map(generate_password_hash, senhas, chunksize=chunksize)):
+                registro['password_hash'] = password_hash
+
+            inseridos = 0
+            if registros:
+                try:
+                    db.session.execute(insert(Usuario), registros)
+                    incrementar(db.session.connection(), [CHAVE_USUARIOS])
+                    db.session.commit()
+                    inseridos = len(registros)
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    for registro in registros:
+                        identidades.discard(registro['identidade'])
+                    erros.append((lote[0][0], f"falha ao gravar o lote: {getattr(e, 'orig', None) or e}"))
+
+            relatorio.append({'lote': numero, 'linhas': len(lote), 'inseridos': inseridos, 'erros': erros})
+
+    return relatorio
@@ -0,0 +1,139 @@
+"""
+/Recursos-Humanos-Ferias/app/instrumentacao.py
+
+Instrumentação das consultas SQL por requisição: quantidade e tempo total, enviados no
+cabeçalho Server-Timing, e as consultas mais lentas; tudo agregado por endpoint.
+
+Só é ativada com SQL_INSTRUMENTACAO = True; desligada, nenhum evento é registrado e
+o custo é zero.
+"""
+import heapq
+import threading
+import time
+from collections import deque
+from flask import g, request, has_request_context, current_app
+from sqlalchemy import event
+from app import db
+
+
+# Consultas mais lentas guardadas por requisição e por endpoint
+MAIS_LENTAS = 5
+
+
+class MetricasEndpoint:
+    """Amostras recentes (janela deslizante) de uma rota. Acesso sempre com `_lock`."""
+
+    def __init__(self, janela):
+        self.total = 0
+        self.duracao_ms = deque(maxlen=janela)
+        self.sql_ms = deque(maxlen=janela)
+        self.consultas = deque(maxlen=janela)
+        self.lentas = {}  # comando SQL -> maior duração (ms), no máximo MAIS_LENTAS comandos
+
+    def registrar(self, duracao_ms, sql_ms, consultas, lentas):
+        self.total += 1
+        self.duracao_ms.append(duracao_ms)
+        self.sql_ms.append(sql_ms)
+        self.consultas.append(consultas)
+        for ms, comando in lentas:
+            if ms > self.lentas.get(comando, 0):
+                self.lentas[comando] = ms
+        if len(self.lentas) > MAIS_LENTAS:
+            self.lentas = dict(heapq.nlargest(MAIS_LENTAS, self.lentas.items(), key=lambda item: item[1]))
+
+    @staticmethod
+    def _percentis(amostras):
+        ordenadas = sorted(amostras)
+        if not ordenadas:
+            return {}
+        def p(q):
+            return round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * q))], 3)
+        return {'p50': p(0.50), 'p95': p(0.95), 'p99': p(0.99), 'max': round(ordenadas[-1], 3)}
+
+    def copia(self):
+        """(total, duracao_ms, sql_ms, consultas, lentas) com cópias das amostras, para o resumo."""
+        return self.total, list(self.duracao_ms), list(self.sql_ms), list(self.consultas), dict(self.lentas)
+
+    @classmethod
+    def resumo(cls, total, duracao_ms, sql_ms, consultas, lentas):
+        return {
+            'requisicoes': total,
+            'duracao_ms': cls._percentis(duracao_ms),
+            'sql_ms': cls._percentis(sql_ms),
+            'consultas': cls._percentis(consultas),
+            'mais_lentas': [{'ms': round(ms, 3), 'sql': comando}
+                            for comando, ms in sorted(lentas.items(), key=lambda item: -item[1])],
+        }
+
+
+_metricas = {}
+_lock = threading.Lock()
+
+
+def metricas_por_endpoint():
+    # As amostras são copiadas sob o lock (as threads continuam registrando) e os
+    # percentis são calculados fora dele
+    with _lock:
+        copias = [(endpoint, m.copia()) for endpoint, m in _metricas.items()]
+    return {endpoint: MetricasEndpoint.resumo(*copia) for endpoint, copia in sorted(copias)}
+
+
+def _antes_da_consulta(conn, cursor, statement, parameters, context, executemany):
+    # O início fica no contexto da execução: se o comando falhar, nada sobra na conexão
+    context._inicio_consulta = time.perf_counter()
+
+
+def _depois_da_consulta(conn, cursor, statement, parameters, context, executemany):
+    duracao_ms = (time.perf_counter() - context._inicio_consulta) * 1000
+    if not has_request_context() or 'sql_inicio' not in g:
+        return
+
+    g.sql_consultas += 1
+    g.sql_ms += duracao_ms
+    if len(g.sql_lentas) < MAIS_LENTAS:
+        heapq.heappush(g.sql_lentas, (duracao_ms, statement))
+    elif duracao_ms > g.sql_lentas[0][0]:
+        heapq.heapreplace(g.sql_lentas, (duracao_ms, statement))
+
+    if duracao_ms >= current_app.config['SQL_CONSULTA_LENTA_MS']:
+        current_app.logger.warning('Consulta lenta (%.1f ms) em %s: %s', duracao_ms, request.endpoint, statement)
+
+
+def _iniciar_requisicao():
+    g.sql_inicio = time.perf_counter()
+    g.sql_consultas = 0
+    g.sql_ms = 0.0
+    g.sql_lentas = []
+
+
+def _finalizar_requisicao(response):
+    if 'sql_inicio' not in g:
+        return response
+    duracao_ms = (time.perf_counter() - g.sql_inicio) * 1000
+
+    response.headers['Server-Timing'] = (
+        f'sql;dur={g.sql_ms:.2f};desc="{g.sql_consultas} consultas", app;dur={duracao_ms:.2f}'
+    )
+
+    endpoint = request.endpoint or 'desconhecido'
+    with _lock:
+        metricas = _metricas.get(endpoint)
+        if metricas is None:
+            metricas = _metricas[endpoint] = MetricasEndpoint(current_app.config['METRICAS_JANELA'])
+        metricas.registrar(duracao_ms, g.sql_ms, g.sql_consultas, g.sql_lentas)
+    return response
+
+
+def init_app(app):
+    """Liga a instrumentação, se habilitada na configuração."""
+    if not app.config['SQL_INSTRUMENTACAO']:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if not event.contains(engine, 'before_cursor_execute', _antes_da_consulta):
+                event.listen(engine, 'before_cursor_execute', _antes_da_consulta)
+                event.listen(engine, 'after_cursor_execute', _depois_da_consulta)
+
+    app.before_request(_iniciar_requisicao)
+    app.after_request(_finalizar_requisicao)
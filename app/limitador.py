@@ -0,0 +1,267 @@
+"""
+/Recursos-Humanos-Ferias/app/limitador.py
+
+Limite de tentativas de login (balde de fichas), verificado antes de consultar o usuário
+e de calcular o hash da senha: um script repetindo POST /login não consegue ocupar a CPU
+dos workers com check_password.
+
+Cada tentativa gasta uma ficha de dois baldes, o da identidade e o do IP do cliente; as
+fichas são repostas aos poucos (capacidade / janela por segundo). Sem ficha num dos
+baldes, a chave é bloqueada por LOGIN_BLOQUEIO_S, e cada novo bloqueio dobra o tempo
+(até LOGIN_BLOQUEIO_MAX_S). O nível de bloqueio volta a zero depois de LOGIN_BLOQUEIO_MAX_S
+sem bloqueios, ou no login com sucesso (que também devolve a ficha do IP).
+
+Os baldes ficam na memória do processo (cada worker do `flask serve` tem os seus) ou,
+com LOGIN_LIMITE_REDIS_URL, num Redis compartilhado (requer o pacote redis).
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+
+Regra = namedtuple('Regra', 'capacidade janela_s')
+
+# permitido: bool; espera_s: segundos até a próxima tentativa; motivo: 'identidade' ou 'ip'
+Resultado = namedtuple('Resultado', 'permitido espera_s motivo')
+
+PERMITIDO = Resultado(True, 0, None)
+
+_MOTIVOS = ('identidade', 'ip')
+
+
+def _repor(estado, regra, agora):
+    if not estado:
+        estado.update(fichas=float(regra.capacidade), ts=agora, ate=0.0, nivel=0)
+        return
+    taxa = regra.capacidade / regra.janela_s
+    estado['fichas'] = min(float(regra.capacidade), estado['fichas'] + (agora - estado['ts']) * taxa)
+    estado['ts'] = agora
+
+
+def avaliar(estados, regras, agora, bloqueio_s, bloqueio_max_s):
+    """
+    Uma tentativa contra os baldes `estados` (dicts alterados no lugar; vazio = balde novo).
+    Retorna (Resultado, novos_bloqueios).
+    """
+    for estado, regra in zip(estados, regras):
+        _repor(estado, regra, agora)
+        if estado['nivel'] and agora - estado['ate'] > bloqueio_max_s:
+            estado['nivel'] = 0
+
+    # Chave já bloqueada: rejeita sem gastar ficha
+    espera, indice = max((estado['ate'] - agora, i) for i, estado in enumerate(estados))
+    if espera > 0:
+        return Resultado(False, espera, _MOTIVOS[indice]), 0
+
+    vazios = [i for i, estado in enumerate(estados) if estado['fichas'] < 1]
+    if vazios:
+        for i in vazios:
+            estado = estados[i]
+            estado['nivel'] += 1
+            estado['ate'] = agora + min(bloqueio_s * 2 ** (estado['nivel'] - 1), bloqueio_max_s)
+        espera, indice = max((estados[i]['ate'] - agora, i) for i in vazios)
+        return Resultado(False, espera, _MOTIVOS[indice]), len(vazios)
+
+    for estado in estados:
+        estado['fichas'] -= 1
+    return PERMITIDO, 0
+
+
+# --- Onde ficam os baldes ---
+
+class BackendMemoria:
+    """Baldes na memória do processo, limitados a `max_chaves` (descarte LRU)."""
+
+    def __init__(self, max_chaves=100000):
+        self.max_chaves = max_chaves
+        self._baldes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def atualizar(self, chaves, funcao):
+        """Chama funcao(estados) com os baldes de `chaves`, de forma atômica."""
+        with self._lock:
+            estados = []
+            for chave in chaves:
+                estado = self._baldes.get(chave)
+                if estado is None:
+                    estado = self._baldes[chave] = {}
+                self._baldes.move_to_end(chave)
+                estados.append(estado)
+            while len(self._baldes) > self.max_chaves:
+                self._baldes.popitem(last=False)
+            return funcao(estados)
+
+    def remover(self, chave):
+        with self._lock:
+            self._baldes.pop(chave, None)
+
+    def limpar(self):
+        with self._lock:
+            self._baldes.clear()
+
+    def chaves(self):
+        with self._lock:
+            return len(self._baldes)
+
+
+class BackendRedis:
+    """Baldes num Redis compartilhado pelos processos (hash por chave, com expiração)."""
+
+    PREFIXO = 'ferias:login:'
+
+    def __init__(self, url, expiracao_s):
+        import redis  # Dependência opcional: só é necessária com LOGIN_LIMITE_REDIS_URL
+
+        self._redis = redis.Redis.from_url(url)
+        self._erro_concorrencia = redis.WatchError
+        self.expiracao_s = int(expiracao_s)
+
+    def atualizar(self, chaves, funcao):
+        nomes = [self.PREFIXO + chave for chave in chaves]
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    # Otimista: se outro processo alterar os baldes antes do EXEC, repete
+                    pipe.watch(*nomes)
+                    estados = [{k.decode(): float(v) for k, v in pipe.hgetall(nome).items()} for nome in nomes]
+                    for estado in estados:
+                        if estado:
+                            estado['nivel'] = int(estado['nivel'])
+                    resultado = funcao(estados)
+                    pipe.multi()
+                    for nome, estado in zip(nomes, estados):
+                        if estado:
+                            pipe.hset(nome, mapping=estado)
+                            pipe.expire(nome, self.expiracao_s)
+                        else:
+                            pipe.delete(nome)
+                    pipe.execute()
+                    return resultado
+                except self._erro_concorrencia:
+                    continue
+
+    def remover(self, chave):
+        self._redis.delete(self.PREFIXO + chave)
+
+    def limpar(self):
+        for nome in self._redis.scan_iter(self.PREFIXO + '*'):
+            self._redis.delete(nome)
+
+    def chaves(self):
+        return None  # Não contado: exigiria percorrer o Redis
+
+
+# --- Limitador ---
+
+class LimitadorLogin:
+    """Limite de tentativas de login por identidade e por IP (ver o início do módulo)."""
+
+    def __init__(self):
+        self.ativo = False
+        self.backend = BackendMemoria()
+        self.identidade = Regra(5, 300)
+        self.ip = Regra(30, 60)
+        self.bloqueio_s = 60
+        self.bloqueio_max_s = 3600
+        self._lock = threading.Lock()
+        self._zerar_contadores()
+
+    def configurar(self, ativo, identidade, ip, bloqueio_s, bloqueio_max_s, backend):
+        with self._lock:
+            self.ativo = ativo
+            self.identidade = identidade
+            self.ip = ip
+            self.bloqueio_s = bloqueio_s
+            self.bloqueio_max_s = bloqueio_max_s
+            self.backend = backend
+            self._zerar_contadores()
+
+    def _zerar_contadores(self):
+        self.tentativas = 0
+        self.rejeitadas = {motivo: 0 for motivo in _MOTIVOS}
+        self.bloqueios = 0
+
+    @staticmethod
+    def _chaves(identidade, ip):
+        # Identidade limitada ao tamanho da coluna: textos enormes não ocupam a memória
+        return [f'id:{identidade.strip().lower()[:20]}', f'ip:{ip or "-"}']
+
+    def verificar(self, identidade, ip):
+        """Registra uma tentativa de login e retorna o Resultado (sem consultar o banco)."""
+        if not self.ativo:
+            return PERMITIDO
+        regras = (self.identidade, self.ip)
+        resultado, novos_bloqueios = self.backend.atualizar(
+            self._chaves(identidade, ip),
+            lambda estados: avaliar(estados, regras, time.time(), self.bloqueio_s, self.bloqueio_max_s)
+        )
+        with self._lock:
+            self.tentativas += 1
+            self.bloqueios += novos_bloqueios
+            if not resultado.permitido:
+                self.rejeitadas[resultado.motivo] += 1
+        return resultado
+
+    def sucesso(self, identidade, ip):
+        """Login correto: zera o balde da identidade e devolve a ficha gasta no IP."""
+        if not self.ativo:
+            return
+        chave_identidade, chave_ip = self._chaves(identidade, ip)
+        self.backend.remover(chave_identidade)
+
+        def devolver(estados):
+            estado = estados[0]
+            if estado:
+                estado['fichas'] = min(float(self.ip.capacidade), estado['fichas'] + 1)
+        self.backend.atualizar([chave_ip], devolver)
+
+    def limpar(self):
+        self.backend.limpar()
+        with self._lock:
+            self._zerar_contadores()
+
+    def estatisticas(self):
+        with self._lock:
+            rejeitadas = sum(self.rejeitadas.values())
+            return {
+                'ativo': self.ativo,
+                'tentativas': self.tentativas,
+                'permitidas': self.tentativas - rejeitadas,
+                # Cada tentativa rejeitada é um hash de senha (e uma consulta) a menos
+                'rejeitadas': rejeitadas,
+                'rejeitadas_por_identidade': self.rejeitadas['identidade'],
+                'rejeitadas_por_ip': self.rejeitadas['ip'],
+                'bloqueios': self.bloqueios,
+                'chaves': self.backend.chaves(),
+            }
+
+
+def formatar_espera(segundos):
+    segundos = math.ceil(segundos)
+    if segundos < 120:
+        return f'{segundos} segundos'
+    return f'{math.ceil(segundos / 60)} minutos'
+
+
+limitador_login = LimitadorLogin()
+
+
+def criar_backend(config):
+    """Backend configurado: Redis compartilhado ou memória do processo."""
+    if config.get('LOGIN_LIMITE_REDIS_URL'):
+        expiracao = max(config['LOGIN_JANELA_IDENTIDADE_S'], config['LOGIN_JANELA_IP_S'], config['LOGIN_BLOQUEIO_MAX_S']) * 2
+        return BackendRedis(config['LOGIN_LIMITE_REDIS_URL'], expiracao)
+    return BackendMemoria(config['LOGIN_LIMITE_MAX_CHAVES'])
+
+
+def init_app(app):
+    config = app.config
+    limitador_login.configurar(
+        ativo=config['LOGIN_LIMITE_ATIVO'],
+        identidade=Regra(config['LOGIN_TENTATIVAS_IDENTIDADE'], config['LOGIN_JANELA_IDENTIDADE_S']),
+        ip=Regra(config['LOGIN_TENTATIVAS_IP'], config['LOGIN_JANELA_IP_S']),
+        bloqueio_s=config['LOGIN_BLOQUEIO_S'],
+        bloqueio_max_s=config['LOGIN_BLOQUEIO_MAX_S'],
+        backend=criar_backend(config),
+    )
@@ -2,6 +2,7 @@
 /Recursos-Humanos-Ferias/app/models.py
 """
 import enum
+from datetime import datetime, timezone
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from app import db
@@ -19,6 +20,24 @@ class StatusFerias(enum.Enum):
     REPROVADA = 'Reprovada'
     ALTERADA = 'Alterada'
     CANCELADA = 'Cancelada'
+    RASCUNHO = 'Rascunho'  # Proposta do planejador (flask planejar-ferias); não debita saldo
+
+
+class StatusTarefa(enum.Enum):
+    PENDENTE = 'Pendente'
+    EXECUTANDO = 'Executando'
+    FALHOU = 'Falhou'
+
+
+def agora_utc():
+    """Data e hora atuais em UTC, sem fuso: valor das colunas atualizado_em (sincronia da API)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _coluna_atualizado_em():
+    # Definido no Python (e não com CURRENT_TIMESTAMP) para ter o mesmo formato e precisão em
+    # todos os bancos; também vale para UPDATE/INSERT em massa feitos com o Core.
+    return db.Column(db.DateTime, nullable=False, default=agora_utc, onupdate=agora_utc)
 
 
 class Usuario(db.Model, UserMixin):
@@ -29,6 +48,7 @@ class Usuario(db.Model, UserMixin):
     posto_grad = db.Column(db.String(50), nullable=False)  # Ex: 3º Sgt, Cap
     password_hash = db.Column(db.String(256), nullable=False)
     papel = db.Column(db.Enum(PapelUsuario), nullable=False, default=PapelUsuario.MILITAR)
+    atualizado_em = _coluna_atualizado_em()
 
     secao_id = db.Column(db.Integer, db.ForeignKey('secao.id'), nullable=True)
     secao = db.relationship('Secao', back_populates='integrantes', foreign_keys=[secao_id])
@@ -36,6 +56,16 @@ class Usuario(db.Model, UserMixin):
     periodos_aquisitivos = db.relationship('PeriodoAquisitivo', back_populates='usuario', lazy='dynamic')
     solicitacoes = db.relationship('SolicitacaoFerias', back_populates='solicitante', lazy='dynamic')
 
+    # Índices da listagem paginada (ordenada por nome_completo, id) e de seus filtros
+    __table_args__ = (
+        db.Index('ix_usuario_nome_completo_id', 'nome_completo', 'id'),
+        db.Index('ix_usuario_secao_nome_completo', 'secao_id', 'nome_completo', 'id'),
+        db.Index('ix_usuario_papel_nome_completo', 'papel', 'nome_completo', 'id'),
+        db.Index('ix_usuario_posto_grad_nome_completo', 'posto_grad', 'nome_completo', 'id'),
+        # Sincronia da API (registros alterados desde uma data)
+        db.Index('ix_usuario_atualizado_em', 'atualizado_em', 'id'),
+    )
+
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
 
@@ -47,10 +77,16 @@ class Secao(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(100), unique=True, nullable=False)
     chefe_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=True)
+    atualizado_em = _coluna_atualizado_em()
 
     chefe = db.relationship('Usuario', foreign_keys=[chefe_id])
     integrantes = db.relationship('Usuario', back_populates='secao', foreign_keys=[Usuario.secao_id])
 
+    __table_args__ = (
+        db.Index('ix_secao_nome_id', 'nome', 'id'),
+        db.Index('ix_secao_atualizado_em', 'atualizado_em', 'id'),
+    )
+
 
 class PeriodoAquisitivo(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -59,10 +95,19 @@ class PeriodoAquisitivo(db.Model):
     data_inicio_periodo = db.Column(db.Date, nullable=False)
     data_fim_periodo = db.Column(db.Date, nullable=False)
     dias_saldo = db.Column(db.Integer, nullable=False, default=30)
+    atualizado_em = _coluna_atualizado_em()
 
     usuario = db.relationship('Usuario', back_populates='periodos_aquisitivos')
     solicitacoes_vinculadas = db.relationship('SolicitacaoFerias', back_populates='periodo_aquisitivo')
 
+    # Períodos do militar em ordem de ano (dashboard, débito de saldo, abertura anual)
+    __table_args__ = (
+        db.Index('ix_periodo_aquisitivo_usuario_ano', 'usuario_id', 'ano_referencia'),
+        db.Index('ix_periodo_aquisitivo_atualizado_em', 'atualizado_em', 'id'),
+        # No SQLite, ids de linhas arquivadas (removidas daqui) não podem ser reutilizados
+        {'sqlite_autoincrement': True},
+    )
+
 
 class SolicitacaoFerias(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -78,6 +123,135 @@ class SolicitacaoFerias(db.Model):
 
     data_solicitacao = db.Column(db.DateTime, default=db.func.current_timestamp())
     justificativa_reprovacao = db.Column(db.Text)
+    atualizado_em = _coluna_atualizado_em()
 
     solicitante = db.relationship('Usuario', back_populates='solicitacoes')
     periodo_aquisitivo = db.relationship('PeriodoAquisitivo', back_populates='solicitacoes_vinculadas')
+
+    __table_args__ = (
+        # Solicitações do militar, mais recentes primeiro
+        db.Index('ix_solicitacao_ferias_solicitante_data', 'solicitante_id', 'data_solicitacao'),
+        # Filas de aprovação por status
+        db.Index('ix_solicitacao_ferias_status_data', 'status', 'data_solicitacao'),
+        # Solicitações vinculadas a um período (devolução de saldo)
+        db.Index('ix_solicitacao_ferias_periodo', 'periodo_aquisitivo_id'),
+        # Férias em andamento ou futuras (data_fim >= hoje)
+        db.Index('ix_solicitacao_ferias_data_fim', 'data_fim'),
+        # Sincronia da API (registros alterados desde uma data)
+        db.Index('ix_solicitacao_ferias_atualizado_em', 'atualizado_em', 'id'),
+        # No SQLite, ids de linhas arquivadas (removidas daqui) não podem ser reutilizados
+        {'sqlite_autoincrement': True},
+    )
+
+
+class SolicitacaoFeriasArquivo(db.Model):
+    """
+    Solicitações encerradas movidas de solicitacao_ferias pelo `flask arquivar` (ver
+    app/arquivo.py). Mesmas colunas da tabela principal; o período aquisitivo pode estar
+    em periodo_aquisitivo ou em periodo_aquisitivo_arquivo.
+    """
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    solicitante_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
+    periodo_aquisitivo_id = db.Column(db.Integer, nullable=False)
+    data_inicio = db.Column(db.Date, nullable=False)
+    data_fim = db.Column(db.Date, nullable=False)
+    dias_solicitados = db.Column(db.Integer, nullable=False)
+    tipo_solicitacao = db.Column(db.String(50))
+    status = db.Column(db.Enum(StatusFerias), nullable=False)
+    data_solicitacao = db.Column(db.DateTime)
+    justificativa_reprovacao = db.Column(db.Text)
+
+    __table_args__ = (
+        db.Index('ix_solicitacao_ferias_arquivo_solicitante_data', 'solicitante_id', 'data_solicitacao'),
+    )
+
+
+class PeriodoAquisitivoArquivo(db.Model):
+    """Períodos aquisitivos antigos e sem saldo, movidos de periodo_aquisitivo pelo `flask arquivar`."""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
+    ano_referencia = db.Column(db.Integer, nullable=False)
+    data_inicio_periodo = db.Column(db.Date, nullable=False)
+    data_fim_periodo = db.Column(db.Date, nullable=False)
+    dias_saldo = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_periodo_aquisitivo_arquivo_usuario_ano', 'usuario_id', 'ano_referencia'),
+    )
+
+
+class EventoAuditoria(db.Model):
+    """
+    Trilha de auditoria (somente inclusão) das solicitações e dos períodos aquisitivos,
+    gravada a cada flush (ver app/auditoria.py). `dados` é um JSON compacto com os campos
+    alterados: [antes, depois], exceto dias_saldo, gravado como variação.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    entidade = db.Column(db.String(1), nullable=False)  # 'S' = solicitação, 'P' = período aquisitivo
+    entidade_id = db.Column(db.Integer, nullable=False)
+    acao = db.Column(db.String(1), nullable=False)  # 'I' = inclusão, 'A' = alteração, 'E' = exclusão
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'))  # Quem fez a alteração (None = sistema)
+    criado_em = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+    dados = db.Column(db.Text, nullable=False, default='{}')
+
+    __table_args__ = (
+        # Histórico de uma solicitação / período
+        db.Index('ix_evento_auditoria_entidade', 'entidade', 'entidade_id', 'id'),
+        # Alterações feitas por um usuário
+        db.Index('ix_evento_auditoria_usuario', 'usuario_id', 'id'),
+    )
+
+
+class TokenApi(db.Model):
+    """
+    Token de acesso de um sistema externo à API /api/v1 (ver app/api.py). Só o hash
+    SHA-256 do token é gravado; o token em si é exibido uma única vez, na criação.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), unique=True, nullable=False)  # Sistema que usa o token (ex.: 'folha')
+    token_hash = db.Column(db.String(64), unique=True, nullable=False)
+    criado_em = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+
+class ResumoSecao(db.Model):
+    """
+    Contadores do dashboard do gestor por seção, mantidos incrementalmente a cada flush
+    (ver app/agregados.py). `chave` é 'status:<StatusFerias>' ou 'saldo'.
+    """
+    secao_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 0 = militares sem seção
+    chave = db.Column(db.String(30), primary_key=True)
+    valor = db.Column(db.Integer, nullable=False, default=0)
+
+
+class Versao(db.Model):
+    """
+    Contadores de versão incrementados a cada alteração confirmada (ver app/versoes.py),
+    usados para calcular o ETag das páginas. `chave` é o nome de uma listagem
+    (ex.: 'usuarios') ou 'militar:<id>' para os dados de um militar.
+    """
+    chave = db.Column(db.String(40), primary_key=True)
+    valor = db.Column(db.Integer, nullable=False, default=0)
+
+
+class Tarefa(db.Model):
+    """
+    Fila de tarefas executadas em segundo plano pelo `flask worker` (ver app/tarefas.py).
+    Tarefas concluídas são removidas; ficam na tabela as pendentes e as que falharam.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    tipo = db.Column(db.String(50), nullable=False)
+    dados = db.Column(db.Text, nullable=False, default='{}')  # JSON
+    status = db.Column(db.Enum(StatusTarefa), nullable=False, default=StatusTarefa.PENDENTE)
+    tentativas = db.Column(db.Integer, nullable=False, default=0)
+    executar_em = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+    reserva = db.Column(db.String(32))  # Identifica o lote do worker que reservou a tarefa
+    reservada_em = db.Column(db.DateTime)
+    ultimo_erro = db.Column(db.Text)
+    criada_em = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    __table_args__ = (
+        # Próximas tarefas a executar
+        db.Index('ix_tarefa_status_executar_em', 'status', 'executar_em'),
+        # Tarefas de um lote reservado
+        db.Index('ix_tarefa_reserva', 'reserva'),
+    )
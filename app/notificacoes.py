@@ -0,0 +1,121 @@
+"""
+/Recursos-Humanos-Ferias/app/notificacoes.py
+
+Notificações sobre solicitações de férias (criação, aprovação, reprovação), enviadas
+pelo worker da fila de tarefas ao solicitante e ao chefe da seção.
+
+O envio passa por um backend configurável (NOTIFICACOES_BACKEND):
+  - 'smtp': servidor SMTP (padrão; ex.: `python -m aiosmtpd -n -l localhost:8025` para testar localmente);
+  - 'arquivo': acrescenta cada mensagem, em JSON, a NOTIFICACOES_ARQUIVO (desenvolvimento e testes);
+  - 'nenhum': descarta as mensagens.
+Como Usuario não tem e-mail cadastrado, o endereço é montado com EMAIL_FORMATO.
+"""
+import json
+import smtplib
+import threading
+from email.message import EmailMessage
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import Usuario, Secao, SolicitacaoFerias, StatusFerias
+from app.tarefas import tarefa, enfileirar
+
+
+class BackendSMTP:
+    def __init__(self, host, port, remetente, usuario=None, senha=None, tls=False, timeout=10):
+        self.host = host
+        self.port = port
+        self.remetente = remetente
+        self.usuario = usuario
+        self.senha = senha
+        self.tls = tls
+        self.timeout = timeout
+
+    def enviar(self, para, assunto, corpo):
+        mensagem = EmailMessage()
+        mensagem['From'] = self.remetente
+        mensagem['To'] = para
+        mensagem['Subject'] = assunto
+        mensagem.set_content(corpo)
+        # Uma conexão por mensagem: o backend é usado por várias threads do worker
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.tls:
+                smtp.starttls()
+            if self.usuario:
+                smtp.login(self.usuario, self.senha)
+            smtp.send_message(mensagem)
+
+
+class BackendArquivo:
+    _lock = threading.Lock()
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+
+    def enviar(self, para, assunto, corpo):
+        linha = json.dumps({'para': para, 'assunto': assunto, 'corpo': corpo}, ensure_ascii=False)
+        with self._lock, open(self.caminho, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(linha + '\n')
+
+
+class BackendNenhum:
+    def enviar(self, para, assunto, corpo):
+        pass
+
+
+def obter_backend(config):
+    nome = config['NOTIFICACOES_BACKEND']
+    if nome == 'smtp':
+        return BackendSMTP(config['SMTP_HOST'], config['SMTP_PORT'], config['EMAIL_REMETENTE'],
+                           config['SMTP_USUARIO'], config['SMTP_SENHA'], config['SMTP_TLS'])
+    if nome == 'arquivo':
+        return BackendArquivo(config['NOTIFICACOES_ARQUIVO'])
+    if nome == 'nenhum':
+        return BackendNenhum()
+    raise ValueError(f'Backend de notificações desconhecido: {nome}')
+
+
+def notificar_solicitacoes(ids):
+    """Enfileira a notificação do status atual das solicitações `ids` (um único INSERT)."""
+    if ids:
+        enfileirar('notificar_solicitacoes', ids=sorted(ids))
+
+
+def _mensagens(linha, endereco):
+    periodo = f"{linha.data_inicio.strftime('%d/%m/%Y')} a {linha.data_fim.strftime('%d/%m/%Y')}"
+    militar = f'{linha.posto_grad} {linha.nome_guerra}'
+    status = linha.status.value
+    assunto = f'Férias {periodo}: {status}'
+
+    corpo = f'Sua solicitação de férias de {periodo} ({linha.dias_solicitados} dias) está: {status}.'
+    if linha.status == StatusFerias.REPROVADA and linha.justificativa_reprovacao:
+        corpo += f'\nJustificativa: {linha.justificativa_reprovacao}'
+    yield endereco(linha.identidade), assunto, corpo
+
+    if linha.chefe_identidade and linha.chefe_identidade != linha.identidade:
+        if linha.status == StatusFerias.SOLICITADA:
+            corpo = f'{militar} solicitou férias de {periodo} ({linha.dias_solicitados} dias). A solicitação aguarda sua avaliação.'
+        else:
+            corpo = f'A solicitação de férias de {militar} ({periodo}) está: {status}.'
+        yield endereco(linha.chefe_identidade), f'{militar} - {assunto}', corpo
+
+
+@tarefa('notificar_solicitacoes')
+def _notificar_solicitacoes(dados):
+    chefe = aliased(Usuario)
+    linhas = db.session.execute(
+        select(SolicitacaoFerias.status, SolicitacaoFerias.data_inicio, SolicitacaoFerias.data_fim,
+               SolicitacaoFerias.dias_solicitados, SolicitacaoFerias.justificativa_reprovacao,
+               Usuario.identidade, Usuario.posto_grad, Usuario.nome_guerra, chefe.identidade.label('chefe_identidade'))
+        .join(Usuario, Usuario.id == SolicitacaoFerias.solicitante_id)
+        .outerjoin(Secao, Secao.id == Usuario.secao_id)
+        .outerjoin(chefe, chefe.id == Secao.chefe_id)
+        .where(SolicitacaoFerias.id.in_(dados['ids']))
+    ).all()
+
+    formato = current_app.config['EMAIL_FORMATO']
+    backend = obter_backend(current_app.config)
+    for linha in linhas:
+        for para, assunto, corpo in _mensagens(linha, lambda identidade: formato.format(identidade=identidade)):
+            backend.enviar(para, assunto, corpo)
@@ -0,0 +1,35 @@
+"""
+/Recursos-Humanos-Ferias/app/opcoes.py
+
+Lista de opções do filtro por seção, mantida em cache por processo e descartada após o
+commit de qualquer alteração em Secao. Os campos de seleção dos formulários (Chefe,
+Seção) carregam as opções sob demanda (ver app/busca.py).
+"""
+from sqlalchemy import select
+from app import db
+from app.cache import CacheLRU
+from app.eventos import ao_confirmar
+from app.models import Secao
+
+
+# O TTL cobre alterações feitas por outros processos, que não disparam os eventos deste
+_opcoes_cache = CacheLRU(max_itens=8, ttl=300)
+
+
+def opcoes_secoes():
+    """Lista [(id, nome)] de todas as seções, ordenada pelo nome."""
+    opcoes = _opcoes_cache.get('secoes')
+    if opcoes is None:
+        linhas = db.session.execute(select(Secao.id, Secao.nome).order_by(Secao.nome))
+        opcoes = [(id_secao, nome) for id_secao, nome in linhas]
+        _opcoes_cache.set('secoes', opcoes)
+    return opcoes
+
+
+def invalidar_opcoes():
+    _opcoes_cache.invalidar()
+
+
+@ao_confirmar(Secao)
+def _invalidar_secoes(ids):
+    _opcoes_cache.invalidar('secoes')
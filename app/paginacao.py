@@ -0,0 +1,75 @@
+"""
+/Recursos-Humanos-Ferias/app/paginacao.py
+
+Paginação por cursor (keyset): em vez de OFFSET, cada página continua a partir da
+chave de ordenação do último registro exibido, o que mantém o custo de cada página
+constante e aproveita os índices compostos (ex.: usuario(nome_completo, id)).
+"""
+import base64
+import json
+from sqlalchemy import tuple_
+
+
+def codificar_cursor(valores):
+    texto = json.dumps(list(valores), separators=(',', ':'))
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """Retorna a lista de valores do cursor, ou None se ele for inválido."""
+    try:
+        texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        valores = json.loads(texto)
+    except (ValueError, TypeError):
+        return None
+    return valores if isinstance(valores, list) else None
+
+
+class Pagina:
+    """Uma página de resultados e os cursores para as páginas vizinhas."""
+
+    def __init__(self, itens, anterior=None, proxima=None):
+        self.itens = itens
+        self.anterior = anterior
+        self.proxima = proxima
+
+    def __iter__(self):
+        return iter(self.itens)
+
+
+def paginar(query, colunas, depois=None, antes=None, por_pagina=50):
+    """
+    Pagina `query` pela chave composta `colunas` (a última deve ser única, ex.: id).
+
+    `depois` / `antes` são cursores gerados por esta função: a página começa logo
+    após (ou termina logo antes de) o registro que gerou o cursor.
+    """
+    chave = tuple_(*colunas)
+    valores_depois = decodificar_cursor(depois) if depois else None
+    valores_antes = decodificar_cursor(antes) if antes else None
+
+    if valores_antes is not None and len(valores_antes) == len(colunas):
+        # Busca em ordem inversa e depois desinverte
+        itens = query.filter(chave < tuple_(*valores_antes)) \
+            .order_by(*[c.desc() for c in colunas]).limit(por_pagina + 1).all()
+        tem_anterior = len(itens) > por_pagina
+        itens = list(reversed(itens[:por_pagina]))
+        tem_proxima = True
+    else:
+        if valores_depois is not None and len(valores_depois) == len(colunas):
+            query = query.filter(chave > tuple_(*valores_depois))
+            tem_anterior = True
+        else:
+            tem_anterior = False
+        itens = query.order_by(*colunas).limit(por_pagina + 1).all()
+        tem_proxima = len(itens) > por_pagina
+        itens = itens[:por_pagina]
+
+    def cursor_de(item):
+        return codificar_cursor(getattr(item, c.key) for c in colunas)
+
+    return Pagina(
+        itens,
+        anterior=cursor_de(itens[0]) if itens and tem_anterior else None,
+        proxima=cursor_de(itens[-1]) if itens and tem_proxima else None,
+    )
@@ -0,0 +1,76 @@
+"""
+/Recursos-Humanos-Ferias/app/periodos.py
+
+Abertura anual dos períodos aquisitivos.
+"""
+from datetime import date
+from sqlalchemy import select, insert, exists, func, literal
+from app import db
+from app.agregados import somar, CHAVE_SALDO
+from app.versoes import incrementar, CHAVE_MILITARES
+from app.auditoria import registrar, evento, AUDITADOS, PERIODO, INCLUSAO
+from app.models import Usuario, PeriodoAquisitivo
+
+
+DIAS_POR_PERIODO = 30
+
+# Campos do período no evento de inclusão da auditoria
+CAMPOS_PERIODO = AUDITADOS[PeriodoAquisitivo][1]
+
+
+def _usuarios_sem_periodo(ano):
+    """SELECT dos militares que ainda não possuem período aquisitivo no ano."""
+    ja_possui = exists().where(
+        PeriodoAquisitivo.usuario_id == Usuario.id,
+        PeriodoAquisitivo.ano_referencia == ano
+    )
+    return select(
+        Usuario.id,
+        literal(ano, db.Integer),
+        literal(date(ano, 1, 1), db.Date),
+        literal(date(ano, 12, 31), db.Date),
+        literal(DIAS_POR_PERIODO, db.Integer),
+    ).where(~ja_possui)
+
+
+def gerar_periodos(ano, simular=False):
+    """
+    Cria o período aquisitivo de `ano` (01/01 a 31/12, 30 dias) para todos os militares
+    que ainda não o possuem, com um único INSERT ... SELECT. Pode ser executado mais de
+    uma vez sem duplicar períodos.
+
+    Retorna (criados, ja_existentes). Com `simular=True` apenas conta, sem gravar.
+    """
+    total = db.session.scalar(select(func.count(Usuario.id)))
+    pendentes = _usuarios_sem_periodo(ano)
+
+    if simular:
+        criados = db.session.scalar(select(func.count()).select_from(pendentes.subquery()))
+        return criados, total - criados
+
+    # Saldo acrescentado por seção, para o resumo do dashboard (o INSERT abaixo não passa pelo ORM)
+    pendentes_por_secao = pendentes.subquery()
+    secao = func.coalesce(Usuario.secao_id, 0)
+    novos_por_secao = db.session.execute(
+        select(secao, func.count()).join(pendentes_por_secao, pendentes_por_secao.c.id == Usuario.id).group_by(secao)
+    ).all()
+
+    ultimo_id = db.session.scalar(select(func.max(PeriodoAquisitivo.id))) or 0
+    resultado = db.session.execute(
+        insert(PeriodoAquisitivo).from_select(
+            ['usuario_id', 'ano_referencia', 'data_inicio_periodo', 'data_fim_periodo', 'dias_saldo'],
+            pendentes
+        )
+    )
+    conexao = db.session.connection()
+    for secao_id, quantidade in novos_por_secao:
+        somar(conexao, secao_id, CHAVE_SALDO, quantidade * DIAS_POR_PERIODO)
+    incrementar(conexao, [CHAVE_MILITARES])
+    novos = conexao.execute(
+        select(*(PeriodoAquisitivo.__table__.c[campo] for campo in ('id',) + CAMPOS_PERIODO))
+        .where(PeriodoAquisitivo.id > ultimo_id, PeriodoAquisitivo.ano_referencia == ano)
+    )
+    registrar(conexao, [evento(PERIODO, linha.id, INCLUSAO, {c: linha._mapping[c] for c in CAMPOS_PERIODO})
+                        for linha in novos])
+    db.session.commit()
+    return resultado.rowcount, total - resultado.rowcount
@@ -0,0 +1,230 @@
+"""
+/Recursos-Humanos-Ferias/app/planejamento.py
+
+Planejamento automático das férias de uma seção no ano: distribui o saldo disponível
+de cada integrante em períodos de 30, 15 ou 10 dias (os tipos de SolicitacaoFeriasForm)
+sem que a seção fique abaixo do efetivo mínimo em nenhum dia, respeitando as
+solicitações já existentes.
+
+A busca é gulosa: os blocos maiores são posicionados primeiro, cada um na janela do ano
+cuja menor folga (vagas de ausência restantes) é a maior, o que espalha as férias ao
+longo do ano. Se algum bloco não couber, novas tentativas com a ordem embaralhada são
+feitas até o fim do tempo limite, e fica a melhor solução encontrada. As propostas são
+gravadas como solicitações em RASCUNHO: não debitam saldo nem ocupam o calendário.
+"""
+import random
+import time
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from sqlalchemy import select, func
+from app import db
+from app.calendario import Intervalo, calcular_calendario, STATUS_OCUPAM_CALENDARIO
+from app.models import Usuario, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias
+
+
+# Tipos de período do formulário de solicitação, do maior para o menor
+TIPOS_POR_DIAS = {30: '30_DIAS', 15: '15_DIAS', 10: '10_DIAS'}
+
+
+class Bloco:
+    """Um período de férias a posicionar no calendário."""
+    __slots__ = ('usuario_id', 'periodo_id', 'dias', 'inicio')
+
+    def __init__(self, usuario_id, periodo_id, dias):
+        self.usuario_id = usuario_id
+        self.periodo_id = periodo_id
+        self.dias = dias
+        self.inicio = None  # índice do dia no calendário, depois de posicionado
+
+
+class Planejamento:
+    """Resultado do planejador para o intervalo [inicio, fim]."""
+
+    def __init__(self, inicio, fim, maximo_ausentes, alocados, nao_alocados, ausentes_por_dia, tentativas, duracao):
+        self.inicio = inicio
+        self.fim = fim
+        self.maximo_ausentes = maximo_ausentes
+        self.alocados = alocados          # Blocos posicionados
+        self.nao_alocados = nao_alocados  # Blocos que não couberam
+        self.ausentes_por_dia = ausentes_por_dia
+        self.pico = max(ausentes_por_dia, default=0)
+        self.tentativas = tentativas
+        self.duracao = duracao
+
+    def propostas(self):
+        """Lista [(usuario_id, periodo_id, data_inicio, data_fim, dias, tipo)] em ordem de data."""
+        return sorted(
+            (b.usuario_id, b.periodo_id, self.inicio + timedelta(days=b.inicio),
+             self.inicio + timedelta(days=b.inicio + b.dias - 1), b.dias, TIPOS_POR_DIAS[b.dias])
+            for b in self.alocados
+        )
+
+
+def dividir_saldo(dias):
+    """Divide um saldo nos tipos permitidos: 30 -> [30], 25 -> [15, 10], 20 -> [10, 10]. Sobras < 10 ficam de fora."""
+    if dias >= 30:
+        return [30] * (dias // 30) + dividir_saldo(dias % 30)
+    if dias >= 25:
+        return [15, 10]
+    if dias >= 20:
+        return [10, 10]
+    if dias >= 15:
+        return [15]
+    if dias >= 10:
+        return [10]
+    return []
+
+
+def _melhor_inicio(folga, ocupado, dias):
+    """
+    Início da janela de `dias` dias com a maior folga mínima (a mais antiga no empate),
+    ignorando os dias em que o militar já está ausente. Mínimo deslizante em O(n).
+    Retorna None se nenhuma janela tiver folga em todos os dias.
+    """
+    valores = [0 if d in ocupado else f for d, f in enumerate(folga)]
+    melhor, melhor_folga = None, 0
+    janela = deque()  # índices com valores crescentes
+    for d, valor in enumerate(valores):
+        while janela and valores[janela[-1]] >= valor:
+            janela.pop()
+        janela.append(d)
+        inicio = d - dias + 1
+        if janela[0] < inicio:
+            janela.popleft()
+        if inicio >= 0 and valores[janela[0]] > melhor_folga:
+            melhor, melhor_folga = inicio, valores[janela[0]]
+    return melhor
+
+
+def _posicionar(blocos, folga_inicial, ocupados_iniciais):
+    folga = list(folga_inicial)
+    ocupados = defaultdict(set, {u: set(dias) for u, dias in ocupados_iniciais.items()})
+    alocados, nao_alocados = [], []
+    for bloco in blocos:
+        inicio = _melhor_inicio(folga, ocupados[bloco.usuario_id], bloco.dias)
+        if inicio is None:
+            bloco.inicio = None
+            nao_alocados.append(bloco)
+            continue
+        bloco.inicio = inicio
+        for d in range(inicio, inicio + bloco.dias):
+            folga[d] -= 1
+        ocupados[bloco.usuario_id].update(range(inicio, inicio + bloco.dias))
+        alocados.append(bloco)
+    return alocados, nao_alocados, folga
+
+
+def planejar(blocos, ausentes_por_dia, maximo_ausentes, ocupados, tempo_limite=2.0, semente=0):
+    """
+    Posiciona os `blocos` num calendário de len(ausentes_por_dia) dias sem ultrapassar
+    `maximo_ausentes` em nenhum dia. `ocupados` = {usuario_id: dias já ausentes}.
+    Retorna (alocados, nao_alocados, ausentes_por_dia, tentativas).
+    """
+    folga_inicial = [maximo_ausentes - n for n in ausentes_por_dia]
+    ordem = sorted(blocos, key=lambda b: (-b.dias, b.usuario_id))
+    limite = time.perf_counter() + tempo_limite
+    rng = random.Random(semente)
+
+    melhor = None
+    tentativas = 0
+    while True:
+        alocados, nao_alocados, folga = _posicionar(ordem, folga_inicial, ocupados)
+        tentativas += 1
+        # Melhor solução: mais dias alocados e, no empate, o menor pico de ausências
+        pontuacao = (sum(b.dias for b in alocados), min(folga, default=0))
+        if melhor is None or pontuacao > melhor[0]:
+            melhor = (pontuacao, [(b, b.inicio) for b in ordem], folga)
+        if not nao_alocados or time.perf_counter() >= limite:
+            break
+        # Nova tentativa: blocos maiores continuam primeiro, mas em ordem aleatória dentro do tamanho
+        ordem = sorted(blocos, key=lambda b: (-b.dias, rng.random()))
+
+    _, posicoes, folga = melhor
+    for bloco, inicio in posicoes:
+        bloco.inicio = inicio
+    alocados = [b for b, inicio in posicoes if inicio is not None]
+    nao_alocados = [b for b, inicio in posicoes if inicio is None]
+    return alocados, nao_alocados, [maximo_ausentes - f for f in folga], tentativas
+
+
+def planejar_secao(secao_id, ano, minimo_presentes=None, maximo_ausentes=None, tempo_limite=2.0, hoje=None):
+    """
+    Planeja as férias dos integrantes da seção em `ano` (a partir de amanhã, se o ano já
+    começou). O efetivo mínimo é dado por `minimo_presentes` ou, alternativamente, pelo
+    máximo de ausentes por dia. Usa o saldo dos períodos já adquiridos no início do
+    planejamento, do mais antigo para o mais novo.
+    """
+    hoje = hoje or date.today()
+    inicio = max(date(ano, 1, 1), hoje + timedelta(days=1))
+    fim = date(ano, 12, 31)
+    if inicio > fim:
+        raise ValueError(f'O ano {ano} já terminou.')
+
+    if minimo_presentes is not None:
+        integrantes = db.session.scalar(select(func.count()).select_from(Usuario).where(Usuario.secao_id == secao_id))
+        maximo_ausentes = integrantes - minimo_presentes
+    if maximo_ausentes is None:
+        raise ValueError('Informe o efetivo mínimo (ou configure LIMITE_AUSENCIA_SECAO).')
+    if maximo_ausentes < 1:
+        raise ValueError('O efetivo mínimo não permite nenhum militar ausente.')
+
+    inicio_execucao = time.perf_counter()
+
+    # Solicitações já existentes: ocupam o calendário da seção e os dias de cada militar
+    intervalos = [Intervalo(*linha) for linha in db.session.execute(
+        select(SolicitacaoFerias.id, SolicitacaoFerias.solicitante_id,
+               SolicitacaoFerias.data_inicio, SolicitacaoFerias.data_fim)
+        .join(Usuario, Usuario.id == SolicitacaoFerias.solicitante_id)
+        .where(Usuario.secao_id == secao_id, SolicitacaoFerias.status.in_(STATUS_OCUPAM_CALENDARIO),
+               SolicitacaoFerias.data_inicio <= fim, SolicitacaoFerias.data_fim >= inicio)
+    )]
+    calendario = calcular_calendario(intervalos, inicio, fim)
+    ocupados = defaultdict(set)
+    for intervalo in intervalos:
+        a = max((intervalo.inicio - inicio).days, 0)
+        b = min((intervalo.fim - inicio).days, len(calendario.ausentes_por_dia) - 1)
+        ocupados[intervalo.usuario_id].update(range(a, b + 1))
+
+    blocos = []
+    for usuario_id, periodo_id, saldo in db.session.execute(
+        select(PeriodoAquisitivo.usuario_id, PeriodoAquisitivo.id, PeriodoAquisitivo.dias_saldo)
+        .join(Usuario, Usuario.id == PeriodoAquisitivo.usuario_id)
+        .where(Usuario.secao_id == secao_id, PeriodoAquisitivo.dias_saldo > 0,
+               PeriodoAquisitivo.data_fim_periodo <= inicio)
+        .order_by(PeriodoAquisitivo.usuario_id, PeriodoAquisitivo.ano_referencia)
+    ):
+        blocos.extend(Bloco(usuario_id, periodo_id, dias) for dias in dividir_saldo(saldo))
+
+    alocados, nao_alocados, ausentes, tentativas = planejar(
+        blocos, calendario.ausentes_por_dia, maximo_ausentes, ocupados, tempo_limite=tempo_limite
+    )
+    return Planejamento(inicio, fim, maximo_ausentes, alocados, nao_alocados, ausentes, tentativas,
+                        time.perf_counter() - inicio_execucao)
+
+
+def gravar_rascunhos(secao_id, planejamento):
+    """
+    Substitui os rascunhos da seção no intervalo planejado pelas propostas do
+    `planejamento`. Não faz commit. Retorna (removidos, criados).
+    """
+    integrantes = select(Usuario.id).where(Usuario.secao_id == secao_id)
+    antigos = db.session.scalars(
+        select(SolicitacaoFerias).where(
+            SolicitacaoFerias.status == StatusFerias.RASCUNHO,
+            SolicitacaoFerias.solicitante_id.in_(integrantes),
+            SolicitacaoFerias.data_inicio.between(planejamento.inicio, planejamento.fim),
+        )
+    ).all()
+    for rascunho in antigos:
+        db.session.delete(rascunho)
+
+    novos = [
+        SolicitacaoFerias(
+            solicitante_id=usuario_id, periodo_aquisitivo_id=periodo_id, data_inicio=data_inicio,
+            data_fim=data_fim, dias_solicitados=dias, tipo_solicitacao=tipo, status=StatusFerias.RASCUNHO,
+        )
+        for usuario_id, periodo_id, data_inicio, data_fim, dias, tipo in planejamento.propostas()
+    ]
+    db.session.add_all(novos)
+    db.session.flush()
+    return len(antigos), len(novos)
@@ -0,0 +1,85 @@
+"""
+/Recursos-Humanos-Ferias/app/replica.py
+
+Leituras numa réplica do banco (bind 'replica', configurado por DATABASE_REPLICA_URL).
+
+A sessão do SQLAlchemy escolhe o banco de cada comando (get_bind): enquanto estiver em
+modo leitura, as consultas vão para a réplica; escritas (flush, INSERT/UPDATE/DELETE) vão
+sempre para o banco principal e, a partir daí, a sessão inteira passa a usá-lo.
+
+Entram em modo leitura as requisições GET/HEAD e os relatórios de linha de comando que
+chamam usar_replica(). Depois de uma requisição que escreveu, o navegador do usuário
+fica preso ao banco principal por REPLICA_ATRASO_S segundos (o atraso tolerado da
+réplica), para que ele veja as próprias alterações.
+
+Este módulo não importa `app`: a classe de sessão é usada na criação de `db`.
+"""
+import time
+from flask import request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+
+BIND_REPLICA = 'replica'
+
+# Chaves em Session.info
+_LEITURA = 'replica'
+_ESCREVEU = 'escreveu'
+
+# Chave na sessão do Flask (cookie): até quando ler do banco principal
+_PRINCIPAL_ATE = '_principal_ate'
+
+
+class SessaoComReplica(Session):
+    """Sessão que envia as leituras para a réplica enquanto estiver em modo leitura."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self.info.get(_ESCREVEU):
+            if getattr(clause, 'is_dml', False) or self._flushing:
+                self.info[_ESCREVEU] = True
+            elif self.info.get(_LEITURA):
+                replica = self._db.engines.get(BIND_REPLICA)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(SessaoComReplica, 'before_flush')
+def _marcar_escrita(sessao, flush_context, instancias):
+    sessao.info[_ESCREVEU] = True
+
+
+def usar_replica(sessao):
+    """Coloca a sessão em modo leitura (ex.: relatórios da linha de comando)."""
+    sessao.info[_LEITURA] = True
+
+
+def init_app(app, db):
+    if BIND_REPLICA not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+
+    @app.before_request
+    def _escolher_banco():
+        if request.method in ('GET', 'HEAD') and time.time() >= session.get(_PRINCIPAL_ATE, 0):
+            usar_replica(db.session)
+
+    @app.after_request
+    def _prender_ao_principal(resposta):
+        # A sessão do SQLAlchemy é descartada ao fim de cada requisição (teardown)
+        if db.session.info.get(_ESCREVEU):
+            session[_PRINCIPAL_ATE] = time.time() + app.config['REPLICA_ATRASO_S']
+        return resposta
+
+
+def copiar_sqlite(principal, replica):
+    """
+    Copia o banco SQLite `principal` para o arquivo da `replica` (engines), com a API de
+    backup do SQLite: serve de réplica para testes locais.
+    """
+    origem = principal.raw_connection()
+    destino = replica.raw_connection()
+    try:
+        origem.driver_connection.backup(destino.driver_connection)
+    finally:
+        destino.close()
+        origem.close()
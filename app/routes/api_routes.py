@@ -0,0 +1,47 @@
+# /Recursos-Humanos-Ferias/app/routes/api_routes.py
+
+# /api/v1/<recurso>: usuarios, secoes, periodos ou solicitacoes (JSON, token de acesso).
+#   ?ids=1,2,3         busca em lote
+#   ?campos=id,nome    colunas retornadas
+#   ?limite=500        registros por página; a próxima página é pedida com ?depois=<proxima>
+#   If-Modified-Since  só os registros alterados desde a data (ver app/api.py)
+
+from datetime import timezone
+from flask import Blueprint, request, current_app, jsonify
+from app.api import RECURSOS, ParametroInvalido, consultar, campos_pedidos, ids_pedidos, marca_dagua, para_json
+from app.decorators import token_api_required
+
+bp = Blueprint('api', __name__)
+
+
+@bp.route('/<recurso>')
+@token_api_required
+def listar(recurso):
+    if recurso not in RECURSOS:
+        return jsonify(erro=f'Recurso desconhecido: {recurso}'), 404
+
+    maximo = current_app.config['API_LIMITE_MAXIMO']
+    limite = max(1, min(request.args.get('limite', current_app.config['API_LIMITE_PADRAO'], type=int), maximo))
+    desde = request.if_modified_since
+    if desde is not None:
+        desde = desde.astimezone(timezone.utc).replace(tzinfo=None)
+    cursor = request.args.get('depois')
+
+    try:
+        campos = campos_pedidos(recurso, request.args.get('campos', ''))
+        ids = ids_pedidos(request.args['ids'], maximo) if 'ids' in request.args else None
+        marca = marca_dagua(current_app.config['API_MARGEM_S']) if desde is not None and ids is None else None
+        linhas, proxima, marca = consultar(recurso, campos, ids=ids, desde=desde if ids is None else None,
+                                           cursor=cursor, limite=limite, marca=marca)
+    except ParametroInvalido as e:
+        return jsonify(erro=str(e)), 400
+
+    if marca is not None and not linhas and not cursor:
+        # Nada alterado desde a data enviada: o cliente mantém a mesma marca
+        return current_app.response_class(status=304)
+
+    resposta = current_app.response_class(para_json(campos, linhas, proxima), mimetype='application/json')
+    if marca is not None:
+        resposta.last_modified = marca
+    resposta.headers['Cache-Control'] = 'no-store'
+    return resposta
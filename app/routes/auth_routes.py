@@ -1,9 +1,11 @@
 # /Recursos-Humanos-Ferias/app/routes/auth_routes.py
 
-from flask import Blueprint, render_template, redirect, url_for, flash
+import math
+from flask import Blueprint, render_template, redirect, url_for, flash, request, make_response
 from flask_login import login_user, logout_user, current_user
 from app.models import Usuario
 from app.forms import LoginForm
+from app.limitador import limitador_login, formatar_espera
 
 
 # Cria um Blueprint chamado 'auth'
@@ -16,6 +18,15 @@ def login():
         return redirect(url_for('main.index'))
 
     form = LoginForm()
+    if request.method == 'POST':
+        # Antes da consulta e do hash da senha: tentativas em excesso não custam CPU
+        limite = limitador_login.verificar(request.form.get('identidade', ''), request.remote_addr)
+        if not limite.permitido:
+            flash(f'Muitas tentativas de login. Tente novamente em {formatar_espera(limite.espera_s)}.', 'danger')
+            resposta = make_response(render_template('auth/login.html', title='Login', form=form), 429)
+            resposta.headers['Retry-After'] = str(math.ceil(limite.espera_s))
+            return resposta
+
     if form.validate_on_submit():
         # Busca o usuário pela identidade no banco de dados
         user = Usuario.query.filter_by(identidade=form.identidade.data).first()
@@ -25,6 +36,8 @@ def login():
             flash('Identidade ou senha inválida', 'danger')
             return redirect(url_for('auth.login'))
 
+        limitador_login.sucesso(form.identidade.data, request.remote_addr)
+
         # Loga o usuário com o Flask-Login
         login_user(user, remember=form.remember_me.data)
         flash('Login realizado com sucesso!', 'success')
@@ -1,5 +1,96 @@
+# /Recursos-Humanos-Ferias/app/routes/chefe_routes.py
+
 # /chefe/dashboard: Mostra uma lista de solicitações pendentes dos integrantes da sua seção.
 
 # /chefe/equipe: Visualiza o planejamento de férias de toda a sua equipe (aprovadas e solicitadas).
 
-# /chefe/solicitacao/<id>/avaliar: Tela para aprovar, reprovar (com justificativa) ou editar a solicitação de um militar.# 
\ No newline at end of file
+# /chefe/solicitacao/<id>/avaliar: Tela para aprovar, reprovar (com justificativa) ou editar a solicitação de um militar.
+
+# /chefe/solicitacoes/avaliar: Aprova ou reprova em lote as solicitações marcadas no dashboard.
+
+from datetime import date
+from flask import Blueprint, render_template, request, g, redirect, url_for, flash, current_app
+from flask_login import login_required
+from sqlalchemy.orm import joinedload
+from app import db
+from app.avaliacao import avaliar_em_lote, AvaliacaoInvalida, STATUS_DO_CHEFE
+from app.calendario import calendario_secao
+from app.carregamento import carregar
+from app.forms import AvaliacaoLoteForm
+from app.models import Usuario, SolicitacaoFerias, StatusFerias
+from app.paginacao import paginar
+from app.decorators import chefe_required
+
+bp = Blueprint('chefe', __name__)
+
+
+def _data_do_argumento(nome, padrao):
+    try:
+        return date.fromisoformat(request.args.get(nome, ''))
+    except ValueError:
+        return padrao
+
+
+def _form_avaliacao():
+    form = AvaliacaoLoteForm()
+    form.status.choices = [(status.name, status.value) for status in STATUS_DO_CHEFE]
+    return form
+
+
+@bp.route('/dashboard')
+@login_required
+@chefe_required
+def dashboard():
+    secao = g.secao_chefiada
+    query = SolicitacaoFerias.query.options(*carregar(joinedload(SolicitacaoFerias.solicitante))) \
+        .join(Usuario, Usuario.id == SolicitacaoFerias.solicitante_id) \
+        .filter(Usuario.secao_id == secao.id, SolicitacaoFerias.status == StatusFerias.SOLICITADA)
+    solicitacoes = paginar(
+        query, (SolicitacaoFerias.id,),
+        depois=request.args.get('depois'), antes=request.args.get('antes'),
+        por_pagina=current_app.config['ITENS_POR_PAGINA']
+    )
+    return render_template('chefe/dashboard.html', title='Solicitações Pendentes', secao=secao,
+                           solicitacoes=solicitacoes, form=_form_avaliacao())
+
+
+@bp.route('/solicitacoes/avaliar', methods=['POST'])
+@login_required
+@chefe_required
+def avaliar_solicitacoes():
+    """Aprova ou reprova de uma vez as solicitações selecionadas (apenas as da própria seção)."""
+    form = _form_avaliacao()
+    if form.validate_on_submit():
+        try:
+            avaliadas, ignoradas = avaliar_em_lote(form.ids.data, StatusFerias[form.status.data],
+                                                   form.justificativa_reprovacao.data, secao_id=g.secao_chefiada.id)
+            db.session.commit()
+        except AvaliacaoInvalida as e:
+            db.session.rollback()
+            flash(str(e), 'danger')
+        else:
+            flash(f'{len(avaliadas)} solicitação(ões) avaliada(s).', 'success')
+            if ignoradas:
+                flash(f'{len(ignoradas)} solicitação(ões) ignorada(s): já avaliadas ou fora da sua seção.', 'warning')
+    else:
+        for erros in form.errors.values():
+            flash(erros[0], 'danger')
+    return redirect(url_for('chefe.dashboard'))
+
+
+@bp.route('/equipe')
+@login_required
+@chefe_required
+def equipe():
+    secao = g.secao_chefiada
+    hoje = date.today()
+    inicio = _data_do_argumento('inicio', date(hoje.year, 1, 1))
+    fim = _data_do_argumento('fim', date(hoje.year, 12, 31))
+    if fim < inicio:
+        inicio, fim = fim, inicio
+
+    calendario = calendario_secao(secao.id, inicio, fim)
+    nomes = {u.id: f"{u.posto_grad} {u.nome_guerra}" for u in Usuario.query.options(*carregar()).filter_by(secao_id=secao.id)}
+
+    return render_template('chefe/equipe.html', title='Planejamento da Equipe', secao=secao,
+                           calendario=calendario, nomes=nomes)
@@ -1,25 +1,130 @@
 # /Recursos-Humanos-Ferias/app/routes/gestor_routes.py
 
-from flask import Blueprint, render_template, redirect, url_for, flash
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, \
+    Response, stream_with_context, abort, jsonify
 from flask_login import login_required
+from sqlalchemy.orm import joinedload
 from app import db
-from app.models import Usuario, Secao, PapelUsuario
-from app.forms import SecaoForm, SecaoEditForm, UsuarioCreateForm, UsuarioEditForm
+from app.models import Usuario, Secao, PapelUsuario, StatusFerias, SolicitacaoFerias
+from app.forms import SecaoForm, SecaoEditForm, UsuarioCreateForm, UsuarioEditForm, UsuarioFiltroForm, \
+    AvaliacaoLoteForm
 from app.decorators import gestor_required
+from app.paginacao import paginar
+from app.carregamento import carregar
+from app.opcoes import opcoes_secoes
+from app.busca import indice_usuarios, indice_secoes, opcao_selecionada
+from app.exportacao import gerar_csv, TIPOS
+from app.avaliacao import avaliar_em_lote, AvaliacaoInvalida, STATUS_DO_GESTOR
+from app.versoes import condicional, CHAVE_USUARIOS, CHAVE_SECOES
 
 bp = Blueprint('gestor', __name__)
 
+
+def _argumentos_sem_cursor():
+    """Parâmetros da URL atual (filtros) sem os cursores, para montar os links de paginação."""
+    return {k: v for k, v in request.args.items() if k not in ('depois', 'antes')}
+
 @bp.route('/dashboard')
 @login_required
 @gestor_required
 def dashboard():
-    return render_template('gestor/dashboard.html', title='Dashboard do Gestor')
+    from app.agregados import resumo_dashboard
+
+    return render_template('gestor/dashboard.html', title='Dashboard do Gestor',
+                           resumo=resumo_dashboard(), status_ferias=list(StatusFerias))
+
+@bp.route('/exportar/<tipo>.csv')
+@login_required
+@gestor_required
+def exportar(tipo):
+    """Exporta solicitações ou períodos em CSV, enviando as linhas à medida que são lidas."""
+    if tipo not in TIPOS:
+        abort(404)
+    return Response(
+        stream_with_context(gerar_csv(tipo)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={tipo}.csv'}
+    )
+
+@bp.route('/metricas')
+@login_required
+@gestor_required
+def metricas():
+    """Percentis de tempo total, tempo de SQL e nº de consultas e consultas mais lentas por endpoint, caches e limite de login (JSON)."""
+    from app.instrumentacao import metricas_por_endpoint
+    from app.cache import usuarios_cache
+    from app.limitador import limitador_login
+
+    return jsonify(
+        instrumentacao=current_app.config['SQL_INSTRUMENTACAO'],
+        endpoints=metricas_por_endpoint(),
+        cache_usuarios=usuarios_cache.estatisticas(),
+        limitador_login=limitador_login.estatisticas()
+    )
+
+@bp.route('/busca/<tipo>')
+@login_required
+@gestor_required
+def buscar(tipo):
+    """Busca por prefixo para os campos de seleção (JSON): ?q=texto&limite=10."""
+    indices = {'usuarios': indice_usuarios, 'secoes': indice_secoes}
+    if tipo not in indices:
+        abort(404)
+    limite = max(1, min(request.args.get('limite', 10, type=int), 50))
+    resultados = indices[tipo].buscar(request.args.get('q', ''), limite)
+    return jsonify(resultados=[{'id': id_registro, 'texto': texto} for id_registro, texto in resultados])
+
+# --- AVALIAÇÃO DE SOLICITAÇÕES ---
+
+def _form_avaliacao():
+    form = AvaliacaoLoteForm()
+    form.status.choices = [(status.name, status.value) for status in STATUS_DO_GESTOR]
+    return form
+
+@bp.route('/solicitacoes')
+@login_required
+@gestor_required
+def solicitacoes_pendentes():
+    query = SolicitacaoFerias.query \
+        .options(*carregar(joinedload(SolicitacaoFerias.solicitante).joinedload(Usuario.secao))) \
+        .filter(SolicitacaoFerias.status == StatusFerias.APROVADA_CHEFE)
+    solicitacoes = paginar(
+        query, (SolicitacaoFerias.id,),
+        depois=request.args.get('depois'), antes=request.args.get('antes'),
+        por_pagina=current_app.config['ITENS_POR_PAGINA']
+    )
+    return render_template('gestor/solicitacoes.html', title='Avaliar Solicitações', solicitacoes=solicitacoes,
+                           form=_form_avaliacao())
+
+@bp.route('/solicitacoes/avaliar', methods=['POST'])
+@login_required
+@gestor_required
+def avaliar_solicitacoes():
+    """Aprova ou reprova de uma vez as solicitações selecionadas."""
+    form = _form_avaliacao()
+    if form.validate_on_submit():
+        try:
+            avaliadas, ignoradas = avaliar_em_lote(form.ids.data, StatusFerias[form.status.data],
+                                                   form.justificativa_reprovacao.data)
+            db.session.commit()
+        except AvaliacaoInvalida as e:
+            db.session.rollback()
+            flash(str(e), 'danger')
+        else:
+            flash(f'{len(avaliadas)} solicitação(ões) avaliada(s).', 'success')
+            if ignoradas:
+                flash(f'{len(ignoradas)} solicitação(ões) ignorada(s): status não permite esta avaliação.', 'warning')
+    else:
+        for erros in form.errors.values():
+            flash(erros[0], 'danger')
+    return redirect(url_for('gestor.solicitacoes_pendentes'))
 
 # --- GERENCIAMENTO DE SEÇÕES ---
 
 @bp.route('/secoes', methods=['GET', 'POST'])
 @login_required
 @gestor_required
+@condicional(lambda: [CHAVE_SECOES])
 def gerenciar_secoes():
     form = SecaoForm()
     if form.validate_on_submit():
@@ -29,16 +134,20 @@ def gerenciar_secoes():
         flash('Seção criada com sucesso!', 'success')
         return redirect(url_for('gestor.gerenciar_secoes'))
 
-    secoes = Secao.query.order_by(Secao.nome).all()
-    return render_template('gestor/secoes.html', title='Gerenciar Seções', form=form, secoes=secoes)
+    secoes = paginar(
+        Secao.query.options(*carregar(joinedload(Secao.chefe))), (Secao.nome, Secao.id),
+        depois=request.args.get('depois'), antes=request.args.get('antes'),
+        por_pagina=current_app.config['ITENS_POR_PAGINA']
+    )
+    return render_template('gestor/secoes.html', title='Gerenciar Seções', form=form, secoes=secoes,
+                           args_paginacao=_argumentos_sem_cursor())
 
-@bp.route('/secao/<int:id>/editar', methods=['GET', 'POST'])
+@bp.route('/secao/<int:id_secao>/editar', methods=['GET', 'POST'])
 @login_required
 @gestor_required
 def editar_secao(id_secao):
     secao = Secao.query.get_or_404(id_secao)
     form = SecaoEditForm(obj=secao)
-    form.chefe_id.choices = [(0, 'Nenhum')] + [(u.id, f"{u.posto_grad} {u.nome_guerra}") for u in Usuario.query.order_by('nome_guerra').all()]
 
     if form.validate_on_submit():
         secao.nome = form.nome.data
@@ -47,6 +156,7 @@ def editar_secao(id_secao):
         flash('Seção atualizada com sucesso!', 'success')
         return redirect(url_for('gestor.gerenciar_secoes'))
 
+    form.chefe_id.choices = opcao_selecionada(indice_usuarios, form.chefe_id.data, (0, 'Nenhum'))
     return render_template('gestor/editar_secao.html', title='Editar Seção', form=form, secao=secao)
 
 # --- GERENCIAMENTO DE USUÁRIOS ---
@@ -54,9 +164,9 @@ def editar_secao(id_secao):
 @bp.route('/usuarios', methods=['GET', 'POST'])
 @login_required
 @gestor_required
+@condicional(lambda: [CHAVE_USUARIOS])
 def gerenciar_usuarios():
     form = UsuarioCreateForm()
-    form.secao_id.choices = [(0, 'Nenhuma')] + [(s.id, s.nome) for s in Secao.query.order_by('nome').all()]
 
     if form.validate_on_submit():
         user = Usuario(
@@ -73,16 +183,33 @@ def gerenciar_usuarios():
         flash('Militar cadastrado com sucesso!', 'success')
         return redirect(url_for('gestor.gerenciar_usuarios'))
 
-    usuarios = Usuario.query.order_by(Usuario.nome_completo).all()
-    return render_template('gestor/usuarios.html', title='Gerenciar Militares', form=form, usuarios=usuarios)
-
-@bp.route('/usuario/<int:id>/editar', methods=['GET', 'POST'])
+    # Filtros aplicados no banco; a listagem é paginada por (nome_completo, id)
+    filtros = UsuarioFiltroForm(formdata=request.args)
+    filtros.secao_id.choices = [(0, 'Todas')] + opcoes_secoes()
+
+    query = Usuario.query.options(*carregar(joinedload(Usuario.secao)))
+    if filtros.secao_id.data:
+        query = query.filter(Usuario.secao_id == filtros.secao_id.data)
+    if filtros.papel.data in PapelUsuario.__members__:
+        query = query.filter(Usuario.papel == PapelUsuario[filtros.papel.data])
+    if filtros.posto_grad.data:
+        query = query.filter(Usuario.posto_grad == filtros.posto_grad.data.strip())
+
+    usuarios = paginar(
+        query, (Usuario.nome_completo, Usuario.id),
+        depois=request.args.get('depois'), antes=request.args.get('antes'),
+        por_pagina=current_app.config['ITENS_POR_PAGINA']
+    )
+    form.secao_id.choices = opcao_selecionada(indice_secoes, form.secao_id.data, (0, 'Nenhuma'))
+    return render_template('gestor/usuarios.html', title='Gerenciar Militares', form=form, usuarios=usuarios,
+                           filtros=filtros, args_paginacao=_argumentos_sem_cursor())
+
+@bp.route('/usuario/<int:id_usuario>/editar', methods=['GET', 'POST'])
 @login_required
 @gestor_required
 def editar_usuario(id_usuario):
     user = Usuario.query.get_or_404(id_usuario)
     form = UsuarioEditForm(original_identidade=user.identidade, obj=user)
-    form.secao_id.choices = [(0, 'Nenhuma')] + [(s.id, s.nome) for s in Secao.query.order_by('nome').all()]
 
     if form.validate_on_submit():
         user.nome_completo = form.nome_completo.data
@@ -97,5 +224,6 @@ def editar_usuario(id_usuario):
 
     form.papel.data = user.papel.name
     form.secao_id.data = user.secao_id if user.secao_id else 0
+    form.secao_id.choices = opcao_selecionada(indice_secoes, form.secao_id.data, (0, 'Nenhuma'))
 
     return render_template('gestor/editar_usuario.html', title='Editar Militar', form=form, usuario=user)
@@ -1,10 +1,15 @@
 """/Recursos-Humanos-Ferias/app/routes/militar_routes.py"""
 
-from datetime import timedelta, date
-from flask import Blueprint, render_template, redirect, url_for, flash
+from datetime import timedelta
+from flask import Blueprint, render_template, redirect, url_for, flash, current_app
 from flask_login import login_required, current_user
-from app.models import PeriodoAquisitivo, SolicitacaoFerias, StatusFerias
+from app.models import SolicitacaoFerias, StatusFerias
 from app.forms import SolicitacaoFeriasForm
+from app.saldo import reservar_saldo, SaldoInsuficiente
+from app.calendario import Intervalo, calendario_secao
+from app.notificacoes import notificar_solicitacoes
+from app.arquivo import periodos_do_militar, solicitacoes_do_militar
+from app.versoes import condicional, chave_militar, CHAVE_MILITARES
 from app import db
 
 
@@ -12,9 +17,11 @@ bp = Blueprint('militar', __name__)
 
 @bp.route('/dashboard')
 @login_required
+@condicional(lambda: [chave_militar(current_user.id), CHAVE_MILITARES])
 def dashboard():
-    periodos = PeriodoAquisitivo.query.filter_by(usuario_id=current_user.id).order_by(PeriodoAquisitivo.ano_referencia.asc()).all()
-    solicitacoes = SolicitacaoFerias.query.filter_by(solicitante_id=current_user.id).order_by(SolicitacaoFerias.data_solicitacao.desc()).all()
+    # Inclui o histórico arquivado (flask arquivar)
+    periodos = periodos_do_militar(current_user.id)
+    solicitacoes = solicitacoes_do_militar(current_user.id)
 
     saldo_total = sum(p.dias_saldo for p in periodos)
 
@@ -42,27 +49,29 @@ def solicitar_ferias():
         data_inicio_req = form.data_inicio.data
         data_fim_req = data_inicio_req + timedelta(days=dias_a_solicitar - 1)
 
-        # 1. Encontrar o período aquisitivo mais antigo com saldo disponível
-        periodo_alvo = PeriodoAquisitivo.query.filter(
-            PeriodoAquisitivo.usuario_id == current_user.id,
-            PeriodoAquisitivo.dias_saldo > 0,
-            PeriodoAquisitivo.data_fim_periodo <= date.today() # Garante que o direito já foi adquirido
-        ).order_by(PeriodoAquisitivo.ano_referencia.asc()).first()
+        # Ausências previstas na seção durante o período pedido, já contando esta solicitação
+        # (o militar conta uma vez, mesmo que já tenha outra solicitação nessas datas)
+        limite = current_app.config['LIMITE_AUSENCIA_SECAO']
+        ausentes_na_secao = 0
+        if limite and current_user.secao_id:
+            pedido = Intervalo(None, current_user.id, data_inicio_req, data_fim_req)
+            ausentes_na_secao = calendario_secao(current_user.secao_id, data_inicio_req, data_fim_req,
+                                                 incluir=[pedido]).pico
 
-        # 2. Valida se há um período e se o saldo é suficiente
-        if not periodo_alvo:
-            flash('Você não possui saldo de férias disponível ou nenhum período foi adquirido ainda.', 'danger')
-            return redirect(url_for('militar.solicitar_ferias'))
-        
-        if periodo_alvo.dias_saldo < dias_a_solicitar:
-            flash(f'Saldo insuficiente no período mais antigo ({periodo_alvo.ano_referencia}). Saldo: {periodo_alvo.dias_saldo} dias.', 'danger')
+        # 1. Debitar o saldo do período aquisitivo mais antigo disponível.
+        #    O débito é um UPDATE condicional, seguro contra envios simultâneos.
+        try:
+            periodo_id = reservar_saldo(current_user.id, dias_a_solicitar)
+        except SaldoInsuficiente as e:
+            db.session.rollback()
+            flash(str(e), 'danger')
             return redirect(url_for('militar.solicitar_ferias'))
-        
-        # 3. Criar a solicitação e atualizar o saldo
+
+        # 2. Criar a solicitação na mesma transação do débito
         try:
             nova_solicitacao = SolicitacaoFerias(
                 solicitante_id=current_user.id,
-                periodo_aquisitivo_id=periodo_alvo.id,
+                periodo_aquisitivo_id=periodo_id,
                 data_inicio=data_inicio_req,
                 data_fim=data_fim_req,
                 dias_solicitados=dias_a_solicitar,
@@ -70,14 +79,16 @@ def solicitar_ferias():
                 status=StatusFerias.SOLICITADA
             )
 
-            # 4. Debitar o saldo do período
-            periodo_alvo.dias_saldo -= dias_a_solicitar
-
             db.session.add(nova_solicitacao)
+            db.session.flush()
+            notificar_solicitacoes([nova_solicitacao.id])
             db.session.commit()
             flash('Sua solicitação de férias foi enviada com sucesso!', 'success')
+            if limite and ausentes_na_secao > limite:
+                flash(f'Atenção: com esta solicitação, {ausentes_na_secao} militares da sua seção estarão de férias '
+                      f'ao mesmo tempo, acima do limite de {limite}.', 'warning')
             return redirect(url_for('militar.dashboard'))
-        
+
         except Exception as e:
             db.session.rollback()
             flash(f'Ocorreu um erro ao processar sua solicitação: {e}', 'danger')
@@ -0,0 +1,72 @@
+"""
+/Recursos-Humanos-Ferias/app/saldo.py
+
+Movimentação do saldo de férias (PeriodoAquisitivo.dias_saldo).
+
+O débito é feito por um único UPDATE condicional
+(dias_saldo = dias_saldo - n ... WHERE dias_saldo >= n): o próprio banco garante que
+duas solicitações simultâneas não consumam o mesmo saldo, sem leitura prévia com lock.
+As funções não fazem commit; isso fica a cargo de quem chama, junto com o restante da
+transação (ex.: a criação da SolicitacaoFerias).
+"""
+from datetime import date
+from sqlalchemy import select, update
+from app import db
+from app.eventos import marcar_alterados
+from app.agregados import somar_saldo_periodo
+from app.versoes import incrementar_militar_do_periodo
+from app.auditoria import registrar_saldo
+from app.models import PeriodoAquisitivo
+
+
+# Quantas vezes procurar outro período quando o escolhido foi consumido por outra requisição
+TENTATIVAS_DEBITO = 5
+
+
+class SaldoInsuficiente(Exception):
+    """Não há período aquisitivo com saldo suficiente para o débito."""
+
+
+def debitar_saldo(periodo_id, dias):
+    """Debita `dias` do período se houver saldo. Retorna True se o débito foi feito."""
+    resultado = db.session.execute(
+        update(PeriodoAquisitivo)
+        .where(PeriodoAquisitivo.id == periodo_id, PeriodoAquisitivo.dias_saldo >= dias)
+        .values(dias_saldo=PeriodoAquisitivo.dias_saldo - dias)
+    )
+    if resultado.rowcount != 1:
+        return False
+    somar_saldo_periodo(db.session.connection(), periodo_id, -dias)
+    registrar_saldo(db.session.connection(), {periodo_id: -dias})
+    incrementar_militar_do_periodo(db.session.connection(), periodo_id)
+    marcar_alterados(db.session, PeriodoAquisitivo, [periodo_id])
+    return True
+
+
+def reservar_saldo(usuario_id, dias, hoje=None):
+    """
+    Debita `dias` do período aquisitivo mais antigo do militar que já tenha sido adquirido
+    e ainda possua saldo. Retorna o id do período debitado.
+
+    Se outra requisição consumir o saldo entre a escolha do período e o UPDATE, o período
+    é escolhido novamente (até TENTATIVAS_DEBITO vezes). Levanta SaldoInsuficiente quando
+    não houver saldo.
+    """
+    hoje = hoje or date.today()
+    consulta = select(PeriodoAquisitivo.id, PeriodoAquisitivo.ano_referencia, PeriodoAquisitivo.dias_saldo).where(
+        PeriodoAquisitivo.usuario_id == usuario_id,
+        PeriodoAquisitivo.dias_saldo > 0,
+        PeriodoAquisitivo.data_fim_periodo <= hoje  # Garante que o direito já foi adquirido
+    ).order_by(PeriodoAquisitivo.ano_referencia.asc()).limit(1)
+
+    for _ in range(TENTATIVAS_DEBITO):
+        periodo = db.session.execute(consulta).first()
+        if periodo is None:
+            raise SaldoInsuficiente('Você não possui saldo de férias disponível ou nenhum período foi adquirido ainda.')
+        if periodo.dias_saldo < dias:
+            raise SaldoInsuficiente(f'Saldo insuficiente no período mais antigo ({periodo.ano_referencia}). '
+                                    f'Saldo: {periodo.dias_saldo} dias.')
+        if debitar_saldo(periodo.id, dias):
+            return periodo.id
+
+    raise SaldoInsuficiente('Não foi possível reservar o saldo agora. Tente novamente.')
@@ -0,0 +1,221 @@
+"""
+/Recursos-Humanos-Ferias/app/servidor.py
+
+Servidor de produção do `flask serve` (Linux): um processo mestre abre o socket, já com
+a aplicação carregada, e cria por fork os processos de trabalho. Cada worker atende as
+requisições com o servidor WSGI do Werkzeug e um pool de threads de tamanho fixo.
+
+Sinais do mestre:
+  - SIGTERM / SIGINT: encerra os workers após concluírem as requisições em andamento;
+  - SIGHUP: recarga graciosa; o mestre se reexecuta (carregando o código novo) mantendo
+    o mesmo socket, cria os novos workers e só então encerra os antigos.
+Um worker que termina inesperadamente é substituído.
+"""
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from app import db
+
+
+# Variáveis de ambiente usadas para passar o socket e os workers antigos na recarga
+ENV_SOCKET = 'FERIAS_SERVE_FD'
+ENV_WORKERS_ANTIGOS = 'FERIAS_SERVE_WORKERS_ANTIGOS'
+
+# Tempo máximo (s) para um worker concluir as requisições em andamento ao encerrar
+TEMPO_ENCERRAMENTO_S = 30
+
+
+class _Handler(WSGIRequestHandler):
+    # Uma requisição por conexão: conexões ociosas (keep-alive) não prendem as threads do pool
+    protocol_version = 'HTTP/1.0'
+    # Clientes lentos não seguram uma thread indefinidamente
+    timeout = 30
+
+
+class ServidorComPool(BaseWSGIServer):
+    """Servidor WSGI do Werkzeug que atende cada conexão numa thread de um pool fixo."""
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, host, port, app, threads, fd):
+        super().__init__(host, port, app, handler=_Handler, fd=fd)
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def _descartar_conexoes(app, fechar):
+    """Descarta o pool de conexões herdado; no filho, sem fechar as conexões do pai (close=False)."""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=fechar)
+
+
+def _executar_worker(app, host, port, threads, sock, aviso_pronto):
+    """Corpo do processo de trabalho (após o fork). Não retorna."""
+    for sinal in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(sinal, signal.SIG_DFL)
+    _descartar_conexoes(app, fechar=False)
+
+    servidor = ServidorComPool(host, port, app, threads, fd=sock.fileno())
+    servidor.timeout = 0.5  # handle_request() retorna periodicamente para verificar o encerramento
+    encerrando = threading.Event()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: encerrando.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C chega ao grupo todo; quem decide é o mestre
+    os.write(aviso_pronto, b'.')
+    os.close(aviso_pronto)
+
+    codigo = 0
+    try:
+        while not encerrando.is_set():
+            servidor.handle_request()
+        # Para de aceitar conexões e conclui as requisições em andamento
+        servidor.pool.shutdown(wait=True)
+    except Exception:
+        codigo = 1
+    finally:
+        os._exit(codigo)
+
+
+class Mestre:
+    def __init__(self, app, host, port, workers, threads):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.quantidade = workers
+        self.threads = threads
+        self.workers = set()
+        self.encerrando = False
+        self.recarregar = False
+
+    def _abrir_socket(self):
+        herdado = os.environ.pop(ENV_SOCKET, None)
+        if herdado is not None:
+            sock = socket.socket(fileno=int(herdado))
+        else:
+            sock = socket.create_server((self.host, self.port), backlog=2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _criar_worker(self):
+        leitura, escrita = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(leitura)
+            _executar_worker(self.app, self.host, self.port, self.threads, self.sock, escrita)
+        os.close(escrita)
+        self.workers.add(pid)
+        return leitura
+
+    def _criar_workers(self, quantidade, timeout=30):
+        """Cria `quantidade` workers e espera todos sinalizarem que estão prontos."""
+        pendentes = [self._criar_worker() for _ in range(quantidade)]
+        limite = time.monotonic() + timeout
+        while pendentes and time.monotonic() < limite:
+            prontos, _, _ = select.select(pendentes, [], [], max(0.0, limite - time.monotonic()))
+            for fd in prontos:
+                os.read(fd, 1)
+                os.close(fd)
+                pendentes.remove(fd)
+        for fd in pendentes:
+            os.close(fd)
+        return quantidade - len(pendentes)
+
+    def _sinalizar(self, pids, sinal):
+        for pid in pids:
+            try:
+                os.kill(pid, sinal)
+            except ProcessLookupError:
+                pass
+
+    def _recolher(self, pids=None, timeout=None):
+        """Recolhe workers que terminaram; com `pids` e `timeout`, espera por eles."""
+        limite = time.monotonic() + (timeout or 0)
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid:
+                self.workers.discard(pid)
+                if pids is not None:
+                    pids.discard(pid)
+                continue
+            if pids is None or not pids or time.monotonic() >= limite:
+                return
+            time.sleep(0.1)
+
+    def _encerrar_workers(self, pids):
+        pids = set(pids)
+        self._sinalizar(pids, signal.SIGTERM)
+        self._recolher(pids, timeout=TEMPO_ENCERRAMENTO_S)
+        self._sinalizar(pids, signal.SIGKILL)
+        self._recolher(pids, timeout=5)
+
+    def _reexecutar(self):
+        """Recarga graciosa: reexecuta o mestre com o mesmo PID e socket; os workers atuais seguem atendendo."""
+        print(f"Recarregando (workers atuais: {', '.join(map(str, sorted(self.workers)))})...", flush=True)
+        os.environ[ENV_SOCKET] = str(self.sock.fileno())
+        os.environ[ENV_WORKERS_ANTIGOS] = ','.join(map(str, self.workers))
+        # orig_argv preserva a forma de invocação (ex.: python -m flask serve)
+        os.execv(sys.executable, sys.orig_argv)
+
+    def executar(self):
+        inicio = time.perf_counter()
+        antigos = {int(pid) for pid in os.environ.pop(ENV_WORKERS_ANTIGOS, '').split(',') if pid}
+        self.sock = self._abrir_socket()
+        # Nenhuma conexão aberta no mestre deve ser herdada pelos workers
+        _descartar_conexoes(self.app, fechar=True)
+
+        def ao_sinal(signum, frame):
+            if signum == signal.SIGHUP:
+                self.recarregar = True
+            else:
+                self.encerrando = True
+
+        for sinal in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sinal, ao_sinal)
+
+        prontos = self._criar_workers(self.quantidade)
+        if antigos:
+            self._encerrar_workers(antigos)
+        host, port = self.sock.getsockname()[:2]
+        print(f"Servindo em http://{host}:{port} (PID {os.getpid()}): {prontos}/{self.quantidade} worker(s) "
+              f"x {self.threads} thread(s), pronto em {time.perf_counter() - inicio:.2f}s. "
+              f"SIGHUP recarrega, Ctrl+C encerra.", flush=True)
+
+        while not self.encerrando:
+            if self.recarregar:
+                self._reexecutar()
+            time.sleep(0.5)
+            self._recolher()
+            if not self.encerrando and not self.recarregar and len(self.workers) < self.quantidade:
+                print(f"Worker encerrado inesperadamente; criando {self.quantidade - len(self.workers)} novo(s).", flush=True)
+                self._criar_workers(self.quantidade - len(self.workers))
+
+        print("Encerrando os workers...", flush=True)
+        self._encerrar_workers(self.workers)
+        self.sock.close()
+
+
+def servir(app, host='127.0.0.1', port=8000, workers=2, threads=4):
+    """Executa o servidor até receber SIGTERM/SIGINT."""
+    if not hasattr(os, 'fork'):
+        raise RuntimeError('flask serve requer um sistema com fork() (Linux).')
+    Mestre(app, host, port, workers, threads).executar()
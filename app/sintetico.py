@@ -0,0 +1,165 @@
+"""
+/Recursos-Humanos-Ferias/app/sintetico.py
+
+Gerador de dados sintéticos (seções, militares, períodos aquisitivos e solicitações)
+para testes de carga e benchmarks. Com a mesma semente, gera sempre os mesmos dados.
+"""
+import random
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert, select, func, update
+from werkzeug.security import generate_password_hash
+from app import db
+from app.agregados import recalcular
+from app.versoes import incrementar, CHAVE_USUARIOS, CHAVE_SECOES, CHAVE_MILITARES
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, PapelUsuario, StatusFerias
+
+
+IDENTIDADE_GESTOR = 'SINT-GESTOR'
+
+# Pirâmide hierárquica aproximada: (posto/graduação, peso)
+POSTOS = [
+    ('Sd', 30), ('Cb', 15), ('3º Sgt', 15), ('2º Sgt', 10), ('1º Sgt', 6), ('ST', 3), ('Asp', 1),
+    ('2º Ten', 3), ('1º Ten', 5), ('Cap', 5), ('Maj', 3), ('TC', 2), ('Cel', 1),
+]
+
+NOMES = [
+    'João', 'José', 'Antônio', 'Francisco', 'Carlos', 'Paulo', 'Pedro', 'Lucas', 'Luiz', 'Marcos',
+    'Gabriel', 'Rafael', 'Daniel', 'Marcelo', 'Bruno', 'Eduardo', 'Felipe', 'Rodrigo', 'Maria', 'Ana',
+    'Juliana', 'Fernanda', 'Patrícia', 'Aline', 'Camila', 'Amanda', 'Letícia', 'Larissa', 'Vinícius', 'Thiago',
+]
+
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa',
+    'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas',
+]
+
+SECOES = ['1ª Seção', '2ª Seção', '3ª Seção', '4ª Seção', 'Cia Cmdo', 'Pel Com', 'Seção de Saúde',
+          'Fiscalização Administrativa', 'Almoxarifado', 'Pel Manutenção', 'Tesouraria', 'Seção de Pessoal']
+
+# Divisões do período de 30 dias: (partes, peso)
+DIVISOES = [((30,), 5), ((15, 15), 3), ((10, 10, 10), 2)]
+
+TAMANHO_BLOCO = 5000
+
+
+def _sortear(rng, opcoes):
+    valores, pesos = zip(*opcoes)
+    return rng.choices(valores, weights=pesos)[0]
+
+
+def _status_da_parcela(rng, inicio, hoje):
+    if inicio < hoje:
+        return _sortear(rng, [(StatusFerias.APROVADA_GESTOR, 85), (StatusFerias.REPROVADA, 5),
+                              (StatusFerias.CANCELADA, 5), (StatusFerias.ALTERADA, 5)])
+    return _sortear(rng, [(StatusFerias.SOLICITADA, 50), (StatusFerias.APROVADA_CHEFE, 30),
+                          (StatusFerias.APROVADA_GESTOR, 20)])
+
+
+def _periodos_e_solicitacoes(rng, usuario_id, anos, hoje, proximo_periodo_id):
+    """Gera os períodos de um militar (um por ano) e as solicitações que os consomem."""
+    periodos = []
+    solicitacoes = []
+    for ano in anos:
+        periodo_id = proximo_periodo_id + len(periodos)
+        saldo = 30
+        adquirido = date(ano, 12, 31) <= hoje
+        if adquirido:
+            partes = _sortear(rng, DIVISOES)
+            # Períodos antigos costumam estar consumidos; o mais recente, só em parte
+            usadas = len(partes) if ano < hoje.year - 1 and rng.random() < 0.9 else rng.randint(0, len(partes))
+            inicio = date(ano + 1, 1, 1) + timedelta(days=rng.randint(0, 200))
+            for dias in partes[:usadas]:
+                fim = inicio + timedelta(days=dias - 1)
+                status = _status_da_parcela(rng, inicio, hoje)
+                if status not in (StatusFerias.REPROVADA, StatusFerias.CANCELADA):
+                    saldo -= dias
+                solicitacoes.append({
+                    'solicitante_id': usuario_id,
+                    'periodo_aquisitivo_id': periodo_id,
+                    'data_inicio': inicio,
+                    'data_fim': fim,
+                    'dias_solicitados': dias,
+                    'tipo_solicitacao': f'{dias}_DIAS',
+                    'status': status,
+                    'data_solicitacao': datetime.combine(inicio, datetime.min.time()) - timedelta(days=rng.randint(15, 90)),
+                    'justificativa_reprovacao': 'Necessidade do serviço.' if status == StatusFerias.REPROVADA else None,
+                })
+                inicio = fim + timedelta(days=rng.randint(30, 120))
+        periodos.append({
+            'id': periodo_id,
+            'usuario_id': usuario_id,
+            'ano_referencia': ano,
+            'data_inicio_periodo': date(ano, 1, 1),
+            'data_fim_periodo': date(ano, 12, 31),
+            'dias_saldo': saldo,
+        })
+    return periodos, solicitacoes
+
+
+def gerar_dados(secoes=20, usuarios=1000, anos=3, semente=42, senha='senha123', hoje=None):
+    """
+    Popula um banco vazio com dados sintéticos. Todos os militares usam `senha`; há um
+    gestor com identidade IDENTIDADE_GESTOR e a mesma senha. Os registros são gravados
+    em lotes com INSERT em massa. Retorna a contagem de registros criados por tabela.
+    """
+    if db.session.scalar(select(func.count(Usuario.id))):
+        raise ValueError('O banco já possui usuários; a geração de dados sintéticos exige um banco vazio.')
+
+    rng = random.Random(semente)
+    hoje = hoje or date.today()
+    anos_referencia = list(range(hoje.year - anos, hoje.year + 1))
+    password_hash = generate_password_hash(senha)  # Um único hash para todos
+
+    nomes_secoes = [f'{SECOES[i % len(SECOES)]} {i // len(SECOES) + 1:03d}' for i in range(secoes)]
+    db.session.execute(insert(Secao), [{'id': i + 1, 'nome': nome} for i, nome in enumerate(nomes_secoes)])
+    # Tamanhos de seção bem desiguais, como numa OM real
+    pesos_secoes = [rng.paretovariate(1.5) for _ in range(secoes)]
+
+    db.session.execute(insert(Usuario), [{
+        'id': 1, 'nome_completo': 'Gestor de Pessoal (Sintético)', 'nome_guerra': 'Gestor',
+        'identidade': IDENTIDADE_GESTOR, 'posto_grad': 'Cap', 'password_hash': password_hash,
+        'papel': PapelUsuario.GESTOR, 'secao_id': None,
+    }])
+
+    totais = {'secoes': secoes, 'usuarios': 1, 'periodos': 0, 'solicitacoes': 0}
+    chefes = {}
+    proximo_periodo_id = 1
+    for inicio_bloco in range(2, usuarios + 2, TAMANHO_BLOCO):
+        bloco_usuarios, bloco_periodos, bloco_solicitacoes = [], [], []
+        for usuario_id in range(inicio_bloco, min(inicio_bloco + TAMANHO_BLOCO, usuarios + 2)):
+            nome, sobrenome1, sobrenome2 = rng.choice(NOMES), rng.choice(SOBRENOMES), rng.choice(SOBRENOMES)
+            secao_id = rng.choices(range(1, secoes + 1), weights=pesos_secoes)[0] if secoes and rng.random() > 0.03 else None
+            if secao_id and secao_id not in chefes:
+                chefes[secao_id] = usuario_id
+            bloco_usuarios.append({
+                'id': usuario_id,
+                'nome_completo': f'{nome} {sobrenome1} {sobrenome2}',
+                'nome_guerra': sobrenome2,
+                'identidade': f'{semente:03d}{usuario_id:09d}',
+                'posto_grad': _sortear(rng, POSTOS),
+                'password_hash': password_hash,
+                'papel': PapelUsuario.MILITAR,
+                'secao_id': secao_id,
+            })
+            periodos, solicitacoes = _periodos_e_solicitacoes(rng, usuario_id, anos_referencia, hoje, proximo_periodo_id)
+            proximo_periodo_id += len(periodos)
+            bloco_periodos.extend(periodos)
+            bloco_solicitacoes.extend(solicitacoes)
+
+        db.session.execute(insert(Usuario), bloco_usuarios)
+        db.session.execute(insert(PeriodoAquisitivo), bloco_periodos)
+        if bloco_solicitacoes:
+            db.session.execute(insert(SolicitacaoFerias), bloco_solicitacoes)
+        totais['usuarios'] += len(bloco_usuarios)
+        totais['periodos'] += len(bloco_periodos)
+        totais['solicitacoes'] += len(bloco_solicitacoes)
+
+    for secao_id, usuario_id in chefes.items():
+        db.session.execute(update(Secao).where(Secao.id == secao_id).values(chefe_id=usuario_id))
+
+    incrementar(db.session.connection(), [CHAVE_USUARIOS, CHAVE_SECOES, CHAVE_MILITARES])
+    db.session.commit()
+    # Os INSERTs em massa não passam pelo flush do ORM: monta o resumo do dashboard de uma vez
+    recalcular()
+    return totais
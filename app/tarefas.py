@@ -0,0 +1,161 @@
+"""
+/Recursos-Humanos-Ferias/app/tarefas.py
+
+Fila de tarefas persistente (tabela tarefa) para trabalho lento que não deve atrasar a
+resposta da requisição, como o envio de notificações.
+
+A requisição apenas chama enfileirar(): a tarefa entra na mesma transação da alteração
+que a originou (um único INSERT, descartado em caso de rollback). O `flask worker`
+reserva tarefas em lotes, executa-as num pool de threads e, em caso de erro, agenda
+nova tentativa com espera exponencial. A entrega é "ao menos uma vez": uma tarefa
+interrompida no meio pode ser executada de novo.
+"""
+import json
+import logging
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update, delete
+from app import db
+from app.models import Tarefa, StatusTarefa
+
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima entre tentativas
+ESPERA_MAXIMA_S = 3600
+
+# Tipo de tarefa -> função que a executa (recebe o dicionário de dados)
+_executores = {}
+
+
+def tarefa(tipo):
+    """Decorador: registra a função que executa as tarefas de `tipo`."""
+    def decorator(f):
+        _executores[tipo] = f
+        return f
+    return decorator
+
+
+def _agora():
+    # Mesmo referencial de CURRENT_TIMESTAMP (UTC, sem fuso)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def enfileirar(tipo, **dados):
+    """Adiciona uma tarefa à sessão atual; é gravada no próximo flush/commit."""
+    nova = Tarefa(tipo=tipo, dados=json.dumps(dados, separators=(',', ':'), default=str), executar_em=_agora())
+    db.session.add(nova)
+    return nova
+
+
+def espera_da_tentativa(tentativas, base_s):
+    """Espera (s) antes da próxima tentativa: exponencial, com variação aleatória de até 10%."""
+    espera = min(ESPERA_MAXIMA_S, base_s * 2 ** (tentativas - 1))
+    return espera * random.uniform(1.0, 1.1)
+
+
+def liberar_travadas(timeout_s):
+    """Devolve à fila as tarefas reservadas há mais de `timeout_s` (worker interrompido)."""
+    resultado = db.session.execute(
+        update(Tarefa)
+        .where(Tarefa.status == StatusTarefa.EXECUTANDO, Tarefa.reservada_em < _agora() - timedelta(seconds=timeout_s))
+        .values(status=StatusTarefa.PENDENTE, reserva=None, reservada_em=None)
+    )
+    db.session.commit()
+    return resultado.rowcount
+
+
+def reservar_lote(quantidade):
+    """
+    Reserva até `quantidade` tarefas prontas para execução com um único UPDATE; o filtro
+    de status impede que dois workers reservem a mesma tarefa. Retorna [(id, tipo, dados, tentativas)].
+    """
+    reserva = uuid.uuid4().hex
+    agora = _agora()
+    proximas = select(Tarefa.id) \
+        .where(Tarefa.status == StatusTarefa.PENDENTE, Tarefa.executar_em <= agora) \
+        .order_by(Tarefa.executar_em, Tarefa.id).limit(quantidade)
+    db.session.execute(
+        update(Tarefa)
+        .where(Tarefa.id.in_(proximas.scalar_subquery()), Tarefa.status == StatusTarefa.PENDENTE)
+        .values(status=StatusTarefa.EXECUTANDO, reserva=reserva, reservada_em=agora)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return db.session.execute(
+        select(Tarefa.id, Tarefa.tipo, Tarefa.dados, Tarefa.tentativas)
+        .where(Tarefa.reserva == reserva, Tarefa.status == StatusTarefa.EXECUTANDO)
+    ).all()
+
+
+def _executar(app, tipo, dados):
+    with app.app_context():
+        executor = _executores.get(tipo)
+        if executor is None:
+            raise LookupError(f'Tipo de tarefa desconhecido: {tipo}')
+        executor(json.loads(dados))
+
+
+def processar_lote(app, pool, quantidade):
+    """Reserva e executa um lote. Retorna (concluidas, com_erro)."""
+    lote = reservar_lote(quantidade)
+    if not lote:
+        return 0, 0
+
+    futuros = [(item, pool.submit(_executar, app, item.tipo, item.dados)) for item in lote]
+    concluidas = []
+    erros = []
+    for item, futuro in futuros:
+        try:
+            futuro.result()
+        except Exception as e:
+            logger.warning('Tarefa %s (%s) falhou na tentativa %s: %s', item.id, item.tipo, item.tentativas + 1, e)
+            erros.append((item, f'{type(e).__name__}: {e}'))
+        else:
+            concluidas.append(item.id)
+
+    if concluidas:
+        db.session.execute(delete(Tarefa).where(Tarefa.id.in_(concluidas)).execution_options(synchronize_session=False))
+
+    maximo = app.config['TAREFAS_TENTATIVAS']
+    base_s = app.config['TAREFAS_ESPERA_S']
+    for item, erro in erros:
+        tentativas = item.tentativas + 1
+        valores = {'tentativas': tentativas, 'ultimo_erro': erro, 'reserva': None, 'reservada_em': None}
+        if tentativas >= maximo:
+            valores['status'] = StatusTarefa.FALHOU
+        else:
+            valores['status'] = StatusTarefa.PENDENTE
+            valores['executar_em'] = _agora() + timedelta(seconds=espera_da_tentativa(tentativas, base_s))
+        db.session.execute(update(Tarefa).where(Tarefa.id == item.id).values(**valores)
+                           .execution_options(synchronize_session=False))
+    db.session.commit()
+    return len(concluidas), len(erros)
+
+
+def executar_worker(app, threads=4, lote=20, intervalo=2.0, uma_vez=False):
+    """
+    Laço do worker: reserva lotes e os executa no pool de threads até ser interrompido
+    (Ctrl+C). Com `uma_vez`, para quando a fila de tarefas prontas esvazia.
+    Retorna os totais (concluidas, com_erro).
+    """
+    totais = [0, 0]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        try:
+            while True:
+                liberar_travadas(app.config['TAREFAS_TIMEOUT_S'])
+                concluidas, com_erro = processar_lote(app, pool, lote)
+                totais[0] += concluidas
+                totais[1] += com_erro
+                if concluidas or com_erro:
+                    continue
+                if uma_vez:
+                    break
+                db.session.remove()
+                time.sleep(intervalo)
+        except KeyboardInterrupt:
+            pass
+    return tuple(totais)
@@ -0,0 +1,110 @@
+"""
+/Recursos-Humanos-Ferias/app/versoes.py
+
+GET condicional (ETag / 304 Not Modified) para páginas que quase sempre são exibidas
+sem mudanças: o dashboard do militar e as listagens do gestor.
+
+Cada página depende de alguns contadores da tabela versao, incrementados na mesma
+transação de qualquer alteração nos dados exibidos (evento after_flush). O ETag é
+calculado a partir desses contadores com uma única consulta de chave primária; se o
+navegador já tiver a versão atual, a resposta é 304 sem consultar ou renderizar a página.
+Alterações feitas com UPDATE/INSERT em massa (fora do ORM) devem chamar incrementar().
+"""
+import hashlib
+import time
+from functools import wraps
+from flask import request, session, current_app, make_response
+from flask_login import current_user
+from sqlalchemy import event, select, update, insert
+from app import db
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, Versao
+
+
+CHAVE_USUARIOS = 'usuarios'
+CHAVE_SECOES = 'secoes'
+# Dados de todos os militares (ex.: abertura dos períodos aquisitivos do ano)
+CHAVE_MILITARES = 'militares'
+
+# Páginas autenticadas: só o navegador do usuário guarda, e sempre revalida
+CACHE_CONTROL = 'private, no-cache'
+
+
+def chave_militar(usuario_id):
+    return f'militar:{usuario_id}'
+
+
+def incrementar(conexao, chaves):
+    """Incrementa os contadores `chaves`, criando-os se necessário."""
+    for chave in sorted(set(chaves)):
+        resultado = conexao.execute(
+            update(Versao.__table__).where(Versao.chave == chave).values(valor=Versao.valor + 1)
+        )
+        if resultado.rowcount == 0:
+            conexao.execute(insert(Versao.__table__).values(chave=chave, valor=1))
+
+
+def incrementar_militar_do_periodo(conexao, periodo_id):
+    """Para alterações de saldo feitas com UPDATE direto em periodo_aquisitivo."""
+    usuario_id = conexao.execute(select(PeriodoAquisitivo.usuario_id).where(PeriodoAquisitivo.id == periodo_id)).scalar()
+    incrementar(conexao, [chave_militar(usuario_id)])
+
+
+@event.listens_for(db.session, 'after_flush')
+def _versionar(session, flush_context):
+    chaves = set()
+    for obj in session.new | session.dirty | session.deleted:
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, Usuario):
+            # A listagem de seções mostra o nome do chefe
+            chaves.update((CHAVE_USUARIOS, CHAVE_SECOES, chave_militar(obj.id)))
+        elif isinstance(obj, Secao):
+            # A listagem de militares mostra o nome da seção
+            chaves.update((CHAVE_SECOES, CHAVE_USUARIOS))
+        elif isinstance(obj, PeriodoAquisitivo):
+            chaves.add(chave_militar(obj.usuario_id))
+        elif isinstance(obj, SolicitacaoFerias):
+            chaves.add(chave_militar(obj.solicitante_id))
+    if chaves:
+        incrementar(session.connection(), chaves)
+
+
+def _calcular_etag(chaves):
+    # Consulta direta na conexão (Core): não passa pelo ORM
+    versoes = dict(db.session.connection().execute(
+        select(Versao.chave, Versao.valor).where(Versao.chave.in_(chaves))
+    ).all())
+    # A página contém o token CSRF dos formulários: o ETag muda junto com o token da sessão
+    # e, se o token expira, antes de a página em cache ficar com um token vencido.
+    limite_csrf = current_app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    janela_csrf = int(time.time() // max(1, limite_csrf // 2)) if limite_csrf else 0
+    partes = [request.full_path, str(current_user.get_id()), session.get('csrf_token', ''), str(janela_csrf)]
+    partes += [f'{chave}={versoes.get(chave, 0)}' for chave in sorted(chaves)]
+    return hashlib.sha1('|'.join(partes).encode()).hexdigest()
+
+
+def condicional(chaves):
+    """
+    Decorador de view: responde 304 quando o ETag enviado pelo navegador (If-None-Match)
+    ainda corresponde aos contadores retornados por `chaves(*args, **kwargs)`.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Mensagens flash pendentes fazem parte da página: não pode vir do cache
+            if request.method != 'GET' or '_flashes' in session:
+                resposta = make_response(f(*args, **kwargs))
+                resposta.headers['Cache-Control'] = CACHE_CONTROL
+                return resposta
+
+            etag = _calcular_etag(chaves(*args, **kwargs))
+            if etag in request.if_none_match:
+                resposta = current_app.response_class(status=304)
+            else:
+                resposta = make_response(f(*args, **kwargs))
+            resposta.set_etag(etag)
+            resposta.headers['Cache-Control'] = CACHE_CONTROL
+            return resposta
+        return decorated_function
+    return decorator
+
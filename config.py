@@ -12,6 +12,29 @@ basedir = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(basedir, '.env'))
 
 
+def _opcoes_do_engine(uri):
+    """Pool de conexões para bancos cliente/servidor (PostgreSQL); o SQLite usa o padrão."""
+    if not uri or uri.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),  # antes do timeout do servidor/firewall
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_pre_ping': True,  # descarta conexões derrubadas pelo servidor
+    }
+
+
+# PRAGMAs do SQLite aplicados a cada nova conexão (ver app/banco.py)
+PRAGMAS_SQLITE = {
+    'journal_mode': 'WAL',  # leitores não bloqueiam o escritor
+    'synchronous': 'NORMAL',  # seguro com WAL; evita um fsync por commit
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'foreign_keys': 'ON',
+}
+
+
 class Config:
     """Configurações base da aplicação."""
     # Chave secreta para proteger sessões e cookies.
@@ -20,3 +43,109 @@ class Config:
     # Configuração do SQLAlchemy
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _opcoes_do_engine(SQLALCHEMY_DATABASE_URI)
+    SQLITE_PRAGMAS = {}
+
+    # Réplica de leitura opcional (ver app/replica.py) e quanto ela pode estar atrasada:
+    # depois de uma escrita, o usuário lê do banco principal durante esse tempo
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {
+        'replica': {'url': DATABASE_REPLICA_URL, **_opcoes_do_engine(DATABASE_REPLICA_URL)}
+    } if DATABASE_REPLICA_URL else {}
+    REPLICA_ATRASO_S = float(os.environ.get('REPLICA_ATRASO_S', 5))
+
+    # Instrumentação SQL por requisição (cabeçalho Server-Timing e /gestor/metricas)
+    SQL_INSTRUMENTACAO = os.environ.get('SQL_INSTRUMENTACAO', '').lower() in ('1', 'true', 'sim')
+    SQL_CONSULTA_LENTA_MS = float(os.environ.get('SQL_CONSULTA_LENTA_MS', 200))
+    METRICAS_JANELA = int(os.environ.get('METRICAS_JANELA', 1000))
+
+    # Modo estrito de carregamento: relacionamentos não declarados nas listagens
+    # geram erro (raiseload) em vez de uma consulta por linha. Ligado em testes.
+    CARREGAMENTO_ESTRITO = os.environ.get('CARREGAMENTO_ESTRITO', '').lower() in ('1', 'true', 'sim')
+
+    # Limite de tentativas de login (ver app/limitador.py): fichas por identidade e por IP,
+    # repostas ao longo da janela, e bloqueio inicial / máximo após esgotá-las
+    LOGIN_LIMITE_ATIVO = os.environ.get('LOGIN_LIMITE_ATIVO', 'true').lower() in ('1', 'true', 'sim')
+    LOGIN_TENTATIVAS_IDENTIDADE = int(os.environ.get('LOGIN_TENTATIVAS_IDENTIDADE', 5))
+    LOGIN_JANELA_IDENTIDADE_S = int(os.environ.get('LOGIN_JANELA_IDENTIDADE_S', 300))
+    LOGIN_TENTATIVAS_IP = int(os.environ.get('LOGIN_TENTATIVAS_IP', 30))
+    LOGIN_JANELA_IP_S = int(os.environ.get('LOGIN_JANELA_IP_S', 60))
+    LOGIN_BLOQUEIO_S = int(os.environ.get('LOGIN_BLOQUEIO_S', 60))
+    LOGIN_BLOQUEIO_MAX_S = int(os.environ.get('LOGIN_BLOQUEIO_MAX_S', 3600))
+    LOGIN_LIMITE_MAX_CHAVES = int(os.environ.get('LOGIN_LIMITE_MAX_CHAVES', 100000))
+    LOGIN_LIMITE_REDIS_URL = os.environ.get('LOGIN_LIMITE_REDIS_URL')  # Opcional: baldes compartilhados entre processos
+
+    # Quantidade de registros por página nas listagens
+    ITENS_POR_PAGINA = int(os.environ.get('ITENS_POR_PAGINA', 50))
+
+    # API /api/v1 (ver app/api.py): registros por página e margem da sincronia, que deve
+    # ser maior que a duração da transação mais longa
+    API_LIMITE_PADRAO = int(os.environ.get('API_LIMITE_PADRAO', 500))
+    API_LIMITE_MAXIMO = int(os.environ.get('API_LIMITE_MAXIMO', 5000))
+    API_MARGEM_S = int(os.environ.get('API_MARGEM_S', 60))
+
+    # Máximo de militares de uma mesma seção ausentes no mesmo dia antes de
+    # solicitar_ferias exibir um aviso (0 desativa o aviso)
+    LIMITE_AUSENCIA_SECAO = int(os.environ.get('LIMITE_AUSENCIA_SECAO', 0))
+
+    # Cache do usuário da sessão (por processo). O TTL limita por quanto tempo um
+    # processo pode enxergar dados antigos quando a alteração foi feita em outro processo;
+    # o papel é sempre relido nas páginas do gestor (gestor_required).
+    CACHE_USUARIOS_MAX = int(os.environ.get('CACHE_USUARIOS_MAX', 1024))
+    CACHE_USUARIOS_TTL = int(os.environ.get('CACHE_USUARIOS_TTL', 300))
+
+    # Fila de tarefas em segundo plano (flask worker)
+    TAREFAS_TENTATIVAS = int(os.environ.get('TAREFAS_TENTATIVAS', 5))
+    TAREFAS_ESPERA_S = float(os.environ.get('TAREFAS_ESPERA_S', 30))  # dobra a cada nova tentativa
+    TAREFAS_TIMEOUT_S = int(os.environ.get('TAREFAS_TIMEOUT_S', 300))  # reserva abandonada volta à fila
+
+    # Notificações: 'smtp', 'arquivo' ou 'nenhum'
+    NOTIFICACOES_BACKEND = os.environ.get('NOTIFICACOES_BACKEND', 'smtp')
+    NOTIFICACOES_ARQUIVO = os.environ.get('NOTIFICACOES_ARQUIVO', os.path.join(basedir, 'notificacoes.log'))
+    EMAIL_FORMATO = os.environ.get('EMAIL_FORMATO', '{identidade}@localhost')
+    EMAIL_REMETENTE = os.environ.get('EMAIL_REMETENTE', 'ferias@localhost')
+    SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT', 8025))
+    SMTP_USUARIO = os.environ.get('SMTP_USUARIO')
+    SMTP_SENHA = os.environ.get('SMTP_SENHA')
+    SMTP_TLS = os.environ.get('SMTP_TLS', '').lower() in ('1', 'true', 'sim')
+
+
+class DevelopmentConfig(Config):
+    """Desenvolvimento local (padrão)."""
+    DEBUG = True
+    SQLITE_PRAGMAS = PRAGMAS_SQLITE
+    NOTIFICACOES_BACKEND = os.environ.get('NOTIFICACOES_BACKEND', 'arquivo')
+
+
+class TestingConfig(Config):
+    """Testes: banco em memória, sem CSRF e com carregamento estrito."""
+    TESTING = True
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'teste')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+    SQLALCHEMY_ENGINE_OPTIONS = _opcoes_do_engine(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = {}
+    SQLITE_PRAGMAS = {'foreign_keys': 'ON', 'busy_timeout': PRAGMAS_SQLITE['busy_timeout']}
+    WTF_CSRF_ENABLED = False
+    CARREGAMENTO_ESTRITO = True
+    NOTIFICACOES_BACKEND = 'nenhum'
+
+
+class ProductionConfig(Config):
+    """Produção: pool dimensionado (PostgreSQL) ou SQLite em modo WAL."""
+    SQLITE_PRAGMAS = PRAGMAS_SQLITE
+
+
+perfis = {
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+}
+
+
+def perfil_ativo():
+    """Classe de configuração escolhida pela variável de ambiente FLASK_CONFIG (padrão: development)."""
+    nome = os.environ.get('FLASK_CONFIG', 'development')
+    if nome not in perfis:
+        raise ValueError(f"FLASK_CONFIG inválido: {nome!r} (use {', '.join(perfis)})")
+    return perfis[nome]
@@ -97,6 +97,12 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            # O modo batch recria tabelas (DROP + RENAME): com as chaves estrangeiras ativas
+            # (PRAGMA da aplicação, ver app/banco.py) o DROP de uma tabela referenciada falha.
+            # O PRAGMA não tem efeito dentro de uma transação, por isso vem antes dela.
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
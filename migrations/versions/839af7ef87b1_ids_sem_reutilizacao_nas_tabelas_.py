@@ -0,0 +1,40 @@
+"""Ids sem reutilizacao nas tabelas arquivadas
+
+Revision ID: 839af7ef87b1
+Revises: dc7ea7b6e0bf
+Create Date: 2026-10-18 12:36:19.448580
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '839af7ef87b1'
+down_revision = 'dc7ea7b6e0bf'
+branch_labels = None
+depends_on = None
+
+# Tabela principal -> tabela de arquivo
+TABELAS = (('periodo_aquisitivo', 'periodo_aquisitivo_arquivo'), ('solicitacao_ferias', 'solicitacao_ferias_arquivo'))
+
+
+def upgrade():
+    # As sequências do PostgreSQL nunca reutilizam valores: só o SQLite precisa do AUTOINCREMENT
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for tabela, arquivo in TABELAS:
+        with op.batch_alter_table(tabela, recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        # O próximo id fica acima de todos os já usados, inclusive os que foram arquivados
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{tabela}'")
+        op.execute(f"INSERT INTO sqlite_sequence (name, seq) SELECT '{tabela}', "
+                   f"max(coalesce((SELECT max(id) FROM {tabela}), 0), coalesce((SELECT max(id) FROM {arquivo}), 0))")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for tabela, _ in reversed(TABELAS):
+        with op.batch_alter_table(tabela, recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
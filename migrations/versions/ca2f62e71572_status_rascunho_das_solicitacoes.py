@@ -0,0 +1,27 @@
+"""Status rascunho das solicitacoes
+
+Revision ID: ca2f62e71572
+Revises: 882a767c6285
+Create Date: 2026-10-18 12:16:12.604772
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ca2f62e71572'
+down_revision = '882a767c6285'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite guarda o Enum como VARCHAR sem restrição: só o tipo nativo do PostgreSQL precisa do novo valor
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TYPE statusferias ADD VALUE IF NOT EXISTS 'RASCUNHO'")
+
+
+def downgrade():
+    # O PostgreSQL não remove valores de um tipo enum; basta descartar os rascunhos
+    op.execute("DELETE FROM solicitacao_ferias WHERE status = 'RASCUNHO'")
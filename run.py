@@ -32,4 +32,5 @@ def create_user(nome):
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Servidor de desenvolvimento (debug apenas no perfil development); em produção use `flask serve`
+    app.run(debug=app.config['DEBUG'])
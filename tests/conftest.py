@@ -0,0 +1,44 @@
+"""
+/Recursos-Humanos-Ferias/tests/conftest.py
+
+Fixtures dos testes: cada teste usa uma aplicação nova (perfil de testes) sobre um banco
+SQLite em arquivo temporário, para que threads e conexões diferentes vejam os mesmos dados.
+"""
+import pytest
+from config import TestingConfig
+from app import create_app, db
+
+
+SENHA = 'teste'
+
+
+@pytest.fixture
+def app(tmp_path):
+    from app.cache import usuarios_cache
+    from app.opcoes import invalidar_opcoes
+    from app.busca import indice_usuarios, indice_secoes
+
+    class ConfigTeste(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'teste.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    # Caches por processo: não podem levar dados de um teste para o outro
+    usuarios_cache.invalidar()
+    invalidar_opcoes()
+    indice_usuarios.invalidar()
+    indice_secoes.invalidar()
+
+    app = create_app(ConfigTeste)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def dados(app):
+    """Poucos militares sintéticos (todos com a senha SENHA)."""
+    from app.sintetico import gerar_dados
+
+    gerar_dados(secoes=2, usuarios=20, semente=1, senha=SENHA)
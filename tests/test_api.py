@@ -0,0 +1,32 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_api.py
+"""
+import pytest
+from app.api import criar_token
+from app.paginacao import codificar_cursor
+
+
+@pytest.fixture
+def cliente(app, dados):
+    cliente = app.test_client()
+    cliente.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {criar_token("testes")}'
+    return cliente
+
+
+def test_paginas_por_cursor_cobrem_todos_os_registros(cliente):
+    ids, cursor = [], None
+    while True:
+        resposta = cliente.get('/api/v1/usuarios', query_string={'campos': 'id', 'limite': 7, 'depois': cursor or ''})
+        assert resposta.status_code == 200
+        ids += [linha['id'] for linha in resposta.json['dados']]
+        cursor = resposta.json['proxima']
+        if cursor is None:
+            break
+    assert ids == sorted(set(ids)) and len(ids) > 7
+
+
+@pytest.mark.parametrize('valores', [['abc'], [None], [[1]], [{'id': 1}], [1, 2]])
+def test_cursor_invalido_responde_400(cliente, valores):
+    resposta = cliente.get('/api/v1/usuarios', query_string={'depois': codificar_cursor(valores)})
+    assert resposta.status_code == 400
+    assert resposta.json == {'erro': 'Cursor inválido'}
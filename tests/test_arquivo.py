@@ -0,0 +1,86 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_arquivo.py
+"""
+from datetime import date
+from sqlalchemy import select, insert
+from app import db
+from app.arquivo import arquivar
+from app.models import (Usuario, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias,
+                        SolicitacaoFeriasArquivo, PeriodoAquisitivoArquivo)
+
+
+def _militar():
+    militar = Usuario(nome_completo='Militar de Teste', nome_guerra='Teste', identidade='T001', posto_grad='Sd')
+    militar.set_password('teste')
+    db.session.add(militar)
+    db.session.flush()
+    return militar
+
+
+def _periodo(militar, ano, saldo):
+    periodo = PeriodoAquisitivo(usuario=militar, ano_referencia=ano, data_inicio_periodo=date(ano, 1, 1),
+                                data_fim_periodo=date(ano, 12, 31), dias_saldo=saldo)
+    db.session.add(periodo)
+    db.session.flush()
+    return periodo
+
+
+def _solicitacao(militar, periodo, ano, status):
+    solicitacao = SolicitacaoFerias(solicitante=militar, periodo_aquisitivo=periodo, data_inicio=date(ano, 3, 1),
+                                    data_fim=date(ano, 3, 10), dias_solicitados=10, tipo_solicitacao='10_DIAS',
+                                    status=status)
+    db.session.add(solicitacao)
+    db.session.flush()
+    return solicitacao
+
+
+def _ids_arquivados(modelo):
+    return set(db.session.scalars(select(modelo.id)))
+
+
+def test_ids_arquivados_nao_sao_reutilizados(app):
+    militar = _militar()
+    atual = _periodo(militar, 2030, 30)
+    antigo = _periodo(militar, 2019, 0)  # Maior id de período: será arquivado
+    _solicitacao(militar, antigo, 2019, StatusFerias.APROVADA_GESTOR)
+    ultima_cancelada = [_solicitacao(militar, atual, 2019, StatusFerias.CANCELADA) for _ in range(2)][-1].id
+    antigo_id = antigo.id
+    db.session.commit()
+
+    movidas = arquivar(antes_de=2021)
+    assert (movidas['periodos'], movidas['solicitacoes']) == (1, 3)
+
+    # Novos registros não recebem os ids que foram para o arquivo
+    novo_periodo = _periodo(militar, 2018, 0)
+    nova = _solicitacao(militar, atual, 2019, StatusFerias.REPROVADA)
+    nova_id = nova.id
+    db.session.commit()
+    assert novo_periodo.id > antigo_id
+    assert nova.id > ultima_cancelada
+    assert nova.id not in _ids_arquivados(SolicitacaoFeriasArquivo)
+    assert novo_periodo.id not in _ids_arquivados(PeriodoAquisitivoArquivo)
+
+    movidas = arquivar(antes_de=2021)
+    assert (movidas['periodos'], movidas['solicitacoes']) == (1, 1)
+    assert movidas['ja_arquivados'] == {'periodos': [], 'solicitacoes': []}
+    assert nova_id in _ids_arquivados(SolicitacaoFeriasArquivo)
+
+
+def test_id_ja_arquivado_e_informado_sem_interromper_o_lote(app):
+    militar = _militar()
+    atual = _periodo(militar, 2030, 30)
+    repetida, outra = [_solicitacao(militar, atual, 2019, StatusFerias.CANCELADA).id for _ in range(2)]
+    db.session.commit()
+    # Id reutilizado (banco anterior ao AUTOINCREMENT): a linha já existe no arquivo
+    db.session.execute(insert(SolicitacaoFeriasArquivo).values(
+        id=repetida, solicitante_id=militar.id, periodo_aquisitivo_id=atual.id, data_inicio=date(2018, 1, 1),
+        data_fim=date(2018, 1, 10), dias_solicitados=10, status=StatusFerias.CANCELADA,
+    ))
+    db.session.commit()
+
+    movidas = arquivar(antes_de=2021)
+
+    assert movidas['solicitacoes'] == 1
+    assert movidas['ja_arquivados']['solicitacoes'] == [repetida]
+    assert db.session.get(SolicitacaoFerias, repetida) is not None
+    assert outra in _ids_arquivados(SolicitacaoFeriasArquivo)
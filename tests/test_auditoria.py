@@ -0,0 +1,59 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_auditoria.py
+
+Os caminhos em massa (INSERT ... SELECT, UPDATE condicional, UPDATE ... CASE) não passam
+pelo after_flush: cada um precisa registrar os próprios eventos. Se algum deixar de
+registrar, o saldo reconstruído a partir da trilha diverge do saldo atual.
+"""
+from datetime import date
+from sqlalchemy import select
+from app import db
+from app.auditoria import historico, reconstruir_saldos, SOLICITACAO, PERIODO, INCLUSAO, ALTERACAO
+from app.avaliacao import avaliar_em_lote
+from app.models import Usuario, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias
+from app.saldo import reservar_saldo
+
+
+ANO = 2020
+
+
+def _solicitar(militar_id, dias):
+    periodo_id = reservar_saldo(militar_id, dias)
+    solicitacao = SolicitacaoFerias(solicitante_id=militar_id, periodo_aquisitivo_id=periodo_id,
+                                    data_inicio=date(ANO + 1, 3, 1), data_fim=date(ANO + 1, 3, dias),
+                                    dias_solicitados=dias, tipo_solicitacao='10_DIAS', status=StatusFerias.SOLICITADA)
+    db.session.add(solicitacao)
+    db.session.commit()
+    return solicitacao.id
+
+
+def test_trilha_reconstroi_saldos_apos_operacoes_em_massa(app):
+    for n in range(3):
+        militar = Usuario(nome_completo=f'Militar {n}', nome_guerra=f'M{n}', identidade=f'T00{n}', posto_grad='Sd')
+        militar.set_password('teste')
+        db.session.add(militar)
+    db.session.commit()
+    militares = db.session.scalars(select(Usuario.id).order_by(Usuario.id)).all()
+
+    resultado = app.test_cli_runner().invoke(args=['gerar-periodos', '--ano', str(ANO)])
+    assert resultado.exit_code == 0, resultado.output
+
+    aprovada, *reprovadas = [_solicitar(militar_id, 10) for militar_id in militares]
+    assert avaliar_em_lote([aprovada], StatusFerias.APROVADA_CHEFE) == ([aprovada], [])
+    assert avaliar_em_lote(reprovadas, StatusFerias.REPROVADA, justificativa='Serviço') == (reprovadas, [])
+    db.session.commit()
+
+    divergencias, sem_historico, conferidos = reconstruir_saldos()
+    assert divergencias == []
+    assert sem_historico == 0 and conferidos == len(militares)
+    saldos = dict(db.session.execute(select(PeriodoAquisitivo.usuario_id, PeriodoAquisitivo.dias_saldo)).all())
+    assert saldos == {militares[0]: 20, militares[1]: 30, militares[2]: 30}
+
+    transicoes = [(e.acao, dados.get('status')) for e, dados in historico(SOLICITACAO, reprovadas[0])]
+    assert transicoes == [(INCLUSAO, 'SOLICITADA'), (ALTERACAO, ['SOLICITADA', 'REPROVADA'])]
+    transicoes = [(e.acao, dados.get('status')) for e, dados in historico(SOLICITACAO, aprovada)]
+    assert transicoes == [(INCLUSAO, 'SOLICITADA'), (ALTERACAO, ['SOLICITADA', 'APROVADA_CHEFE'])]
+
+    periodo_id = db.session.scalar(select(PeriodoAquisitivo.id).where(PeriodoAquisitivo.usuario_id == militares[1]))
+    saldo = [(e.acao, dados['dias_saldo']) for e, dados in historico(PERIODO, periodo_id)]
+    assert saldo == [(INCLUSAO, 30), (ALTERACAO, -10), (ALTERACAO, 10)]
@@ -0,0 +1,22 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_busca.py
+"""
+from sqlalchemy import select
+from app import db
+from app.busca import indice_usuarios, indice_secoes, opcao_selecionada
+from app.models import Usuario, Secao
+
+
+def test_opcao_selecionada_nao_reconstroi_o_indice(app, dados):
+    usuario = db.session.scalar(select(Usuario).order_by(Usuario.id))
+    secao = db.session.scalar(select(Secao).order_by(Secao.id))
+
+    opcoes = opcao_selecionada(indice_usuarios, usuario.id, (0, 'Nenhum'))
+    assert opcoes == [(0, 'Nenhum'), (usuario.id, f'{usuario.posto_grad} {usuario.nome_guerra} - '
+                                                  f'{usuario.nome_completo} ({usuario.identidade})')]
+    assert opcao_selecionada(indice_secoes, secao.id, (0, 'Nenhuma')) == [(0, 'Nenhuma'), (secao.id, secao.nome)]
+    assert opcao_selecionada(indice_secoes, 10 ** 6, (0, 'Nenhuma')) == [(0, 'Nenhuma')]
+    assert indice_usuarios._snapshot is None and indice_secoes._snapshot is None
+
+    # A busca continua usando o índice completo
+    assert (usuario.id, opcoes[1][1]) in indice_usuarios.buscar(usuario.identidade)
@@ -0,0 +1,66 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_cache.py
+"""
+from sqlalchemy import event, update
+from app import db
+from app.cache import carregar_usuario
+from app.models import Usuario, PapelUsuario
+from app.sintetico import IDENTIDADE_GESTOR
+from conftest import SENHA
+
+
+def _militar():
+    militar = Usuario(nome_completo='Militar de Teste', nome_guerra='Teste', identidade='T001', posto_grad='Sd')
+    militar.set_password('teste')
+    db.session.add(militar)
+    db.session.commit()
+    return militar.id
+
+
+def _carregar(user_id):
+    usuario = carregar_usuario(user_id)
+    papel = usuario.papel
+    db.session.remove()  # Nova requisição
+    return papel
+
+
+def test_usuario_em_cache_nao_executa_sql(app):
+    user_id = _militar()
+    _carregar(user_id)
+
+    comandos = []
+
+    def contar_sql(conexao, cursor, sql, *args):
+        comandos.append(sql)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', contar_sql)
+    try:
+        assert _carregar(user_id) == PapelUsuario.MILITAR
+    finally:
+        event.remove(engine, 'before_cursor_execute', contar_sql)
+    assert comandos == []
+
+
+def test_alteracao_confirmada_no_processo_descarta_o_cache(app):
+    user_id = _militar()
+    assert _carregar(user_id) == PapelUsuario.MILITAR
+
+    db.session.get(Usuario, user_id).papel = PapelUsuario.GESTOR
+    db.session.commit()
+    db.session.remove()
+
+    assert _carregar(user_id) == PapelUsuario.GESTOR
+
+
+def test_gestor_rebaixado_em_outro_processo_perde_o_acesso(app, dados):
+    cliente = app.test_client()
+    cliente.post('/login', data={'identidade': IDENTIDADE_GESTOR, 'password': SENHA})
+    assert cliente.get('/gestor/dashboard').status_code == 200
+
+    # Outro worker: altera o papel sem a invalidação do cache deste processo
+    with db.engine.begin() as conexao:
+        conexao.execute(update(Usuario.__table__).where(Usuario.identidade == IDENTIDADE_GESTOR)
+                        .values(papel=PapelUsuario.MILITAR))
+
+    assert cliente.get('/gestor/dashboard').status_code == 403
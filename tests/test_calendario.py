@@ -0,0 +1,32 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_calendario.py
+"""
+from datetime import date
+from app.calendario import Intervalo, calcular_calendario
+
+
+def _dia(d):
+    return date(2025, 3, d)
+
+
+def test_militar_com_solicitacoes_sobrepostas_conta_uma_vez():
+    intervalos = [
+        Intervalo(1, 10, _dia(1), _dia(10)),
+        Intervalo(2, 10, _dia(5), _dia(6)),    # Contida na anterior, mesmo militar
+        Intervalo(3, 10, _dia(8), _dia(12)),   # Estende a anterior, mesmo militar
+        Intervalo(4, 20, _dia(6), _dia(9)),
+    ]
+    calendario = calcular_calendario(intervalos, _dia(1), _dia(14))
+
+    assert calendario.ausentes_por_dia == [1, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 0, 0]
+    assert calendario.pico == 2
+    assert calendario.dias_pico == [_dia(6), _dia(7), _dia(8), _dia(9)]
+    assert sorted((a.id, b.id) for a, b in calendario.sobreposicoes) == [(1, 4), (2, 4), (4, 3)]
+
+
+def test_intervalos_fora_da_janela_sao_recortados():
+    intervalos = [Intervalo(1, 10, _dia(1), _dia(3)), Intervalo(2, 10, _dia(2), _dia(20))]
+    calendario = calcular_calendario(intervalos, _dia(2), _dia(5))
+
+    assert calendario.ausentes_por_dia == [1, 1, 1, 1]
+    assert calendario.sobreposicoes == []
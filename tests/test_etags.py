@@ -0,0 +1,68 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_etags.py
+
+Cada página repetida com o ETag recebido deve ser 304 sem nenhuma consulta do ORM, e
+voltar a ser 200 depois de uma alteração dos dados exibidos.
+"""
+import pytest
+from sqlalchemy import event, select
+from app import db
+from app.models import Usuario, Secao
+from app.sintetico import IDENTIDADE_GESTOR
+from conftest import SENHA
+
+
+def _alterar_militar(militar_id):
+    usuario = db.session.get(Usuario, militar_id)
+    usuario.posto_grad = 'Cb' if usuario.posto_grad != 'Cb' else 'Sd'
+
+
+def _alterar_secao(militar_id):
+    secao = db.session.scalar(select(Secao).order_by(Secao.id))
+    secao.nome = f'{secao.nome} (alterada)'
+
+
+@pytest.fixture
+def contagem(app):
+    contagem = {'orm': 0, 'sql': 0}
+
+    def contar_orm(estado):
+        contagem['orm'] += 1
+
+    def contar_sql(*args):
+        contagem['sql'] += 1
+
+    engine = db.engine
+    event.listen(db.session, 'do_orm_execute', contar_orm)
+    event.listen(engine, 'before_cursor_execute', contar_sql)
+    yield contagem
+    event.remove(db.session, 'do_orm_execute', contar_orm)
+    event.remove(engine, 'before_cursor_execute', contar_sql)
+
+
+@pytest.mark.parametrize('papel, url, alterar', [
+    ('militar', '/militar/dashboard', _alterar_militar),
+    ('gestor', '/gestor/usuarios', _alterar_militar),
+    ('gestor', '/gestor/secoes', _alterar_secao),
+])
+def test_pagina_repetida_responde_304_sem_consultas_do_orm(app, dados, contagem, papel, url, alterar):
+    militar = db.session.scalar(select(Usuario).where(Usuario.secao_id.is_not(None)).order_by(Usuario.id.desc()))
+    militar_id = militar.id
+    identidade = IDENTIDADE_GESTOR if papel == 'gestor' else militar.identidade
+    db.session.remove()
+
+    cliente = app.test_client()
+    cliente.post('/login', data={'identidade': identidade, 'password': SENHA})
+    cliente.get(url)  # Consome mensagens flash (ex.: do login)
+    etag = cliente.get(url).headers.get('ETag', '').strip('"')
+    assert etag
+
+    contagem.update(orm=0, sql=0)
+    repetida = cliente.get(url, headers={'If-None-Match': f'"{etag}"'})
+    assert repetida.status_code == 304
+    assert contagem['orm'] == 0
+
+    alterar(militar_id)
+    db.session.commit()
+    apos_alteracao = cliente.get(url, headers={'If-None-Match': f'"{etag}"'})
+    assert apos_alteracao.status_code == 200
@@ -0,0 +1,56 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_importacao.py
+"""
+import io
+import pytest
+from sqlalchemy import select
+from app import db
+from app.importacao import importar_usuarios
+from app.models import Usuario, Secao, PapelUsuario
+
+
+CSV = """nome_completo,nome_guerra,identidade,posto_grad,senha,secao,papel
+Ana Souza,Souza,I001,Sd,senha-1,Seção A,
+Bruno Lima,Lima,E001,Cb,senha-2,,
+Carla Dias,Dias,I001,Sd,senha-3,,
+Davi Rocha,,I002,Sd,senha-4,,
+Eva Melo,Melo,I003,Sd,senha-5,Seção Inexistente,
+Fábio Reis,Reis,I004,Sd,senha-6,,chefe
+Gil Nunes,Nunes,I005,Cap,senha-7,Seção A,gestor
+"""
+
+
+def test_importacao_em_lotes_com_erros_por_linha(app):
+    secao = Secao(nome='Seção A')
+    existente = Usuario(nome_completo='Já Cadastrado', nome_guerra='Cadastrado', identidade='E001', posto_grad='Sd')
+    existente.set_password('antiga')
+    db.session.add_all([secao, existente])
+    db.session.commit()
+
+    relatorio = importar_usuarios(io.StringIO(CSV), tamanho_lote=3, processos=2)
+
+    assert relatorio == [
+        {'lote': 1, 'linhas': 3, 'inseridos': 1, 'erros': [(3, 'identidade E001 já cadastrada'),
+                                                           (4, 'identidade I001 já cadastrada')]},
+        {'lote': 2, 'linhas': 3, 'inseridos': 0, 'erros': [(5, 'campos vazios: nome_guerra'),
+                                                           (6, "seção 'Seção Inexistente' não encontrada"),
+                                                           (7, "papel 'CHEFE' inválido")]},
+        {'lote': 3, 'linhas': 1, 'inseridos': 1, 'erros': []},
+    ]
+
+    usuarios = {u.identidade: u for u in db.session.scalars(select(Usuario))}
+    assert set(usuarios) == {'E001', 'I001', 'I005'}
+    assert usuarios['I001'].nome_completo == 'Ana Souza' and usuarios['I001'].secao_id == secao.id
+    assert usuarios['I001'].papel == PapelUsuario.MILITAR
+    assert usuarios['I005'].papel == PapelUsuario.GESTOR
+
+    # Senhas gravadas como hash, verificáveis pelo login
+    assert usuarios['I001'].password_hash != 'senha-1'
+    assert usuarios['I001'].check_password('senha-1') and not usuarios['I001'].check_password('senha-3')
+    assert usuarios['I005'].check_password('senha-7')
+    assert usuarios['E001'].check_password('antiga')
+
+
+def test_colunas_obrigatorias_ausentes(app):
+    with pytest.raises(ValueError, match='senha'):
+        importar_usuarios(io.StringIO('nome_completo,nome_guerra,identidade,posto_grad\nA,B,C,D\n'))
@@ -0,0 +1,81 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_instrumentacao.py
+"""
+import threading
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from config import TestingConfig
+from app import create_app, db
+from app import instrumentacao
+
+
+@pytest.fixture
+def app_instrumentada(tmp_path):
+    class ConfigInstrumentada(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'instrumentacao.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        SQL_INSTRUMENTACAO = True
+
+    app = create_app(ConfigInstrumentada)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_consulta_com_erro_nao_afeta_a_medicao_seguinte(app_instrumentada):
+    with app_instrumentada.test_request_context('/'):
+        instrumentacao._iniciar_requisicao()
+        with db.engine.connect() as conexao:
+            with pytest.raises(OperationalError):
+                conexao.execute(text('SELECT * FROM tabela_inexistente'))
+            conexao.rollback()
+            assert conexao.execute(text('SELECT 1')).scalar() == 1
+        from flask import g
+        assert g.sql_consultas == 1
+
+
+def test_metricas_lidas_enquanto_outras_threads_registram(app_instrumentada):
+    instrumentacao._metricas.clear()
+    parar = threading.Event()
+    erros = []
+
+    def registrar():
+        while not parar.is_set():
+            with app_instrumentada.test_request_context('/teste'):
+                instrumentacao._iniciar_requisicao()
+                instrumentacao._finalizar_requisicao(app_instrumentada.response_class())
+
+    threads = [threading.Thread(target=registrar) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(200):
+            try:
+                instrumentacao.metricas_por_endpoint()
+            except RuntimeError as e:  # deque mutated during iteration
+                erros.append(e)
+    finally:
+        parar.set()
+        for thread in threads:
+            thread.join()
+
+    assert not erros
+    assert instrumentacao.metricas_por_endpoint()['test_page']['requisicoes'] > 0
+
+
+def test_consultas_mais_lentas_por_endpoint(app_instrumentada):
+    instrumentacao._metricas.clear()
+    with app_instrumentada.test_request_context('/rota-inexistente'):
+        instrumentacao._iniciar_requisicao()
+        with db.engine.connect() as conexao:
+            for n in range(instrumentacao.MAIS_LENTAS + 3):
+                conexao.execute(text(f'SELECT {n}'))
+        instrumentacao._finalizar_requisicao(app_instrumentada.response_class())
+
+    lentas = instrumentacao.metricas_por_endpoint()['desconhecido']['mais_lentas']
+    assert len(lentas) == instrumentacao.MAIS_LENTAS
+    assert all(comando['sql'].startswith('SELECT ') for comando in lentas)
+    assert [c['ms'] for c in lentas] == sorted((c['ms'] for c in lentas), reverse=True)
@@ -0,0 +1,40 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_limitador.py
+"""
+from sqlalchemy import event
+from app import db
+from app.models import Usuario
+from app.sintetico import IDENTIDADE_GESTOR
+
+
+def test_login_rejeitado_pelo_limite_nao_consulta_o_banco_nem_calcula_o_hash(app, dados, monkeypatch):
+    chamadas = {'check_password': 0, 'sql': 0}
+    check_password = Usuario.check_password
+
+    def contar_check_password(self, senha):
+        chamadas['check_password'] += 1
+        return check_password(self, senha)
+
+    def contar_sql(*args):
+        chamadas['sql'] += 1
+
+    monkeypatch.setattr(Usuario, 'check_password', contar_check_password)
+    cliente = app.test_client()
+    tentativa = {'identidade': IDENTIDADE_GESTOR, 'password': 'errada'}
+
+    for _ in range(app.config['LOGIN_TENTATIVAS_IDENTIDADE']):
+        resposta = cliente.post('/login', data=tentativa)
+        assert resposta.status_code == 302 and resposta.location.endswith('/login')  # Senha inválida
+    assert chamadas['check_password'] == app.config['LOGIN_TENTATIVAS_IDENTIDADE']
+
+    chamadas.update(check_password=0, sql=0)
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', contar_sql)
+    try:
+        resposta = cliente.post('/login', data=tentativa)
+    finally:
+        event.remove(engine, 'before_cursor_execute', contar_sql)
+
+    assert resposta.status_code == 429
+    assert int(resposta.headers['Retry-After']) > 0
+    assert chamadas == {'check_password': 0, 'sql': 0}
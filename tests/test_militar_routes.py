@@ -0,0 +1,50 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_militar_routes.py
+"""
+from datetime import date, timedelta
+import pytest
+from app import db
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias
+
+
+INICIO = date.today() + timedelta(days=30)
+
+
+def _militar(secao, identidade):
+    militar = Usuario(nome_completo=f'Militar {identidade}', nome_guerra=identidade, identidade=identidade,
+                      posto_grad='Sd', secao=secao)
+    militar.set_password('teste')
+    periodo = PeriodoAquisitivo(usuario=militar, ano_referencia=2020, data_inicio_periodo=date(2020, 1, 1),
+                                data_fim_periodo=date(2020, 12, 31), dias_saldo=30)
+    db.session.add_all([militar, periodo])
+    return militar, periodo
+
+
+@pytest.fixture
+def secao(app):
+    app.config['LIMITE_AUSENCIA_SECAO'] = 1
+    secao = Secao(nome='Seção de Teste')
+    militar, periodo = _militar(secao, 'A001')
+    _militar(secao, 'B001')
+    db.session.add(SolicitacaoFerias(solicitante=militar, periodo_aquisitivo=periodo, data_inicio=INICIO,
+                                     data_fim=INICIO + timedelta(days=9), dias_solicitados=10,
+                                     tipo_solicitacao='10_DIAS', status=StatusFerias.SOLICITADA))
+    db.session.commit()
+    db.session.remove()
+
+
+def _solicitar(app, identidade):
+    cliente = app.test_client()
+    cliente.post('/login', data={'identidade': identidade, 'password': 'teste'})
+    resposta = cliente.post('/militar/solicitar', data={'tipo_solicitacao': '10_DIAS', 'data_inicio': INICIO.isoformat()},
+                            follow_redirects=True)
+    assert 'enviada com sucesso' in resposta.get_data(as_text=True)
+    return resposta.get_data(as_text=True)
+
+
+def test_solicitacao_sobreposta_a_outra_do_mesmo_militar_nao_gera_aviso(app, secao):
+    assert 'Atenção' not in _solicitar(app, 'A001')
+
+
+def test_solicitacao_sobreposta_a_de_outro_militar_gera_aviso(app, secao):
+    assert '2 militares da sua seção' in _solicitar(app, 'B001')
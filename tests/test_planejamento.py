@@ -0,0 +1,110 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_planejamento.py
+"""
+import random
+from collections import Counter
+from datetime import date
+import pytest
+from sqlalchemy import select, func
+from app import db
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias
+from app.planejamento import Bloco, dividir_saldo, planejar, planejar_secao, gravar_rascunhos, _melhor_inicio
+
+
+@pytest.mark.parametrize('saldo, blocos', [
+    (0, []), (9, []), (10, [10]), (15, [15]), (20, [10, 10]), (25, [15, 10]), (30, [30]),
+    (45, [30, 15]), (55, [30, 15, 10]), (60, [30, 30]),
+])
+def test_dividir_saldo(saldo, blocos):
+    assert dividir_saldo(saldo) == blocos
+
+
+def test_melhor_inicio_igual_a_busca_exaustiva():
+    rng = random.Random(1)
+    for _ in range(200):
+        folga = [rng.randint(0, 3) for _ in range(rng.randint(1, 40))]
+        ocupado = {d for d in range(len(folga)) if rng.random() < 0.1}
+        dias = rng.randint(1, 12)
+        valores = [0 if d in ocupado else f for d, f in enumerate(folga)]
+        candidatos = [(min(valores[i:i + dias]), -i) for i in range(len(folga) - dias + 1)]
+        melhor = max(candidatos, default=(0, 0))
+        assert _melhor_inicio(folga, ocupado, dias) == (-melhor[1] if melhor[0] > 0 else None)
+
+
+def _cenario(semente, total_dias=120, militares=8, maximo_ausentes=2):
+    """Ausências já existentes (sem ultrapassar o máximo) e blocos a posicionar."""
+    rng = random.Random(semente)
+    ausentes_por_dia = [0] * total_dias
+    ocupados = {}
+    for usuario_id in range(militares):
+        inicio, dias = rng.randrange(total_dias - 10), 10
+        if rng.random() < 0.5 and all(ausentes_por_dia[d] < maximo_ausentes for d in range(inicio, inicio + dias)):
+            ocupados[usuario_id] = set(range(inicio, inicio + dias))
+            for d in ocupados[usuario_id]:
+                ausentes_por_dia[d] += 1
+    blocos = [Bloco(usuario_id, usuario_id, dias)
+              for usuario_id in range(militares) for dias in dividir_saldo(rng.choice((10, 25, 30, 40)))]
+    return blocos, ausentes_por_dia, ocupados
+
+
+@pytest.mark.parametrize('semente', range(5))
+def test_planejar_respeita_maximo_e_ausencias_do_militar(semente):
+    maximo_ausentes = 2
+    blocos, ausentes_iniciais, ocupados = _cenario(semente, maximo_ausentes=maximo_ausentes)
+    alocados, nao_alocados, ausentes_por_dia, _ = planejar(
+        blocos, ausentes_iniciais, maximo_ausentes, ocupados, tempo_limite=0.2, semente=semente
+    )
+
+    assert sorted(map(id, alocados + nao_alocados)) == sorted(map(id, blocos))
+    assert all(b.inicio is None for b in nao_alocados)
+
+    contagem = Counter()
+    dias_do_militar = {u: set(dias) for u, dias in ocupados.items()}
+    for bloco in alocados:
+        dias = set(range(bloco.inicio, bloco.inicio + bloco.dias))
+        assert 0 <= bloco.inicio and bloco.inicio + bloco.dias <= len(ausentes_iniciais)
+        assert not dias & dias_do_militar.get(bloco.usuario_id, set())  # Sem sobreposição
+        dias_do_militar.setdefault(bloco.usuario_id, set()).update(dias)
+        contagem.update(dias)
+
+    esperado = [n + contagem[d] for d, n in enumerate(ausentes_iniciais)]
+    assert ausentes_por_dia == esperado
+    assert max(ausentes_por_dia) <= maximo_ausentes
+
+
+def test_bloco_sem_espaco_fica_nao_alocado():
+    # 20 dias de calendário: o bloco de 30 não cabe; o de 10 só cabe fora dos dias ocupados
+    blocos = [Bloco(1, 1, 30), Bloco(2, 2, 10), Bloco(3, 3, 10)]
+    ausentes_por_dia = [1] * 10 + [0] * 10
+    alocados, nao_alocados, ausentes, _ = planejar(blocos, ausentes_por_dia, 1, {9: set(range(10))},
+                                                   tempo_limite=0.05)
+
+    assert [b.usuario_id for b in alocados] == [2]
+    assert alocados[0].inicio == 10
+    assert sorted(b.usuario_id for b in nao_alocados) == [1, 3]
+    assert ausentes == [1] * 20
+
+
+def test_gravar_rascunhos_substitui_os_anteriores(app):
+    secao = Secao(nome='Seção de Teste')
+    for n in range(4):
+        militar = Usuario(nome_completo=f'Militar {n}', nome_guerra=f'M{n}', identidade=f'T00{n}', posto_grad='Sd',
+                          secao=secao)
+        militar.set_password('teste')
+        db.session.add(PeriodoAquisitivo(usuario=militar, ano_referencia=2020, data_inicio_periodo=date(2020, 1, 1),
+                                         data_fim_periodo=date(2020, 12, 31), dias_saldo=30))
+    db.session.commit()
+
+    def rascunhos():
+        return db.session.scalar(select(func.count()).select_from(SolicitacaoFerias)
+                                 .where(SolicitacaoFerias.status == StatusFerias.RASCUNHO))
+
+    primeiro = planejar_secao(secao.id, 2030, maximo_ausentes=1, hoje=date(2029, 6, 1))
+    assert gravar_rascunhos(secao.id, primeiro) == (0, 4)
+    db.session.commit()
+
+    segundo = planejar_secao(secao.id, 2030, maximo_ausentes=2, hoje=date(2029, 6, 1))
+    assert gravar_rascunhos(secao.id, segundo) == (4, len(segundo.alocados))
+    db.session.commit()
+    assert rascunhos() == len(segundo.alocados) == 4
+    assert segundo.pico <= 2
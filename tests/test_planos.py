@@ -0,0 +1,83 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_planos.py
+
+Planos de execução (EXPLAIN QUERY PLAN do SQLite) das consultas mais frequentes da
+aplicação. Uma consulta é reprovada se o plano tiver qualquer varredura (SCAN), mesmo
+de um índice, ou precisar ordenar em tabela temporária.
+"""
+from datetime import date
+import pytest
+from sqlalchemy import create_engine, select
+from app import db
+from app.models import (Usuario, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias, PapelUsuario, Tarefa, StatusTarefa,
+                        PeriodoAquisitivoArquivo, SolicitacaoFeriasArquivo, EventoAuditoria, TokenApi)
+
+
+def consultas_principais():
+    """Consultas das telas e rotinas mais acessadas, com parâmetros de exemplo."""
+    hoje = date.today()
+    ordem_usuarios = (Usuario.nome_completo, Usuario.id)
+    return {
+        'login (auth.login)': select(Usuario).where(Usuario.identidade == '0000000000'),
+        'períodos do militar (militar.dashboard)': select(PeriodoAquisitivo)
+            .where(PeriodoAquisitivo.usuario_id == 1)
+            .order_by(PeriodoAquisitivo.ano_referencia.asc()),
+        'solicitações do militar (militar.dashboard)': select(SolicitacaoFerias)
+            .where(SolicitacaoFerias.solicitante_id == 1)
+            .order_by(SolicitacaoFerias.data_solicitacao.desc()),
+        'períodos arquivados do militar (militar.dashboard)': select(PeriodoAquisitivoArquivo)
+            .where(PeriodoAquisitivoArquivo.usuario_id == 1)
+            .order_by(PeriodoAquisitivoArquivo.ano_referencia.asc()),
+        'solicitações arquivadas do militar (militar.dashboard)': select(SolicitacaoFeriasArquivo)
+            .where(SolicitacaoFeriasArquivo.solicitante_id == 1)
+            .order_by(SolicitacaoFeriasArquivo.data_solicitacao.desc()),
+        'período com saldo (militar.solicitar_ferias)': select(PeriodoAquisitivo.id, PeriodoAquisitivo.ano_referencia, PeriodoAquisitivo.dias_saldo)
+            .where(PeriodoAquisitivo.usuario_id == 1, PeriodoAquisitivo.dias_saldo > 0, PeriodoAquisitivo.data_fim_periodo <= hoje)
+            .order_by(PeriodoAquisitivo.ano_referencia.asc()).limit(1),
+        'fila de aprovação por status': select(SolicitacaoFerias)
+            .where(SolicitacaoFerias.status == StatusFerias.SOLICITADA)
+            .order_by(SolicitacaoFerias.data_solicitacao),
+        'solicitações de um período': select(SolicitacaoFerias)
+            .where(SolicitacaoFerias.periodo_aquisitivo_id == 1),
+        'militares por seção (gestor.gerenciar_usuarios)': select(Usuario)
+            .where(Usuario.secao_id == 1).order_by(*ordem_usuarios).limit(51),
+        'militares por papel (gestor.gerenciar_usuarios)': select(Usuario)
+            .where(Usuario.papel == PapelUsuario.MILITAR).order_by(*ordem_usuarios).limit(51),
+        'militares por posto (gestor.gerenciar_usuarios)': select(Usuario)
+            .where(Usuario.posto_grad == 'Cap').order_by(*ordem_usuarios).limit(51),
+        'histórico de uma solicitação (flask auditoria)': select(EventoAuditoria)
+            .where(EventoAuditoria.entidade == 'S', EventoAuditoria.entidade_id == 1)
+            .order_by(EventoAuditoria.id),
+        'alterações de um usuário (flask auditoria)': select(EventoAuditoria)
+            .where(EventoAuditoria.usuario_id == 1)
+            .order_by(EventoAuditoria.id.desc()).limit(100),
+        'token de acesso (api)': select(TokenApi.nome).where(TokenApi.token_hash == '0' * 64),
+        'solicitações por id (api.listar)': select(SolicitacaoFerias.__table__)
+            .where(SolicitacaoFerias.id > 1000).order_by(SolicitacaoFerias.id).limit(501),
+        'solicitações alteradas desde (api.listar, If-Modified-Since)': select(SolicitacaoFerias.__table__)
+            .where(SolicitacaoFerias.atualizado_em >= hoje)
+            .order_by(SolicitacaoFerias.atualizado_em, SolicitacaoFerias.id).limit(501),
+        'militares alterados desde (api.listar, If-Modified-Since)': select(Usuario.id, Usuario.nome_guerra)
+            .where(Usuario.atualizado_em >= hoje).order_by(Usuario.atualizado_em, Usuario.id).limit(501),
+        'próximas tarefas (flask worker)': select(Tarefa.id)
+            .where(Tarefa.status == StatusTarefa.PENDENTE, Tarefa.executar_em <= hoje)
+            .order_by(Tarefa.executar_em, Tarefa.id).limit(20),
+    }
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize('nome', list(consultas_principais()))
+def test_consulta_usa_indice(engine, nome):
+    consulta = consultas_principais()[nome]
+    sql = consulta.compile(dialect=engine.dialect, compile_kwargs={'literal_binds': True})
+    with engine.connect() as conexao:
+        plano = [linha[-1] for linha in conexao.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}')]
+    problemas = [detalhe for detalhe in plano if detalhe.startswith('SCAN') or 'TEMP B-TREE' in detalhe]
+    assert not problemas, plano
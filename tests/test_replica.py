@@ -0,0 +1,105 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_replica.py
+
+Réplica de teste: uma cópia do SQLite principal (copiar_sqlite) que não recebe as
+alterações feitas depois da cópia, como uma réplica atrasada.
+"""
+from datetime import date, timedelta
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import event, select, update, func
+from config import TestingConfig
+from app import create_app, db, replica
+from app.api import criar_token
+from app.cache import usuarios_cache
+from app.models import Usuario, PeriodoAquisitivo, SolicitacaoFerias
+
+
+ATRASO_S = 5
+
+
+@pytest.fixture
+def app(tmp_path):
+    class ConfigReplica(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'principal.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        SQLALCHEMY_BINDS = {replica.BIND_REPLICA: f"sqlite:///{tmp_path / 'replica.db'}"}
+        REPLICA_ATRASO_S = ATRASO_S
+
+    usuarios_cache.invalidar()
+    app = create_app(ConfigReplica)
+    with app.app_context():
+        db.create_all()
+    # Sem contexto ativo: cada requisição do cliente de teste tem a própria sessão, como no servidor
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app registra o metadata do bind em `db`, compartilhado com os outros testes (sem réplica)
+    db.metadatas.pop(replica.BIND_REPLICA, None)
+
+
+@pytest.fixture
+def comandos_na_replica(app):
+    comandos = []
+
+    def registrar(conexao, cursor, sql, *args):
+        comandos.append(sql)
+
+    with app.app_context():
+        engine = db.engines[replica.BIND_REPLICA]
+    event.listen(engine, 'before_cursor_execute', registrar)
+    yield comandos
+    event.remove(engine, 'before_cursor_execute', registrar)
+
+
+def test_leituras_na_replica_e_principal_depois_de_escrever(app, comandos_na_replica, monkeypatch):
+    with app.app_context():
+        militar = Usuario(nome_completo='Militar de Teste', nome_guerra='Antigo', identidade='T001', posto_grad='Sd')
+        militar.set_password('teste')
+        db.session.add_all([militar, PeriodoAquisitivo(usuario=militar, ano_referencia=2020,
+                                                       data_inicio_periodo=date(2020, 1, 1),
+                                                       data_fim_periodo=date(2020, 12, 31), dias_saldo=30)])
+        db.session.commit()
+        militar_id = militar.id
+        token = criar_token('testes')
+        replica.copiar_sqlite(db.engine, db.engines[replica.BIND_REPLICA])
+
+        # Alteração que a réplica (atrasada) ainda não recebeu
+        db.session.execute(update(Usuario).where(Usuario.id == militar_id).values(nome_guerra='Novo'))
+        db.session.commit()
+    comandos_na_replica.clear()  # A cópia acima não é uma escrita da aplicação
+
+    agora = [1000.0]
+    # Relógio do módulo controlado pelo teste (o resto da aplicação usa o relógio real)
+    monkeypatch.setattr(replica, 'time', SimpleNamespace(time=lambda: agora[0]))
+    cliente = app.test_client()
+    cabecalhos = {'Authorization': f'Bearer {token}'}
+
+    def nome_guerra():
+        resposta = cliente.get(f'/api/v1/usuarios?ids={militar_id}&campos=nome_guerra', headers=cabecalhos)
+        return resposta.json['dados'][0]['nome_guerra']
+
+    # 1. GET lê a réplica atrasada
+    assert nome_guerra() == 'Antigo'
+    assert comandos_na_replica
+
+    # 2. Depois de um POST que escreveu, o navegador lê do principal durante REPLICA_ATRASO_S
+    cliente.post('/login', data={'identidade': 'T001', 'password': 'teste'})
+    inicio = date.today() + timedelta(days=30)
+    resposta = cliente.post('/militar/solicitar', data={'tipo_solicitacao': '10_DIAS', 'data_inicio': inicio.isoformat()})
+    assert resposta.status_code == 302 and resposta.location.endswith('/militar/dashboard')
+    assert nome_guerra() == 'Novo'
+    agora[0] += ATRASO_S - 1
+    assert nome_guerra() == 'Novo'
+
+    # ... e volta para a réplica depois do atraso tolerado
+    agora[0] += 2
+    assert nome_guerra() == 'Antigo'
+
+    # 3. Nenhuma escrita chegou à réplica
+    assert not [sql for sql in comandos_na_replica if sql.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))]
+    with app.app_context():
+        with db.engines[replica.BIND_REPLICA].connect() as conexao:
+            assert conexao.scalar(select(func.count()).select_from(SolicitacaoFerias.__table__)) == 0
+        assert db.session.scalar(select(func.count()).select_from(SolicitacaoFerias)) == 1
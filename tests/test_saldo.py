@@ -0,0 +1,53 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_saldo.py
+"""
+import threading
+from datetime import date
+from app import db
+from app.models import Usuario, PeriodoAquisitivo
+from app.saldo import reservar_saldo, SaldoInsuficiente
+
+
+SALDO = 30
+DIAS = 7
+THREADS = 12
+
+
+def test_reservas_simultaneas_nao_deixam_saldo_negativo(app):
+    militar = Usuario(nome_completo='Militar de Teste', nome_guerra='Teste', identidade='T001', posto_grad='Sd')
+    militar.set_password('teste')
+    periodo = PeriodoAquisitivo(usuario=militar, ano_referencia=2020, data_inicio_periodo=date(2020, 1, 1),
+                                data_fim_periodo=date(2020, 12, 31), dias_saldo=SALDO)
+    db.session.add_all([militar, periodo])
+    db.session.commit()
+    militar_id, periodo_id = militar.id, periodo.id
+
+    largada = threading.Barrier(THREADS)
+    debitos, recusas, erros = [], [], []
+
+    def reservar():
+        with app.app_context():
+            largada.wait()
+            try:
+                debitos.append(reservar_saldo(militar_id, DIAS))
+                db.session.commit()
+            except SaldoInsuficiente:
+                db.session.rollback()
+                recusas.append(True)
+            except Exception as e:
+                db.session.rollback()
+                erros.append(e)
+
+    threads = [threading.Thread(target=reservar) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not erros
+    db.session.expire_all()
+    saldo = db.session.get(PeriodoAquisitivo, periodo_id).dias_saldo
+    assert saldo >= 0
+    assert debitos == [periodo_id] * (SALDO // DIAS)
+    assert len(debitos) * DIAS == SALDO - saldo
+    assert len(recusas) == THREADS - len(debitos)
@@ -0,0 +1,154 @@
+"""
+/Recursos-Humanos-Ferias/tests/test_tarefas.py
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import event, select, update
+from app import db
+from app.avaliacao import avaliar_em_lote
+from app.models import Usuario, Secao, PeriodoAquisitivo, SolicitacaoFerias, StatusFerias, Tarefa, StatusTarefa
+from app.tarefas import (tarefa, enfileirar, reservar_lote, processar_lote, liberar_travadas, executar_worker,
+                         _agora)
+
+
+@tarefa('teste_falha')
+def _falhar(dados):
+    raise RuntimeError('falha simulada')
+
+
+@pytest.fixture
+def notificacoes(app, tmp_path):
+    """Notificações gravadas num arquivo temporário (backend 'arquivo')."""
+    caminho = tmp_path / 'notificacoes.log'
+    app.config.update(NOTIFICACOES_BACKEND='arquivo', NOTIFICACOES_ARQUIVO=str(caminho))
+
+    def lidas():
+        if not caminho.exists():
+            return []
+        return [json.loads(linha) for linha in caminho.read_text(encoding='utf-8').splitlines()]
+    return lidas
+
+
+@pytest.fixture
+def secao(app):
+    """Seção com chefe (T000) e mais três militares, cada um com um período de 30 dias."""
+    secao = Secao(nome='Seção de Teste')
+    militares = []
+    for n in range(4):
+        militar = Usuario(nome_completo=f'Militar {n}', nome_guerra=f'M{n}', identidade=f'T00{n}', posto_grad='Sd',
+                          secao=secao)
+        militar.set_password('teste')
+        db.session.add(PeriodoAquisitivo(usuario=militar, ano_referencia=2020, data_inicio_periodo=date(2020, 1, 1),
+                                         data_fim_periodo=date(2020, 12, 31), dias_saldo=30))
+        militares.append(militar)
+    db.session.flush()
+    secao.chefe_id = militares[0].id
+    db.session.commit()
+    return secao
+
+
+def _solicitacoes(secao):
+    """Uma solicitação de cada militar da seção, exceto o chefe."""
+    periodos = db.session.execute(
+        select(PeriodoAquisitivo.usuario_id, PeriodoAquisitivo.id).join(Usuario, Usuario.id == PeriodoAquisitivo.usuario_id)
+        .where(Usuario.secao_id == secao.id, Usuario.id != secao.chefe_id).order_by(Usuario.id)
+    ).all()
+    solicitacoes = [SolicitacaoFerias(solicitante_id=usuario_id, periodo_aquisitivo_id=periodo_id,
+                                      data_inicio=date(2030, 3, 1), data_fim=date(2030, 3, 10), dias_solicitados=10,
+                                      tipo_solicitacao='10_DIAS', status=StatusFerias.SOLICITADA)
+                    for usuario_id, periodo_id in periodos]
+    db.session.add_all(solicitacoes)
+    db.session.commit()
+    return [s.id for s in solicitacoes]
+
+
+def _pendentes():
+    return db.session.scalars(select(Tarefa).where(Tarefa.status == StatusTarefa.PENDENTE).order_by(Tarefa.id)).all()
+
+
+def test_requisicao_enfileira_com_um_unico_insert(app, secao):
+    ids = _solicitacoes(secao)
+    inserts = []
+
+    def contar_insert(conexao, cursor, sql, *args):
+        if sql.startswith('INSERT INTO tarefa'):
+            inserts.append(sql)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', contar_insert)
+    try:
+        avaliar_em_lote(ids, StatusFerias.APROVADA_CHEFE)
+        db.session.commit()
+    finally:
+        event.remove(engine, 'before_cursor_execute', contar_insert)
+
+    assert len(inserts) == 1
+    assert [json.loads(t.dados) for t in _pendentes()] == [{'ids': ids}]
+
+
+def test_worker_envia_notificacoes_pelo_backend_arquivo(app, secao, notificacoes):
+    ids = _solicitacoes(secao)
+    avaliar_em_lote(ids, StatusFerias.REPROVADA, justificativa='Serviço')
+    db.session.commit()
+
+    assert executar_worker(app, threads=2, uma_vez=True) == (1, 0)
+    assert _pendentes() == []
+
+    mensagens = notificacoes()
+    assert len(mensagens) == 2 * len(ids) == 6  # Ao solicitante e ao chefe (T000)
+    assert sorted(m['para'] for m in mensagens if m['para'] != 'T000@localhost') == \
+        ['T001@localhost', 'T002@localhost', 'T003@localhost']
+    assert all('Justificativa: Serviço' in m['corpo'] for m in mensagens if m['para'] != 'T000@localhost')
+
+
+def test_reserva_nao_entrega_a_mesma_tarefa_duas_vezes(app):
+    pronta = enfileirar('teste_falha')
+    futura = enfileirar('teste_falha')
+    db.session.flush()
+    futura.executar_em = _agora() + timedelta(hours=1)
+    db.session.commit()
+
+    assert [item.id for item in reservar_lote(10)] == [pronta.id]
+    assert reservar_lote(10) == []
+
+
+def test_falha_agenda_nova_tentativa_com_espera_exponencial(app):
+    app.config.update(TAREFAS_TENTATIVAS=3, TAREFAS_ESPERA_S=10)
+    enfileirar('teste_falha')
+    db.session.commit()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for tentativa, espera in ((1, 10), (2, 20)):
+            antes = _agora()
+            assert processar_lote(app, pool, 10) == (0, 1)
+            item = db.session.scalars(select(Tarefa)).one()
+            assert item.status == StatusTarefa.PENDENTE and item.tentativas == tentativa
+            assert 'falha simulada' in item.ultimo_erro
+            atraso = (item.executar_em - antes).total_seconds()
+            assert espera <= atraso <= espera * 1.1 + 1
+            assert processar_lote(app, pool, 10) == (0, 0)  # Ainda não está na hora
+
+            item.executar_em = antes
+            db.session.commit()
+
+        assert processar_lote(app, pool, 10) == (0, 1)
+    item = db.session.scalars(select(Tarefa)).one()
+    assert item.status == StatusTarefa.FALHOU and item.tentativas == 3
+
+
+def test_reserva_abandonada_volta_a_fila_apos_o_timeout(app):
+    app.config['TAREFAS_TIMEOUT_S'] = 300
+    enfileirar('teste_falha')
+    db.session.commit()
+    assert len(reservar_lote(10)) == 1
+
+    assert liberar_travadas(300) == 0  # Reserva recente: worker ainda trabalhando
+    db.session.execute(update(Tarefa).values(reservada_em=_agora() - timedelta(seconds=301)))
+    db.session.commit()
+    assert liberar_travadas(300) == 1
+
+    item = db.session.scalars(select(Tarefa)).one()
+    assert item.status == StatusTarefa.PENDENTE and item.reserva is None
+    assert len(reservar_lote(10)) == 1